@@ -22,6 +22,7 @@ export default function HomePage() {
     profiles,
     resumes,
     applications,
+    stats,
     isLoading,
     setProfiles,
     loadAllData,
@@ -113,8 +114,7 @@ export default function HomePage() {
         {/* Analytics Dashboard */}
         <div className="p-4 bg-card rounded-lg border border-border shadow-sm">
           <AnalyticsDashboard
-            applications={applications}
-            resumes={resumes}
+            stats={stats}
             onFilterByMissing={(field) => {
               const currentField = missingFieldFilter.split(":")[1]
               if (currentField !== field) {
@@ -1,28 +1,21 @@
 "use client"
 
-import type { JobApplication, Resume, JobSource } from "@/lib/types"
+import type { ApplicationStats, JobSource } from "@/lib/types"
 import { Send, MessageSquare, Calendar, Trophy, AlertCircle, Globe } from "lucide-react"
 import { getSourceLabel } from "@/lib/job-parser"
-import {
-  calculateResponseStats,
-  calculateSourceStats,
-  calculateMissingFieldsStats,
-  calculateIncompleteApps,
-} from "@/lib/utils/statistics"
 
 interface AnalyticsDashboardProps {
-  applications: JobApplication[]
-  resumes: Resume[]
+  stats: ApplicationStats | null
   onFilterByMissing?: (field: string) => void
 }
 
-export function AnalyticsDashboard({ applications, resumes, onFilterByMissing }: AnalyticsDashboardProps) {
-  const { totalApplied, responded, interviews, offers, responseRate, interviewRate } =
-    calculateResponseStats(applications)
-  const sourceStats = calculateSourceStats(applications)
-  const sortedSources = Array.from(sourceStats.entries()).sort((a, b) => b[1] - a[1])
-  const missingFieldsStats = calculateMissingFieldsStats(applications)
-  const totalIncomplete = calculateIncompleteApps(applications)
+export function AnalyticsDashboard({ stats, onFilterByMissing }: AnalyticsDashboardProps) {
+  if (!stats) return null
+
+  const { total: totalApplied, responded, interviews, offers, responseRate } = stats
+  const sortedSources = Object.entries(stats.bySource).sort((a, b) => b[1] - a[1])
+  const missingFieldsStats = stats.missing
+  const totalIncomplete = stats.incomplete
 
   return (
     <div className="flex flex-wrap items-center gap-4 px-3 py-2 bg-card border border-border rounded-lg text-xs">
@@ -1,15 +1,17 @@
 import { useState, useEffect, useRef } from "react"
-import type { Resume, JobApplication, ApplicationStatus, ResumeProfile } from "@/lib/types"
+import type { Resume, JobApplication, ApplicationStatus, ApplicationStats, ResumeProfile } from "@/lib/types"
 import {
     fetchProfiles,
     fetchResumes,
     fetchApplications,
+    fetchApplicationStats,
     createApplication,
     updateApplicationStatus,
     deleteApplication,
     toggleFavorite,
     toggleArchive,
-    reparseApplication
+    reparseApplication,
+    subscribeToApplication
 } from "@/lib/api"
 
 import { loadFromStorage } from "@/lib/utils/storage"
@@ -18,6 +20,7 @@ export function useApplicationData() {
     const [profiles, setProfiles] = useState<ResumeProfile[]>([])
     const [resumes, setResumes] = useState<Resume[]>([])
     const [applications, setApplications] = useState<JobApplication[]>([])
+    const [stats, setStats] = useState<ApplicationStats | null>(null)
     const [isLoading, setIsLoading] = useState(true)
     const isMounted = useRef(false)
 
@@ -28,6 +31,18 @@ export function useApplicationData() {
         }
     }, [])
 
+    // Stats are cached on the server and invalidated on writes, so refetching is cheap
+    const refreshStats = async () => {
+        try {
+            const statsData = await fetchApplicationStats()
+            if (isMounted.current) {
+                setStats(statsData)
+            }
+        } catch (error) {
+            console.error("Failed to load stats", error)
+        }
+    }
+
     const loadAllData = async () => {
         if (!isMounted.current) return { profData: [], resumeData: [], appData: [] }
         setIsLoading(true)
@@ -35,7 +50,8 @@ export function useApplicationData() {
             const [profData, resumeData, appData] = await Promise.all([
                 fetchProfiles(),
                 fetchResumes(),
-                fetchApplications()
+                fetchApplications(),
+                refreshStats()
             ])
 
             if (isMounted.current) {
@@ -59,7 +75,8 @@ export function useApplicationData() {
         // Light refresh
         const [resumeData, appData] = await Promise.all([
             fetchResumes(),
-            fetchApplications()
+            fetchApplications(),
+            refreshStats()
         ])
         if (isMounted.current) {
             setResumes(resumeData)
@@ -67,20 +84,30 @@ export function useApplicationData() {
         }
     }
 
-    // Polling for parsing status
-    useEffect(() => {
-        const hasParsingApps = applications.some(app => app.status === "parsing")
-        if (!hasParsingApps) return
-
-        const intervalId = setInterval(async () => {
-            const appData = await fetchApplications()
-            if (isMounted.current) {
-                setApplications(appData)
-            }
-        }, 3000)
+    // Live updates for applications being parsed, pushed by the server as fields are stored
+    const parsingIds = applications
+        .filter(app => app.status === "parsing")
+        .map(app => app.id)
+        .sort()
+        .join(",")
 
-        return () => clearInterval(intervalId)
-    }, [applications])
+    useEffect(() => {
+        if (!parsingIds) return
+
+        const unsubscribes = parsingIds.split(",").map(id =>
+            subscribeToApplication(
+                id,
+                fields => {
+                    if (isMounted.current) {
+                        setApplications(prev => prev.map(a => a.id === id ? { ...a, ...fields } : a))
+                    }
+                },
+                () => refreshStats()
+            )
+        )
+
+        return () => unsubscribes.forEach(unsubscribe => unsubscribe())
+    }, [parsingIds])
 
     // Load data on mount
     useEffect(() => {
@@ -94,6 +121,7 @@ export function useApplicationData() {
 
         try {
             await updateApplicationStatus(app.id, newStatus)
+            refreshStats()
         } catch {
             // revert on fail
             if (isMounted.current) {
@@ -109,6 +137,7 @@ export function useApplicationData() {
             if (isMounted.current) {
                 setApplications(applications.filter(a => a.id !== id))
             }
+            refreshStats()
         } catch (e) {
             console.error(e)
         }
@@ -151,7 +180,7 @@ export function useApplicationData() {
             }
         } catch (err) {
             console.error(err)
-            // we could revert here, but polling will likely fix it or it will stay in error
+            // we could revert here, but the event stream will likely fix it or it will stay in error
             refreshData()
         }
     }
@@ -165,12 +194,14 @@ export function useApplicationData() {
         profiles,
         resumes,
         applications,
+        stats,
         isLoading,
         setProfiles,
         setResumes,
         setApplications,
         loadAllData,
         refreshData,
+        refreshStats,
         handleStatusChange,
         handleDelete,
         handleToggleFavorite,
@@ -1,5 +1,5 @@
-import type { JobApplication, ApplicationStatus } from "@/lib/types"
-import { mapApplicationFromApi, mapApplicationToApi } from "./mappers"
+import type { JobApplication, ApplicationStatus, ApplicationStats } from "@/lib/types"
+import { mapApplicationFieldsFromApi, mapApplicationFromApi, mapApplicationToApi, mapStatsFromApi } from "./mappers"
 
 const API_BASE =
     process.env.NEXT_PUBLIC_BACKEND_URL ||
@@ -7,18 +7,69 @@ const API_BASE =
         ? `http://${window.location.hostname}:8000`
         : "http://localhost:8000")
 
-/**
- * Fetches all applications or filtered by profile/resume version
- */
-export async function fetchApplications(
-    profileId?: string,
+export interface ApplicationQuery {
+    profileId?: string
     resumeVersion?: number
-): Promise<JobApplication[]> {
-    let url = `${API_BASE}/applications?`
-    if (profileId) url += `profile_id=${profileId}&`
-    if (resumeVersion) url += `resume_version=${resumeVersion}&`
+    status?: ApplicationStatus[]
+    isArchived?: boolean
+    isFavorite?: boolean
+    seniority?: string[]
+    workMode?: string[]
+    source?: string[]
+    company?: string
+    appliedFrom?: Date
+    appliedTo?: Date
+    // Required technologies; "all" needs every one, "any" (default) at least one
+    skills?: string[]
+    skillsMatch?: "any" | "all"
+    sortBy?: "applied_at" | "company" | "position"
+    order?: "asc" | "desc"
+    limit?: number
+    cursor?: string
+    // "summary" leaves out description and rawData
+    view?: "summary" | "full"
+    fields?: string[]
+}
+
+export interface ApplicationPage {
+    items: JobApplication[]
+    nextCursor?: string
+    total: number
+}
+
+const PAGE_SIZE = 500
 
-    const res = await fetch(url)
+const buildApplicationParams = (query: ApplicationQuery): URLSearchParams => {
+    const params = new URLSearchParams()
+    if (query.profileId) params.set("profile_id", query.profileId)
+    if (query.resumeVersion) params.set("resume_version", String(query.resumeVersion))
+    query.status?.forEach(s => params.append("status", s))
+    if (query.isArchived !== undefined) params.set("is_archived", String(query.isArchived))
+    if (query.isFavorite !== undefined) params.set("is_favorite", String(query.isFavorite))
+    query.seniority?.forEach(s => params.append("seniority", s))
+    query.workMode?.forEach(w => params.append("work_mode", w))
+    query.source?.forEach(s => params.append("source", s))
+    if (query.company) params.set("company", query.company)
+    if (query.appliedFrom) params.set("applied_from", query.appliedFrom.toISOString())
+    if (query.appliedTo) params.set("applied_to", query.appliedTo.toISOString())
+    query.skills?.forEach(s => params.append("skills", s))
+    if (query.skillsMatch) params.set("skills_match", query.skillsMatch)
+    if (query.sortBy) params.set("sort_by", query.sortBy)
+    if (query.order) params.set("order", query.order)
+    params.set("limit", String(query.limit ?? PAGE_SIZE))
+    if (query.cursor) params.set("cursor", query.cursor)
+    if (query.view) params.set("view", query.view)
+    if (query.fields?.length) params.set("fields", query.fields.join(","))
+    return params
+}
+
+/**
+ * Fetches one page of applications, filtered and sorted on the server
+ */
+export async function fetchApplicationsPage(
+    query: ApplicationQuery = {}
+): Promise<ApplicationPage> {
+    const res = await fetch(`${API_BASE}/applications?${buildApplicationParams(query)}`)
     if (!res.ok) {
         const errorBody = await res.text().catch(() => "No error body")
         console.error(
@@ -29,7 +80,41 @@ export async function fetchApplications(
     }
 
     const data = await res.json()
-    return data.map(mapApplicationFromApi)
+    return {
+        items: data.map(mapApplicationFromApi),
+        nextCursor: res.headers.get("X-Next-Cursor") ?? undefined,
+        total: Number(res.headers.get("X-Total-Count") ?? data.length),
+    }
+}
+
+/**
+ * Fetches all applications or filtered by profile/resume version,
+ * following the pagination cursor until the last page
+ */
+export async function fetchApplications(
+    profileId?: string,
+    resumeVersion?: number
+): Promise<JobApplication[]> {
+    const applications: JobApplication[] = []
+    let cursor: string | undefined
+    do {
+        const page = await fetchApplicationsPage({ profileId, resumeVersion, cursor })
+        applications.push(...page.items)
+        cursor = page.nextCursor
+    } while (cursor)
+    return applications
+}
+
+/**
+ * Fetches dashboard aggregates computed on the server
+ */
+export async function fetchApplicationStats(profileId?: string): Promise<ApplicationStats> {
+    const params = new URLSearchParams()
+    if (profileId) params.set("profile_id", profileId)
+    const res = await fetch(`${API_BASE}/applications/stats?${params}`)
+    if (!res.ok) throw new Error("Failed to fetch application stats")
+    const data = await res.json()
+    return mapStatsFromApi(data)
 }
 
 /**
@@ -148,3 +233,26 @@ export async function reparseApplication(id: string): Promise<JobApplication> {
     const data = await res.json()
     return mapApplicationFromApi(data)
 }
+
+/**
+ * Follows an application over Server-Sent Events while it is being parsed.
+ * `onChange` gets the current state, then every changed field as it is stored;
+ * `onDone` fires once parsing has finished (or the application was deleted).
+ * Returns a function that closes the stream.
+ */
+export function subscribeToApplication(
+    id: string,
+    onChange: (fields: Partial<JobApplication>) => void,
+    onDone?: () => void
+): () => void {
+    const source = new EventSource(`${API_BASE}/applications/${id}/events`)
+    const apply = (event: MessageEvent) => onChange(mapApplicationFieldsFromApi(JSON.parse(event.data)))
+    source.addEventListener("snapshot", apply)
+    source.addEventListener("update", apply)
+    // The server ends the stream after "done"; close so EventSource doesn't reconnect
+    source.addEventListener("done", () => {
+        source.close()
+        onDone?.()
+    })
+    return () => source.close()
+}
@@ -1,4 +1,4 @@
-import type { JobApplication, Resume, ResumeProfile } from "@/lib/types"
+import type { ApplicationStats, JobApplication, Resume, ResumeProfile } from "@/lib/types"
 
 /**
  * Parses a date string or Date object into a Date
@@ -35,6 +35,42 @@ export const mapApplicationFromApi = (data: any): JobApplication => {
     }
 }
 
+const APPLICATION_FIELD_NAMES: Record<string, keyof JobApplication> = {
+    profile_id: "profileId",
+    resume_id: "resumeId",
+    resume_version: "resumeVersion",
+    applied_at: "appliedAt",
+    responded_at: "respondedAt",
+    interview_date: "interviewDate",
+    rejected_at: "rejectedAt",
+    tech_stack: "techStack",
+    nice_to_have_stack: "niceToHaveStack",
+    work_mode: "workMode",
+    employment_type: "employmentType",
+    raw_data: "rawData",
+    is_favorite: "isFavorite",
+    is_archived: "isArchived",
+}
+
+const APPLICATION_DATE_FIELDS = new Set(["applied_at", "responded_at", "interview_date", "rejected_at"])
+
+/**
+ * Maps a partial application from the API (snake_case), e.g. the changed
+ * fields of an event stream update, to frontend format; absent keys stay absent
+ */
+export const mapApplicationFieldsFromApi = (data: any): Partial<JobApplication> => {
+    const fields: any = {}
+    for (const [key, value] of Object.entries(data ?? {})) {
+        const name = APPLICATION_FIELD_NAMES[key] ?? key
+        if (APPLICATION_DATE_FIELDS.has(key)) {
+            fields[name] = value ? parseDate(value) : undefined
+        } else {
+            fields[name] = value
+        }
+    }
+    return fields
+}
+
 /**
  * Maps application data from frontend format (camelCase) to API format (snake_case)
  */
@@ -86,3 +122,31 @@ export const mapProfileFromApi = (data: any): ResumeProfile => {
         createdAt: parseDate(data.created_at),
     }
 }
+
+/**
+ * Maps dashboard stats from API (snake_case) to frontend format (camelCase)
+ */
+export const mapStatsFromApi = (data: any): ApplicationStats => {
+    return {
+        total: data.total,
+        responded: data.responded,
+        interviews: data.interviews,
+        offers: data.offers,
+        responseRate: data.response_rate,
+        interviewRate: data.interview_rate,
+        medianDaysToResponse: data.median_days_to_response ?? undefined,
+        byStatus: data.by_status,
+        bySource: data.by_source,
+        bySeniority: data.by_seniority,
+        byWorkMode: data.by_work_mode,
+        byWeek: data.by_week,
+        topTechStack: data.top_tech_stack,
+        missing: {
+            description: data.missing.description,
+            requirements: data.missing.requirements,
+            responsibilities: data.missing.responsibilities,
+            techStack: data.missing.tech_stack,
+        },
+        incomplete: data.incomplete,
+    }
+}
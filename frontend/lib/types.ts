@@ -77,3 +77,26 @@ export interface ParsedJobData {
   source: JobSource
   rawData?: string
 }
+
+export interface ApplicationStats {
+  total: number
+  responded: number
+  interviews: number
+  offers: number
+  responseRate: number
+  interviewRate: number
+  medianDaysToResponse?: number
+  byStatus: Record<string, number>
+  bySource: Record<string, number>
+  bySeniority: Record<string, number>
+  byWorkMode: Record<string, number>
+  byWeek: { week: string; count: number }[]
+  topTechStack: { name: string; count: number }[]
+  missing: {
+    description: number
+    requirements: number
+    responsibilities: number
+    techStack: number
+  }
+  incomplete: number
+}
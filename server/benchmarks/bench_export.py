@@ -0,0 +1,92 @@
+"""
+Export cost: building the whole document in memory (the previous
+implementation) vs. the streaming export in services.data_export.
+
+    cd server && python -m benchmarks.bench_export --rows 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import models
+from services.data_export import export_record, iter_export
+
+
+def seed(db, rows):
+    profile = models.Profile(name="Bench")
+    db.add(profile)
+    db.flush()
+    resume = models.Resume(profile_id=profile.id, name="cv", version=1, file_path="cv.pdf")
+    db.add(resume)
+    db.flush()
+    for start in range(0, rows, 5000):
+        db.execute(insert(models.JobApplication), [
+            {
+                "profile_id": profile.id,
+                "resume_id": resume.id,
+                "resume_version": 1,
+                "url": f"https://example.com/job/{i}",
+                "company": f"Company {i % 300}",
+                "position": "Backend Developer",
+                "tech_stack": ["Python", "FastAPI", "PostgreSQL"],
+                "description": "Build APIs. " * 20,
+                "raw_data": "Raw posting text. " * 200,
+            }
+            for i in range(start, min(start + 5000, rows))
+        ])
+    db.commit()
+
+
+def in_memory_export(db):
+    applications = db.query(models.JobApplication).order_by(models.JobApplication.applied_at.desc()).all()
+    yield json.dumps([export_record(app) for app in applications], ensure_ascii=False, indent=2)
+
+
+def measure(name, export_fn, session_factory):
+    db = session_factory()
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_row = None
+    size = 0
+    for chunk in export_fn(db):
+        if first_row is None and len(chunk) > 1:
+            first_row = time.perf_counter() - started
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    print(f"{name:<10} first row {first_row * 1000:8.1f} ms  total {elapsed:6.2f}s  {size / 2**20:6.1f} MiB out  peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'export.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        db = session_factory()
+        seed(db, args.rows)
+        db.close()
+
+        print(f"{args.rows} applications")
+        measure("in_memory", in_memory_export, session_factory)
+        measure("stream", lambda db: iter_export(db, fmt="json"), session_factory)
+        measure("ndjson", lambda db: iter_export(db, fmt="ndjson"), session_factory)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Import throughput: per-row create_application (the previous implementation)
+vs. the chunked bulk insert in services.data_import, and peak memory of
+json.loads + import vs. the streaming import of an upload.
+
+    cd server && python -m benchmarks.bench_import --rows 5000
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core.database import SyncSessionAdapter
+from database import crud, models
+from services import data_import
+
+
+def make_items(rows: int):
+    return [
+        {
+            "url": f"https://example.com/job/{i}",
+            "company": f"Company {i % 300}",
+            "position": "Backend Developer",
+            "location": "Warsaw",
+            "seniority": "senior",
+            "tech_stack": ["Python", "FastAPI", "PostgreSQL"],
+            "requirements": ["3+ years of Python"],
+            "description": "Build APIs. " * 20,
+        }
+        for i in range(rows)
+    ]
+
+
+def per_row_import(db, data, profile_name):
+    """The pre-bulk algorithm: one dedup SELECT and one commit per item."""
+    results = {"success_count": 0, "errors": [], "profile_used": profile_name, "total_items": len(data)}
+    profile = crud.get_profile_by_name(db, profile_name)
+    resume = db.query(models.Resume).filter(models.Resume.profile_id == profile.id).first()
+    for index, item in enumerate(data):
+        app_create = data_import._build_application(item, profile, resume, resume.version)
+        existing = db.query(models.JobApplication).filter(
+            models.JobApplication.url == app_create.url,
+            models.JobApplication.profile_id == profile.id
+        ).first()
+        if existing:
+            results["errors"].append(f"Skipped duplicate (Index {index})")
+            continue
+        crud.create_application(db, app_create)
+        results["success_count"] += 1
+    return results
+
+
+def setup_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+    db = sessionmaker(bind=engine)()
+    profile = models.Profile(name="Bench")
+    db.add(profile)
+    db.flush()
+    db.add(models.Resume(profile_id=profile.id, name="cv", version=1, file_path="cv.pdf"))
+    db.commit()
+    statements.clear()
+    return engine, db, statements
+
+
+def run(name, import_fn, items, workdir):
+    engine, db, statements = setup_db(os.path.join(workdir, f"{name}.db"))
+
+    started = time.perf_counter()
+    result = import_fn(db, items, "Bench")
+    elapsed = time.perf_counter() - started
+    db.close()
+    engine.dispose()
+
+    assert result["success_count"] == len(items), result["errors"][:3]
+    print(f"{name:<10} {len(items):>7} rows  {elapsed:7.2f}s  {len(items) / elapsed:9.0f} rows/s  {len(statements):>7} statements")
+
+
+class AsyncBytes(io.BytesIO):
+    async def read(self, size=-1):
+        return super().read(size)
+
+
+def load_and_import(db, payload):
+    return data_import.import_applications(db, json.loads(payload), profile_name="Bench")
+
+
+def stream_import(db, payload):
+    async def run():
+        stream = data_import.import_applications_stream(SyncSessionAdapter(db), AsyncBytes(payload), profile_name="Bench")
+        async for progress in stream:
+            result = progress
+        return result["details"]
+    return asyncio.run(run())
+
+
+def measure_memory(name, import_fn, rows, workdir):
+    payload = json.dumps(make_items(rows)).encode()
+    engine, db, _ = setup_db(os.path.join(workdir, f"{name}_{rows}.db"))
+
+    tracemalloc.start()
+    result = import_fn(db, payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    engine.dispose()
+
+    assert result["success_count"] == rows
+    print(f"{name:<10} {rows:>7} rows  {len(payload) / 2**20:6.1f} MiB upload  peak {peak / 2**20:6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    items = make_items(args.rows)
+    with tempfile.TemporaryDirectory() as workdir:
+        run("per_row", per_row_import, items, workdir)
+        run("bulk", lambda db, data, name: data_import.import_applications(db, data, profile_name=name), items, workdir)
+
+        for rows in (args.rows, args.rows * 4):
+            measure_memory("loads", load_and_import, rows, workdir)
+            measure_memory("stream", stream_import, rows, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+normalize_technology / normalize_location throughput: the previous linear
+scans over KNOWN_TECHNOLOGIES and LOCATION_MAPPINGS vs. the alias index and
+compiled location pattern in services.job_parser.validator.
+
+    cd server && python -m benchmarks.bench_normalize --tokens 1000000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.job_parser import validator
+
+
+def legacy_normalize_technology(tech):
+    tech_clean = tech.strip()
+    if tech_clean in validator.KNOWN_TECHNOLOGIES:
+        return tech_clean
+    for known_tech in validator.KNOWN_TECHNOLOGIES:
+        if tech_clean.lower() == known_tech.lower():
+            return known_tech
+    tech_upper = tech_clean.upper()
+    if tech_upper in validator.KNOWN_TECHNOLOGIES:
+        return tech_upper
+    if len(tech_clean) > 1:
+        return tech_clean
+    return None
+
+
+def legacy_normalize_location(location):
+    if not location:
+        return None
+    loc = location.strip()
+    loc = re.sub(r'\b\d{2}-\d{3}\b', '', loc).strip()
+    loc_lower = loc.lower()
+    for pl, en in validator.LOCATION_MAPPINGS.items():
+        if pl in loc_lower:
+            return en
+    return loc
+
+
+def technology_tokens(count):
+    """Exact, wrongly cased, padded, synonym and unknown names, roughly as LLM output mixes them."""
+    rng = random.Random(15)
+    known = sorted(validator.KNOWN_TECHNOLOGIES)
+    aliases = sorted(validator.TECH_ALIASES)
+    unknown = [f"InternalTool{i}" for i in range(50)]
+    variants = [
+        lambda: rng.choice(known),
+        lambda: rng.choice(known).lower(),
+        lambda: f" {rng.choice(known).upper()} ",
+        lambda: rng.choice(aliases),
+        lambda: rng.choice(unknown),
+    ]
+    return [rng.choice(variants)() for _ in range(count)]
+
+
+def location_tokens(count):
+    rng = random.Random(15)
+    cities = list(validator.LOCATION_MAPPINGS) + ["Berlin", "London", "Remote", "Krakow"]
+    return [f"{rng.choice(cities).title()}, {rng.randint(10, 99)}-{rng.randint(100, 999)}" for _ in range(count)]
+
+
+def measure(name, fn, tokens):
+    started = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<20} {len(tokens)} tokens  {elapsed:6.2f}s  {len(tokens) / elapsed:12,.0f} tokens/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tokens = technology_tokens(args.tokens)
+    measure("technology legacy", legacy_normalize_technology, tokens)
+    measure("technology index", validator.normalize_technology, tokens)
+
+    locations = location_tokens(args.tokens // 10)
+    measure("location legacy", legacy_normalize_location, locations)
+    measure("location compiled", validator.normalize_location, locations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Parse pipeline throughput: queued applications drained by the worker pool
+against a local fake OpenRouter (tests/fake_openrouter.py) that answers
+after `--latency` seconds, for each `--workers` / `--batch-size` combination.
+
+    cd server && python -m benchmarks.bench_parse --jobs 200 --latency 0.5 --workers 1,4,16 --output results/parse.json
+
+Every posting text is distinct, so the parse cache never answers; the
+extractors and compaction run as in production.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.results import database_info, summarize, write_results
+
+
+def responder(payload):
+    """DEFAULT_JOB for single prompts, one entry per `### JOB n` for batch prompts."""
+    from tests.fake_openrouter import DEFAULT_JOB, completion
+
+    content = payload["messages"][0]["content"]
+    indexes = [int(index) for index in re.findall(r"^### JOB (\d+)$", content, re.MULTILINE)]
+    usage = {"prompt_tokens": len(content) // 4, "completion_tokens": 250 * max(1, len(indexes))}
+    if indexes:
+        return 200, completion(json.dumps([dict(DEFAULT_JOB, index=index) for index in indexes]), usage=usage)
+    return 200, completion(json.dumps(DEFAULT_JOB), usage=usage)
+
+
+def queue_applications(run: str, jobs: int) -> list:
+    from core.database import SessionLocal
+    from database import crud, models
+    from services.parse_queue import enqueue_many
+
+    with SessionLocal() as db:
+        profile = crud.get_profile_by_name(db, "Bench parse")
+        if profile is None:
+            profile = models.Profile(name="Bench parse")
+            db.add(profile)
+            db.flush()
+            db.add(models.Resume(profile_id=profile.id, name="cv.pdf", version=1, file_path="cv.pdf"))
+            db.flush()
+        resume = db.query(models.Resume).filter(models.Resume.profile_id == profile.id).first()
+        applications = [
+            models.JobApplication(
+                profile_id=profile.id,
+                resume_id=resume.id,
+                resume_version=resume.version,
+                url=f"https://example.com/parse/{run}/{i}",
+                company="Parsing...",
+                position="Parsing...",
+                raw_data=f"Senior Python Developer #{run}-{i} at TechCorp. " + "Build and operate APIs. " * 40,
+                status=models.ApplicationStatus.parsing,
+            )
+            for i in range(jobs)
+        ]
+        db.add_all(applications)
+        db.commit()
+        app_ids = [app.id for app in applications]
+        enqueue_many(db, app_ids)
+    return app_ids
+
+
+def remaining_jobs(app_ids: list) -> int:
+    from sqlalchemy import func, select
+
+    from core.database import SessionLocal
+    from database import models
+
+    with SessionLocal() as db:
+        return db.execute(
+            select(func.count()).select_from(models.ParseJob).where(
+                models.ParseJob.application_id.in_(app_ids),
+                models.ParseJob.status != models.ParseJobStatus.failed,
+            )
+        ).scalar_one()
+
+
+def failed_applications(app_ids: list) -> int:
+    from sqlalchemy import func, select
+
+    from core.database import SessionLocal
+    from database import models
+
+    with SessionLocal() as db:
+        return db.execute(
+            select(func.count()).select_from(models.JobApplication).where(
+                models.JobApplication.id.in_(app_ids),
+                models.JobApplication.status.in_([models.ApplicationStatus.failed, models.ApplicationStatus.parsing]),
+            )
+        ).scalar_one()
+
+
+async def drain(workers: int, batch_size: int, app_ids: list, timeout: float) -> tuple:
+    """Run the worker pool until the jobs of `app_ids` are gone; returns (handler latencies ms, elapsed)."""
+    from core.database import async_engine, async_read_engine
+    from routers import applications
+    from services.job_parser.ai.client import close_client
+    from services.parse_queue import ParseWorkerPool
+
+    latencies = []
+
+    async def handler(app_id, final_attempt, bypass_cache=False):
+        started = time.perf_counter()
+        try:
+            await applications.process_application_background(app_id, final_attempt, bypass_cache=bypass_cache)
+        finally:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def batch_handler(batch):
+        started = time.perf_counter()
+        try:
+            return await applications.process_applications_batch(batch)
+        finally:
+            # Every posting of the batch waited for the whole batch
+            latencies.extend([(time.perf_counter() - started) * 1000] * len(batch))
+
+    pool = ParseWorkerPool(
+        handler=handler,
+        batch_handler=batch_handler if batch_size > 1 else None,
+        batch_size=batch_size,
+        workers=workers,
+        poll_interval=0.05,
+    )
+    started = time.perf_counter()
+    await pool.start()
+    try:
+        while await asyncio.to_thread(remaining_jobs, app_ids):
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"Parse jobs not drained within {timeout}s")
+            await asyncio.sleep(0.02)
+        elapsed = time.perf_counter() - started
+    finally:
+        await pool.stop()
+        await close_client()
+        # Async pools belong to this event loop; the next configuration runs in a new one
+        for bind in {async_engine, async_read_engine}:
+            await bind.dispose()
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--jobs", type=int, default=200, help="Applications queued per configuration")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the fake OpenRouter waits before answering")
+    parser.add_argument("--workers", default="1,4,16", help="Comma-separated worker counts")
+    parser.add_argument("--batch-size", default="1,5", help="Comma-separated PARSE_BATCH_SIZE values")
+    parser.add_argument("--streaming", action="store_true", help="Stream completions (OPENROUTER_STREAMING)")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--output", default="benchmarks/results/parse.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # The app's engine and sessions are built from settings at import time
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+        os.environ["UPLOAD_DIR"] = os.path.join(workdir, "data", "uploads")
+        os.environ["OPENROUTER_API_KEY"] = "bench"
+
+        from benchmarks import seed
+        from core.config import settings
+        from core.database import engine
+        from tests.fake_openrouter import FakeOpenRouter
+
+        logging.getLogger().setLevel(logging.WARNING)
+        seed.create_schema(engine)
+        server = FakeOpenRouter(responder=responder, latency=args.latency).start()
+        settings.OPENROUTER_BASE_URL = server.url
+        settings.OPENROUTER_STREAMING = args.streaming
+        settings.PARSE_CACHE_ENABLED = False
+
+        results = []
+        try:
+            for batch_size in [int(value) for value in args.batch_size.split(",")]:
+                for workers in [int(value) for value in args.workers.split(",")]:
+                    run = f"w{workers}-b{batch_size}-{time.time_ns()}"
+                    app_ids = queue_applications(run, args.jobs)
+                    llm_requests = len(server.requests)
+                    latencies, elapsed = asyncio.run(drain(workers, batch_size, app_ids, args.timeout))
+                    results.append(summarize(
+                        f"parse_w{workers}_b{batch_size}",
+                        latencies,
+                        elapsed,
+                        units=args.jobs,
+                        unit="jobs",
+                        workers=workers,
+                        batch_size=batch_size,
+                        llm_requests=len(server.requests) - llm_requests,
+                        failed=failed_applications(app_ids),
+                    ))
+        finally:
+            server.stop()
+
+        params = {
+            "jobs": args.jobs,
+            "latency": args.latency,
+            "workers": args.workers,
+            "batch_size": args.batch_size,
+            "streaming": args.streaming,
+        }
+        write_results(args.output, "parse", params, results, database_info(engine))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Search latency: services.search (FTS5) vs. a LIKE scan over the same columns,
+which is the best the database could do without the index.
+
+    cd server && python -m benchmarks.bench_search --rows 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import String, cast, create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+from database import models
+from services import search
+
+TECH = ["Python", "Kotlin", "Java", "Go", "Rust", "TypeScript", "React", "PostgreSQL", "Kafka", "Kubernetes", "Scala", "Elixir"]
+CITIES = ["Kraków", "Warszawa", "Wrocław", "Berlin", "Lisbon", "Remote"]
+ROLES = ["Backend Developer", "Frontend Engineer", "Data Engineer", "Platform Engineer", "Mobile Developer"]
+QUERIES = ["kotlin", "kotlin krakow", "platform kubern", "elixir berlin", "data engineer kafka"]
+
+
+def seed(db, rows):
+    rng = random.Random(13)
+    profile = models.Profile(name="Bench")
+    db.add(profile)
+    db.flush()
+    resume = models.Resume(profile_id=profile.id, name="cv", version=1, file_path="cv.pdf")
+    db.add(resume)
+    db.flush()
+    for start in range(0, rows, 5000):
+        batch = []
+        for i in range(start, min(start + 5000, rows)):
+            stack = rng.sample(TECH, 3)
+            batch.append({
+                "profile_id": profile.id,
+                "resume_id": resume.id,
+                "resume_version": 1,
+                "company": f"Company {i % 700}",
+                "position": f"{rng.choice(ROLES)} ({stack[0]})",
+                "location": rng.choice(CITIES),
+                "tech_stack": stack,
+                "requirements": [f"{rng.randint(2, 7)}+ years with {stack[1]}", "English B2"],
+                "responsibilities": ["Design and build services", f"Operate {stack[2]} in production"],
+                "description": "We are looking for an engineer to join our team. " * 15,
+            })
+        db.execute(insert(models.JobApplication), batch)
+    db.commit()
+
+
+def like_search(db, q):
+    """Every match, since ranking them needs all of them."""
+    App = models.JobApplication
+    query = db.query(App.id)
+    for token in search.query_tokens(q):
+        pattern = f"%{token}%"
+        query = query.filter(or_(*(
+            cast(column, String).ilike(pattern) for column in
+            (App.company, App.position, App.location, App.description, App.requirements, App.responsibilities, App.tech_stack)
+        )))
+    return query.all()
+
+
+def measure(name, search_fn, db, repeat):
+    for q in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = search_fn(db, q)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{name:<5} {q!r:<24} {len(hits):5d} hits  median {statistics.median(timings):8.2f} ms  max {max(timings):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'search.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        seed(db, args.rows)
+
+        print(f"{args.rows} applications")
+        measure("fts", search.search_applications, db, args.repeat)
+        measure("like", like_search, db, args.repeat)
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
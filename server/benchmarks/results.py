@@ -0,0 +1,141 @@
+"""
+Benchmark result files: every suite writes one JSON document with the
+environment it ran in and one entry per scenario, so runs on different
+commits can be compared.
+
+    cd server && python -m benchmarks.results old.json new.json --threshold 0.1
+
+Exits with 1 when a scenario got slower (p50/p95 up, or throughput down)
+by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Metric -> True when higher is better
+COMPARED = {"p50_ms": False, "p95_ms": False, "throughput": True}
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, latencies_ms: List[float], elapsed: float, units: int = None, **extra) -> dict:
+    """
+    One scenario entry. `throughput` is `units` (default: one per latency
+    sample, i.e. requests) per second of wall time.
+    """
+    units = len(latencies_ms) if units is None else units
+    entry = {
+        "name": name,
+        "samples": len(latencies_ms),
+        "p50_ms": _round(percentile(latencies_ms, 0.50)),
+        "p95_ms": _round(percentile(latencies_ms, 0.95)),
+        "p99_ms": _round(percentile(latencies_ms, 0.99)),
+        "mean_ms": _round(statistics.fmean(latencies_ms)) if latencies_ms else None,
+        "max_ms": _round(max(latencies_ms)) if latencies_ms else None,
+        "elapsed_s": round(elapsed, 3),
+        "throughput": round(units / elapsed, 2) if elapsed else None,
+        **extra,
+    }
+    print(
+        f"{name:<24} p50 {entry['p50_ms']:>9} ms  p95 {entry['p95_ms']:>9} ms  "
+        f"{entry['throughput']:>10}/s  {json.dumps(extra) if extra else ''}"
+    )
+    return entry
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def database_info(engine) -> dict:
+    with engine.connect() as conn:
+        version = conn.dialect.server_version_info
+    return {"dialect": engine.dialect.name, "version": ".".join(str(part) for part in version or ())}
+
+
+def write_results(path: str, suite: str, params: dict, results: List[dict], database: dict = None):
+    document = {
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database,
+        "params": params,
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """Print per-scenario changes; returns the number of regressions over `threshold`."""
+    print(f"{old.get('commit')} -> {new.get('commit')} ({new['suite']})")
+    old_results = {entry["name"]: entry for entry in old["results"]}
+    regressions = 0
+    for entry in new["results"]:
+        previous = old_results.get(entry["name"])
+        if previous is None:
+            print(f"{entry['name']:<24} new")
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED.items():
+            before, after = previous.get(metric), entry.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = " REGRESSION"
+                regressions += 1
+            changes.append(f"{metric} {before} -> {after} ({change:+.1%}){flag}")
+        print(f"{entry['name']:<24} " + "; ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    if old["params"] != new["params"]:
+        print(f"⚠️ Parameters differ: {old['params']} vs {new['params']}")
+    sys.exit(1 if compare(old, new, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
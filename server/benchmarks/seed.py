@@ -0,0 +1,165 @@
+"""
+Deterministic synthetic data for the benchmark suite: profiles, resumes and
+applications with realistic field mixes, inserted in bulk (raw texts,
+skill index and full-text index included) on SQLite or Postgres.
+
+    cd server && python -m benchmarks.seed --database-url sqlite:///bench.db --applications 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.migration import run_schema_migrations
+from database import crud, models
+from services import skills
+
+TECH = [
+    "Python", "Kotlin", "Java", "Go", "Rust", "TypeScript", "React", "PostgreSQL", "Kafka",
+    "Kubernetes", "Scala", "Elixir", "Docker", "AWS", "FastAPI", "Django", "Redis", "Terraform",
+]
+CITIES = ["Krakow", "Warsaw", "Wroclaw", "Gdansk", "Berlin", "Lisbon", "Remote"]
+ROLES = ["Backend Developer", "Frontend Engineer", "Data Engineer", "Platform Engineer", "Mobile Developer", "SRE"]
+SOURCES = ["linkedin", "nofluffjobs", "justjoin", "pracuj", "indeed"]
+WORK_MODES = ["remote", "hybrid", "onsite"]
+EMPLOYMENT_TYPES = ["b2b", "full-time", "contract"]
+# Weighted like a real search: most applications never get an answer
+STATUSES = (
+    [models.ApplicationStatus.no_response] * 12
+    + [models.ApplicationStatus.rejected] * 5
+    + [models.ApplicationStatus.screening] * 2
+    + [models.ApplicationStatus.interview] * 2
+    + [models.ApplicationStatus.offer]
+)
+SENIORITIES = [models.Seniority.junior, models.Seniority.mid, models.Seniority.mid, models.Seniority.senior, models.Seniority.lead]
+# Distinct posting texts; applications share them the way reposted ads do
+RAW_TEXT_VARIANTS = 500
+
+
+def raw_text(rng: random.Random, variant: int) -> str:
+    stack = ", ".join(rng.sample(TECH, 5))
+    return (
+        f"<html><body><h1>{ROLES[variant % len(ROLES)]} #{variant}</h1>"
+        f"<p>We are hiring. Stack: {stack}.</p>"
+        + "<p>Responsibilities include designing, building and operating services.</p>" * 8
+        + "</body></html>"
+    )
+
+
+def application_row(rng: random.Random, i: int, profile_id: str, resume: models.Resume, now: datetime, raw_hashes: list) -> dict:
+    stack = rng.sample(TECH, rng.randint(3, 6))
+    status = rng.choice(STATUSES)
+    applied_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 540))
+    return {
+        "id": models.generate_uuid(),
+        "profile_id": profile_id,
+        "resume_id": resume.id,
+        "resume_version": resume.version,
+        "url": f"https://example.com/jobs/{i}",
+        "company": f"Company {rng.randint(0, 4000)}",
+        "position": f"{rng.choice(SENIORITIES).value.title()} {rng.choice(ROLES)}",
+        "location": rng.choice(CITIES),
+        "salary": f"{rng.randint(8, 25) * 1000} - {rng.randint(26, 40) * 1000} PLN",
+        "source": rng.choice(SOURCES),
+        "tech_stack": stack[:3],
+        "nice_to_have_stack": stack[3:],
+        "requirements": [f"{rng.randint(2, 8)}+ years with {stack[0]}", "English B2"],
+        "responsibilities": ["Design and build services", f"Operate {stack[1]} in production"],
+        "work_mode": rng.choice(WORK_MODES),
+        "employment_type": rng.choice(EMPLOYMENT_TYPES),
+        "seniority": rng.choice(SENIORITIES),
+        "description": "We are looking for an engineer to join our platform team. " * rng.randint(3, 12),
+        "raw_data_hash": rng.choice(raw_hashes),
+        "status": status,
+        "is_favorite": rng.random() < 0.05,
+        "is_archived": rng.random() < 0.1,
+        "applied_at": applied_at,
+        "responded_at": applied_at + timedelta(days=rng.randint(1, 30)) if status != models.ApplicationStatus.no_response else None,
+    }
+
+
+def seed(db: Session, applications: int, profiles: int = 3, seed_value: int = 7, chunk_size: int = 5000) -> dict:
+    """
+    Insert `profiles` profiles (two resume versions each) and `applications`
+    applications spread over them. Same arguments, same data.
+    """
+    rng = random.Random(seed_value)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    resumes = []
+    for p in range(profiles):
+        profile = models.Profile(name=f"Bench {p}")
+        db.add(profile)
+        db.flush()
+        for version in (1, 2):
+            resume = models.Resume(profile_id=profile.id, name=f"cv-{version}.pdf", version=version, file_path=f"cv-{version}.pdf")
+            db.add(resume)
+            resumes.append(resume)
+    db.flush()
+
+    raw_hashes = crud.store_raw_texts(db, [raw_text(rng, variant) for variant in range(RAW_TEXT_VARIANTS)])
+    db.commit()
+
+    started = time.perf_counter()
+    for start in range(0, applications, chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, applications)):
+            resume = resumes[i % len(resumes)]
+            rows.append(application_row(rng, i, resume.profile_id, resume, now, raw_hashes))
+        db.execute(insert(models.JobApplication), rows)
+        skills.replace_skills(db.connection(), {row["id"]: (row["tech_stack"], row["nice_to_have_stack"]) for row in rows})
+        db.commit()
+        done = start + len(rows)
+        if done % (chunk_size * 20) == 0 or done == applications:
+            print(f"  seeded {done}/{applications} applications ({time.perf_counter() - started:.1f}s)")
+
+    return {"profile_ids": sorted({resume.profile_id for resume in resumes})}
+
+
+def existing(db: Session) -> dict:
+    """The seeded profiles and application count of a database seeded earlier."""
+    profile_ids = db.execute(select(models.Profile.id).where(models.Profile.name.like("Bench %"))).scalars().all()
+    count = db.execute(select(func.count()).select_from(models.JobApplication)).scalar_one()
+    return {"profile_ids": sorted(profile_ids), "applications": count}
+
+
+def remove_imported(db: Session, url_prefix: str):
+    """Delete applications (and their skill rows) whose URL starts with `url_prefix`."""
+    ids = select(models.JobApplication.id).where(models.JobApplication.url.like(f"{url_prefix}%"))
+    db.execute(delete(models.ApplicationSkill).where(models.ApplicationSkill.application_id.in_(ids)))
+    db.execute(delete(models.JobApplication).where(models.JobApplication.url.like(f"{url_prefix}%")))
+    db.commit()
+
+
+def create_schema(engine):
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--applications", type=int, default=10000)
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    create_schema(engine)
+    db = sessionmaker(bind=engine)()
+    if existing(db)["applications"]:
+        sys.exit(f"{args.database_url} already has applications; seed an empty database")
+    seed(db, args.applications, profiles=args.profiles, seed_value=args.seed)
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Application configuration"""
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Literal, Optional
 import os
 
 class Settings(BaseSettings):
@@ -12,12 +13,98 @@ class Settings(BaseSettings):
     # Database
     # Use SQLite in the data directory
     DATABASE_URL: str = "sqlite:///data/vacancio.db"
+    # Managed SQLite (file databases): WAL plus the pragmas below on every connection,
+    # writes serialized through one writer connection, reads from a separate pool
+    SQLITE_MANAGED: bool = True
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for other processes' write locks
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB of the file memory-mapped
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_READ_POOL_SIZE: int = 10
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30.0  # Wait for the writer connection before failing
+    # Connection pool of server databases (PostgreSQL); bounds concurrent requests and parses
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
     
     # Uploads
     UPLOAD_DIR: str = "data/uploads"
     
     # Security
     SECRET_KEY: str = "changeme"
+
+    # OpenRouter
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    OPENROUTER_TIMEOUT_SECONDS: float = 60.0
+    OPENROUTER_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    OPENROUTER_MAX_CONNECTIONS: int = 50
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENROUTER_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENROUTER_HTTP2: bool = True
+    # Stream completions so parse workers can store fields as they arrive
+    OPENROUTER_STREAMING: bool = True
+    # Ask for a JSON schema response_format built from JobPosting
+    OPENROUTER_STRUCTURED_OUTPUT: bool = True
+    # Re-ask only for fields that fail validation instead of failing the parse
+    PARSE_REPAIR_ENABLED: bool = True
+
+    # Model routing: tried in order, unhealthy models (error rate over the max) last
+    PARSE_MODELS: List[str] = ["openai/gpt-4o-mini"]
+    # A second model is started when the first hasn't answered within its rolling p95,
+    # clamped to [PARSE_HEDGE_MIN_SECONDS, PARSE_HEDGE_SECONDS] (0 disables hedging)
+    PARSE_HEDGE_SECONDS: float = 15.0
+    PARSE_HEDGE_MIN_SECONDS: float = 2.0
+    PARSE_ROUTER_WINDOW: int = 100  # Attempts per model kept for p50/p95/error rate
+    PARSE_ROUTER_MIN_SAMPLES: int = 5  # Below this the stats are not acted on
+    PARSE_ROUTER_MAX_ERROR_RATE: float = 0.5
+
+    # Parse queue
+    PARSE_WORKERS: int = 2
+    PARSE_MAX_ATTEMPTS: int = 3
+    PARSE_RETRY_BACKOFF_SECONDS: float = 30.0
+    PARSE_LEASE_SECONDS: int = 300
+    PARSE_POLL_INTERVAL_SECONDS: float = 1.0
+    PARSE_BATCH_SIZE: int = 5  # Postings packed into one LLM call (1 disables batching)
+
+    # Deterministic extractors (JSON-LD) run before the LLM; it is skipped when all of these were found
+    PARSE_EXTRACTORS_ENABLED: bool = True
+    PARSE_EXTRACTOR_SUFFICIENT_FIELDS: List[str] = ["job_title", "company", "stack", "requirements", "responsibilities"]
+
+    # Posting text is stripped of markup/boilerplate and cut to this many (estimated) tokens before the LLM
+    PARSE_COMPACTION_ENABLED: bool = True
+    PARSE_INPUT_MAX_TOKENS: int = 4000  # 0 disables the cut
+
+    # GET /applications/{id}/events: keep-alive interval, also how often the row is re-read
+    APPLICATION_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # GET /metrics (Prometheus text format) and request/DB/parse-stage timings
+    METRICS_ENABLED: bool = True
+    METRICS_TIMING_HEADERS: bool = False  # Server-Timing header on every response
+
+    # Request profiling: sampled requests (or ones sent with `X-Profile: 1` when allowed) get
+    # SQL/handler/serialization Server-Timing entries and a report in DATA_DIR/profiles/
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests, 0 disables sampling
+    PROFILING_ALLOW_HEADER: bool = False
+    PROFILING_MAX_REPORTS: int = 200
+    PROFILING_REPEAT_WARNING: int = 10  # Log a possible N+1 when one statement ran this often
+
+    # Parse result cache
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_TTL_DAYS: int = 30
+    PARSE_CACHE_MAX_ENTRIES: int = 5000
+
+    # Raw posting texts (raw_texts table): "zstd" needs the zstandard package, else zlib is used
+    RAW_DATA_CODEC: str = "zlib"
+    RAW_DATA_LEVEL: int = 6
+
+    # Extra {"Canonical": ["alias", ...]} JSON merged over services/job_parser/tech_synonyms.json
+    TECH_SYNONYMS_FILE: Optional[str] = None
+
+    # Bulk import: rows validated and inserted per transaction
+    IMPORT_CHUNK_SIZE: int = 500
+    # Bytes read from an upload per step when streaming an import
+    IMPORT_READ_SIZE: int = 65536
+    # Rows fetched per round-trip when streaming an export
+    EXPORT_BATCH_SIZE: int = 500
     
     model_config = SettingsConfigDict(
         env_file=".env",
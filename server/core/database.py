@@ -1,33 +1,241 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import asyncio
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 from core.config import settings
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    pool_pre_ping=True,
-    echo=False
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def is_sqlite_file(url: str) -> bool:
+    """A SQLite database on disk (in-memory databases can't use WAL or a separate read pool)."""
+    url = make_url(url)
+    database = url.database or ""
+    return (
+        url.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and url.query.get("mode") != "memory"
+    )
+
+
+def async_url(url: str) -> str:
+    """`url` with the async driver of its backend: aiosqlite for SQLite, asyncpg for PostgreSQL."""
+    url = make_url(url)
+    drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+    if url.get_backend_name() in drivers:
+        url = url.set(drivername=drivers[url.get_backend_name()])
+    return url.render_as_string(hide_password=False)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.close()
+
+
+def _disable_implicit_begin(dbapi_connection, connection_record):
+    # pysqlite would start a deferred transaction before the first INSERT/UPDATE;
+    # the writer starts its own with BEGIN IMMEDIATE instead
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn):
+    # Takes the write lock up front, so a transaction never fails to upgrade
+    # from read to write half-way through
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_engines(url: str, create: Callable = create_engine) -> tuple:
+    """
+    `(engine, read_engine)` for `url`, built with `create` (`create_engine`,
+    or `create_async_engine` for an async driver URL). Managed SQLite (a file
+    database with SQLITE_MANAGED) gets WAL and the SQLITE_* pragmas on every
+    connection, a writer engine holding a single connection, so writes of
+    this process queue for it instead of failing with "database is locked",
+    and a pooled read engine. Anything else gets one engine for both.
+    """
+    if not (settings.SQLITE_MANAGED and is_sqlite_file(url)):
+        options = {}
+        if "sqlite" in url:
+            options["connect_args"] = {"check_same_thread": False}
+        else:
+            options.update(pool_size=settings.DATABASE_POOL_SIZE, max_overflow=settings.DATABASE_MAX_OVERFLOW)
+        engine = create(url, pool_pre_ping=True, echo=False, **options)
+        return engine, engine
+
+    connect_args = {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    engine = create(
+        url,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        echo=False
+    )
+    # Events are registered on the sync engine behind an async one
+    writer = getattr(engine, "sync_engine", engine)
+    event.listen(writer, "connect", _set_sqlite_pragmas)
+    event.listen(writer, "connect", _disable_implicit_begin)
+    event.listen(writer, "begin", _begin_immediate)
+
+    read_engine = create(
+        url,
+        connect_args=connect_args,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_POOL_SIZE,
+        pool_pre_ping=True,
+        echo=False
+    )
+    event.listen(getattr(read_engine, "sync_engine", read_engine), "connect", _set_sqlite_pragmas)
+    return engine, read_engine
+
+
+class RoutingSession(Session):
+    """
+    Session that reads through `read_bind` until its first write (a flush or
+    an INSERT/UPDATE/DELETE statement), then uses the writer bind for the rest
+    of the transaction so later reads see its own changes.
+    """
+
+    def __init__(self, *args, read_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_bind = read_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["writing"] = True
+        if self.read_bind is None or self.info.get("writing"):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.read_bind
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def create_session_factory(engine, read_engine) -> sessionmaker:
+    if read_engine is engine:
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession, read_bind=read_engine)
+
+
+def create_async_session_factory(engine, read_engine) -> async_sessionmaker:
+    """
+    Like `create_session_factory` for async engines. Objects stay loaded after
+    commit, since an expired attribute could only be reloaded inside `run_sync`.
+    """
+    if read_engine is engine:
+        return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    return async_sessionmaker(
+        engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        read_bind=read_engine.sync_engine,
+    )
+
+
+class SyncSessionAdapter:
+    """
+    Stand-in for an AsyncSession over a sync Session, such as the test
+    fixtures' in-memory database: `run_sync` runs the function in a thread.
+    Only the methods the app awaits are provided.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, self.sync_session, *args, **kwargs)
+
+    async def commit(self):
+        await asyncio.to_thread(self.sync_session.commit)
+
+    async def rollback(self):
+        await asyncio.to_thread(self.sync_session.rollback)
+
+    async def close(self):
+        await asyncio.to_thread(self.sync_session.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def iterate_sync(db, fn: Callable, *args, **kwargs) -> AsyncIterator:
+    """
+    Async iterator over the sync iterator `fn(session, *args, **kwargs)`,
+    advanced one item per `run_sync` so a streamed query never blocks the loop.
+    """
+    iterator = await db.run_sync(lambda session: iter(fn(session, *args, **kwargs)))
+    done = object()
+    while True:
+        item = await db.run_sync(lambda session: next(iterator, done))
+        if item is done:
+            return
+        yield item
+
+
+# Requests, parse workers and server startup use the async engines. The sync
+# ones (`engine`, `read_engine`, `SessionLocal`) are built on first use, by
+# scripts, benchmarks and `alembic` only: with managed SQLite each would hold a
+# second writer connection, so a server process never builds them.
+async_engine, async_read_engine = create_engines(async_url(settings.DATABASE_URL), create=create_async_engine)
+AsyncSessionLocal = create_async_session_factory(async_engine, async_read_engine)
+
+_sync = None
+
+
+def _sync_database() -> tuple:
+    """`(engine, read_engine, SessionLocal)`, built the first time one of them is used."""
+    global _sync
+    if _sync is None:
+        engine, read_engine = create_engines(settings.DATABASE_URL)
+        _sync = (engine, read_engine, create_session_factory(engine, read_engine))
+    return _sync
+
+
+def sync_engines_built() -> bool:
+    return _sync is not None
+
+
+def __getattr__(name):
+    if name in ("engine", "read_engine", "SessionLocal"):
+        return _sync_database()[("engine", "read_engine", "SessionLocal").index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db():
-    db = SessionLocal()
+    db = _sync_database()[2]()
     try:
         yield db
     finally:
         db.close()
 
-def check_connection():
+async def get_async_db():
+    """Request-scoped AsyncSession; sync crud/service functions run on it through `await db.run_sync(fn, ...)`."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def check_connection():
     try:
-        with engine.connect() as conn:
-            if "sqlite" in settings.DATABASE_URL:
-                conn.execute(text("SELECT 1"))
-            else:
-                conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
             print(f"✅ Connected to database: {settings.DATABASE_URL}")
             return True
     except Exception as e:
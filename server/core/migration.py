@@ -2,8 +2,32 @@ import os
 import shutil
 import logging
 
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Connection
+
 logger = logging.getLogger(__name__)
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def run_schema_migrations(bind):
+    """
+    Applies pending Alembic revisions (server/migrations) on top of the schema
+    created by `create_all`, e.g. indexes added to tables of existing databases.
+    `bind` is an engine, or a connection already in a transaction (the server
+    passes its async writer's through `run_sync`).
+    """
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    if isinstance(bind, Connection):
+        config.attributes["connection"] = bind
+        command.upgrade(config, "head")
+        return
+    with bind.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
 def migrate_data(data_dir: str, legacy_db_path: str, legacy_uploads_path: str):
     """
     Migrates data from legacy locations (root folder) to the new data directory.
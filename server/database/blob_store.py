@@ -0,0 +1,46 @@
+"""
+Compression and content addressing for raw posting texts (`raw_texts` table).
+
+Texts are keyed by the sha256 of their UTF-8 bytes, so re-importing or
+re-adding the same posting stores it once. zstd is used when the optional
+`zstandard` package is installed and RAW_DATA_CODEC asks for it; zlib otherwise.
+Each row records its codec, so both can coexist in one database.
+"""
+import hashlib
+import zlib
+from typing import Tuple
+
+from core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text: str) -> Tuple[str, bytes]:
+    """Returns (codec, compressed bytes)."""
+    data = text.encode("utf-8")
+    if settings.RAW_DATA_CODEC == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=settings.RAW_DATA_LEVEL).compress(data)
+    return "zlib", zlib.compress(data, min(settings.RAW_DATA_LEVEL, 9))
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("raw text is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown raw text codec: {codec}")
+
+
+def blob_row(text: str) -> dict:
+    """Column values for a `raw_texts` row holding `text`."""
+    codec, data = compress(text)
+    return {"hash": text_hash(text), "codec": codec, "size": len(text.encode("utf-8")), "data": data}
@@ -1,5 +1,11 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
+from sqlalchemy import DateTime, String, and_, func, literal, or_, select, type_coerce
+from sqlalchemy.orm import Session, load_only, selectinload
+from datetime import datetime
+from typing import List
+import base64
+import json
+
+from . import blob_store, models, schemas
 
 
 def get_profile(db: Session, profile_id: str):
@@ -25,6 +31,7 @@ def create_profile(db: Session, profile: schemas.ProfileCreate):
 def delete_profile(db: Session, profile_id: str):
     db_profile = get_profile(db, profile_id)
     if db_profile:
+        # Cascades to its applications, whose unshared raw texts are pruned on flush
         db.delete(db_profile)
         db.commit()
     return db_profile
@@ -61,19 +68,165 @@ def create_resume(db: Session, resume: schemas.ResumeCreate, file_path: str, ver
     return db_resume
 
 
-def get_applications(db: Session, profile_id: str = None, resume_version: int = None, skip: int = 0, limit: int = 100):
-    query = db.query(models.JobApplication)
-    if profile_id:
-        query = query.filter(models.JobApplication.profile_id == profile_id)
-    if resume_version:
-        query = query.filter(models.JobApplication.resume_version == resume_version)
+def _filter_applications(query, filters: schemas.ApplicationFilters = None):
+    if not filters:
+        return query
+    App = models.JobApplication
+    if filters.profile_id:
+        query = query.filter(App.profile_id == filters.profile_id)
+    if filters.resume_version:
+        query = query.filter(App.resume_version == filters.resume_version)
+    if filters.status:
+        query = query.filter(App.status.in_(filters.status))
+    if filters.is_archived is not None:
+        query = query.filter(App.is_archived == filters.is_archived)
+    if filters.is_favorite is not None:
+        query = query.filter(App.is_favorite == filters.is_favorite)
+    if filters.seniority:
+        query = query.filter(App.seniority.in_(filters.seniority))
+    if filters.work_mode:
+        query = query.filter(App.work_mode.in_(filters.work_mode))
+    if filters.source:
+        query = query.filter(App.source.in_(filters.source))
+    if filters.company:
+        query = query.filter(App.company.ilike(f"%{filters.company}%"))
+    if filters.applied_from:
+        query = query.filter(App.applied_at >= filters.applied_from)
+    if filters.applied_to:
+        query = query.filter(App.applied_at <= filters.applied_to)
+    if filters.skills:
+        Skill = models.ApplicationSkill
+        matching = select(Skill.application_id).where(Skill.kind == "required", Skill.skill.in_(filters.skills))
+        if filters.skills_match == "all":
+            matching = matching.group_by(Skill.application_id).having(func.count() == len(set(filters.skills)))
+        query = query.filter(App.id.in_(matching))
+    return query
+
+
+def _application_query(db: Session, columns: List[str] = None):
+    """
+    Query for applications, loading only `columns` (plus the primary key) when
+    given. Full rows also fetch their raw texts in one extra query per page.
+    """
+    App = models.JobApplication
+    query = db.query(App)
+    if columns is None:
+        return query.options(selectinload(App.raw_text))
+    attributes = [getattr(App, name) for name in columns if name != "raw_data"]
+    if "raw_data" not in columns:
+        return query.options(load_only(*attributes))
+    return query.options(load_only(*attributes, App.raw_data_hash), selectinload(App.raw_text))
+
+
+def get_applications(db: Session, filters: schemas.ApplicationFilters = None, skip: int = 0, limit: int = 100, columns: List[str] = None):
+    query = _filter_applications(_application_query(db, columns), filters)
     return query.order_by(models.JobApplication.applied_at.desc()).offset(skip).limit(limit).all()
 
 
+def iter_applications(db: Session, filters: schemas.ApplicationFilters = None, batch_size: int = 500):
+    """Stream matching applications newest first, `batch_size` rows per fetch."""
+    App = models.JobApplication
+    query = _filter_applications(db.query(App), filters)
+    return (
+        query.order_by(App.applied_at.desc(), App.id.desc())
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+
+
+def count_applications(db: Session, filters: schemas.ApplicationFilters = None) -> int:
+    query = _filter_applications(db.query(func.count(models.JobApplication.id)), filters)
+    return query.scalar()
+
+
+def _encode_cursor(value, app_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, app_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str):
+    try:
+        value, app_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_by == "applied_at":
+            datetime.fromisoformat(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    return value, app_id
+
+
+def _stored_as_text(db: Session, column) -> bool:
+    # SQLite keeps datetimes as text in two forms, "YYYY-MM-DD HH:MM:SS" from
+    # CURRENT_TIMESTAMP defaults and "YYYY-MM-DD HH:MM:SS.ffffff" from the ORM,
+    # and sorts them as text. The cursor carries the last row's stored text, so
+    # the keyset comparison sees the same values as the ORDER BY
+    return isinstance(column.type, DateTime) and db.get_bind().dialect.name == "sqlite"
+
+
+def _keyset_value(db: Session, column, value):
+    if _stored_as_text(db, column):
+        return literal(value, String)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def get_applications_page(
+    db: Session,
+    filters: schemas.ApplicationFilters = None,
+    limit: int = 100,
+    cursor: str = None,
+    sort_by: str = "applied_at",
+    order: str = "desc",
+    columns: List[str] = None,
+):
+    """
+    Keyset pagination over (sort column, id). Each page costs the same no matter
+    how deep it is. Returns the page and the cursor for the next one (None at the end).
+    `columns` limits the loaded columns and must include `sort_by`.
+    """
+    App = models.JobApplication
+    column = getattr(App, sort_by)
+    query = _filter_applications(_application_query(db, columns), filters)
+
+    if cursor:
+        value, app_id = _decode_cursor(cursor, sort_by)
+        value = _keyset_value(db, column, value)
+        if order == "desc":
+            query = query.filter(or_(column < value, and_(column == value, App.id < app_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, App.id > app_id)))
+
+    if order == "desc":
+        query = query.order_by(column.desc(), App.id.desc())
+    else:
+        query = query.order_by(column.asc(), App.id.asc())
+
+    if _stored_as_text(db, column):
+        rows = query.add_columns(type_coerce(column, String)).limit(limit + 1).all()
+        items, keys = [row[0] for row in rows], [row[1] for row in rows]
+    else:
+        items = query.limit(limit + 1).all()
+        keys = [getattr(item, sort_by) for item in items]
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(keys[limit - 1], items[-1].id)
+    return items, next_cursor
+
+
 def get_application(db: Session, application_id: str):
     return db.query(models.JobApplication).filter(models.JobApplication.id == application_id).first()
 
 
+def get_applications_by_ids(db: Session, application_ids: List[str], columns: List[str] = None):
+    """Applications with the given ids, in the order of `application_ids`."""
+    apps = _application_query(db, columns).filter(models.JobApplication.id.in_(application_ids)).all()
+    by_id = {app.id: app for app in apps}
+    return [by_id[app_id] for app_id in application_ids if app_id in by_id]
+
+
 def create_application(db: Session, application: schemas.JobApplicationCreate):
     db_app = models.JobApplication(**application.model_dump())
     db.add(db_app)
@@ -82,6 +235,23 @@ def create_application(db: Session, application: schemas.JobApplicationCreate):
     return db_app
 
 
+def create_applications(db: Session, applications: List[schemas.JobApplicationCreate]):
+    db_apps = [models.JobApplication(**application.model_dump()) for application in applications]
+    db.add_all(db_apps)
+    db.flush()
+    application_ids = [db_app.id for db_app in db_apps]
+    db.commit()
+    return get_applications_by_ids(db, application_ids)
+
+
+def get_application_urls(db: Session, profile_id: str) -> set:
+    rows = db.query(models.JobApplication.url).filter(
+        models.JobApplication.profile_id == profile_id,
+        models.JobApplication.url.isnot(None),
+    )
+    return {url for (url,) in rows}
+
+
 def update_application(db: Session, application_id: str, updates: schemas.JobApplicationUpdate):
     db_app = get_application(db, application_id)
     if not db_app:
@@ -105,6 +275,29 @@ def update_application(db: Session, application_id: str, updates: schemas.JobApp
 def delete_application(db: Session, application_id: str):
     db_app = get_application(db, application_id)
     if db_app:
+        # Its raw text goes with it when no other application shares it (models' flush hooks)
         db.delete(db_app)
         db.commit()
     return db_app
+
+
+def store_raw_texts(db: Session, texts: List[str]) -> List[str]:
+    """Store texts in raw_texts (once per distinct hash) and return their hashes."""
+    rows = {}
+    hashes = []
+    for text in texts:
+        text_hash = blob_store.text_hash(text)
+        hashes.append(text_hash)
+        if text_hash not in rows:
+            rows[text_hash] = blob_store.blob_row(text)
+    if rows:
+        db.execute(models.raw_text_insert(db.get_bind().dialect.name), list(rows.values()))
+    return hashes
+
+
+def prune_raw_texts(db: Session, hashes: List[str] = None) -> int:
+    """
+    Delete raw texts no application points to (only among `hashes` when given).
+    ORM changes prune as they flush; this catches up after bulk or raw SQL deletes.
+    """
+    return db.execute(models.unreferenced_raw_texts(hashes)).rowcount
@@ -1,18 +1,25 @@
-from sqlalchemy import ForeignKey, Text, Enum, Boolean, String, Integer, DateTime
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy import ForeignKey, Text, Enum, Boolean, String, Integer, DateTime, Index, LargeBinary, delete, event, inspect, select
+from sqlalchemy.orm import relationship, Mapped, mapped_column, Session
 from sqlalchemy.sql import func
 from sqlalchemy.types import JSON
 from typing import List, Optional, Any
+from datetime import datetime, timezone
+from itertools import chain
 import uuid
 import enum
 
 from core.database import Base
+from database import blob_store, search_index
 
 
 def generate_uuid():
     return str(uuid.uuid4())
 
 
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
 class ApplicationStatus(str, enum.Enum):
     parsing = "parsing"
     failed = "failed"
@@ -23,6 +30,12 @@ class ApplicationStatus(str, enum.Enum):
     rejected = "rejected"
 
 
+class ParseJobStatus(str, enum.Enum):
+    queued = "queued"
+    leased = "leased"
+    failed = "failed"
+
+
 class Seniority(str, enum.Enum):
     trainee = "trainee"
     junior = "junior"
@@ -45,6 +58,10 @@ class Profile(Base):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # get_resumes / get_latest_resume_version: WHERE profile_id ORDER BY version
+        Index("ix_resumes_profile_version", "profile_id", "version"),
+    )
 
     id: Mapped[str] = mapped_column(primary_key=True, default=generate_uuid)
     profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id"))
@@ -59,6 +76,14 @@ class Resume(Base):
 
 class JobApplication(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # List pages: WHERE profile_id [...] ORDER BY applied_at, id (keyset)
+        Index("ix_applications_profile_applied", "profile_id", "applied_at", "id"),
+        # List pages across all profiles
+        Index("ix_applications_applied", "applied_at", "id"),
+        # Import dedup: WHERE profile_id AND url
+        Index("ix_applications_profile_url", "profile_id", "url"),
+    )
 
     id: Mapped[str] = mapped_column(primary_key=True, default=generate_uuid)
     profile_id: Mapped[str] = mapped_column(ForeignKey("profiles.id"))
@@ -81,7 +106,11 @@ class JobApplication(Base):
     employment_type: Mapped[Optional[str]] = mapped_column(nullable=True)
     seniority: Mapped[Optional[Seniority]] = mapped_column(Enum(Seniority), nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    raw_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Posting text lives compressed in raw_texts; see the raw_data property
+    # active_history: the replaced hash is known at flush even if it wasn't loaded, so its blob can be pruned
+    raw_data_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("raw_texts.hash"), nullable=True, index=True, active_history=True
+    )
     
     status: Mapped[ApplicationStatus] = mapped_column(Enum(ApplicationStatus), default=ApplicationStatus.no_response)
     is_favorite: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -93,4 +122,164 @@ class JobApplication(Base):
     
     profile: Mapped["Profile"] = relationship(back_populates="applications")
     resume: Mapped["Resume"] = relationship(back_populates="applications")
+    parse_job: Mapped[Optional["ParseJob"]] = relationship(back_populates="application", cascade="all, delete-orphan")
+    raw_text: Mapped[Optional["RawText"]] = relationship(viewonly=True)
+
+    _raw_data_pending = None
+    _raw_data_cache = None
+
+    @property
+    def raw_data(self) -> Optional[str]:
+        """Original posting text, loaded and decompressed on first access."""
+        if self._raw_data_pending is not None:
+            return self._raw_data_pending
+        if self.raw_data_hash is None:
+            return None
+        if self._raw_data_cache and self._raw_data_cache[0] == self.raw_data_hash:
+            return self._raw_data_cache[1]
+        blob = self.raw_text
+        if blob is None or blob.hash != self.raw_data_hash:
+            session = Session.object_session(self)
+            blob = session.get(RawText, self.raw_data_hash) if session else None
+        if blob is None:
+            return None
+        text = blob_store.decompress(blob.codec, blob.data)
+        self._raw_data_cache = (blob.hash, text)
+        return text
+
+    @raw_data.setter
+    def raw_data(self, value: Optional[str]):
+        # Stored by the before_flush hook below
+        self._raw_data_pending = value
+        self.raw_data_hash = blob_store.text_hash(value) if value is not None else None
+
+
+class ApplicationSkill(Base):
+    """
+    One normalized technology of an application's tech_stack ("required") or
+    nice_to_have_stack ("nice_to_have"); maintained by services/skills.py.
+    """
+    __tablename__ = "application_skills"
+    __table_args__ = (
+        # Skill filters: WHERE skill IN (...) AND kind
+        Index("ix_application_skills_skill", "skill", "kind", "application_id"),
+    )
+
+    application_id: Mapped[str] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    skill: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+
+class RawText(Base):
+    """Content-addressed, compressed posting text shared by applications with identical raw_data."""
+    __tablename__ = "raw_texts"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(16))
+    size: Mapped[int] = mapped_column(Integer)  # uncompressed bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
+def raw_text_insert(dialect_name: str):
+    """INSERT into raw_texts that skips hashes already stored."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(RawText.__table__).on_conflict_do_nothing(index_elements=["hash"])
+
+
+@event.listens_for(JobApplication.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    search_index.create(connection)
+
+
+@event.listens_for(JobApplication.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    search_index.drop(connection)
+
+
+def unreferenced_raw_texts(hashes=None):
+    """DELETE of raw texts no application points to (only among `hashes` when given)."""
+    referenced = select(JobApplication.raw_data_hash).where(JobApplication.raw_data_hash.isnot(None))
+    statement = delete(RawText.__table__).where(RawText.hash.notin_(referenced))
+    if hashes is not None:
+        statement = statement.where(RawText.hash.in_(hashes))
+    return statement
+
+
+def _released_raw_texts(session) -> set:
+    """Hashes the flush stops pointing to: replaced or cleared raw_data, deleted applications."""
+    released = set()
+    for obj in session.dirty:
+        if isinstance(obj, JobApplication):
+            released.update(h for h in inspect(obj).attrs.raw_data_hash.history.deleted if h)
+    for obj in session.deleted:
+        if isinstance(obj, JobApplication) and obj.raw_data_hash:
+            released.add(obj.raw_data_hash)
+    return released
+
+
+@event.listens_for(Session, "before_flush")
+def _store_pending_raw_texts(session, flush_context, instances):
+    released = _released_raw_texts(session)
+    if released:
+        session.info.setdefault("released_raw_texts", set()).update(released)
+
+    pending = [
+        obj for obj in chain(session.new, session.dirty)
+        if isinstance(obj, JobApplication) and obj._raw_data_pending is not None
+    ]
+    if not pending:
+        return
+    rows = {}
+    for obj in pending:
+        if obj.raw_data_hash not in rows:
+            rows[obj.raw_data_hash] = blob_store.blob_row(obj._raw_data_pending)
+    connection = session.connection()
+    connection.execute(raw_text_insert(connection.dialect.name), list(rows.values()))
+    for obj in pending:
+        obj._raw_data_cache = (obj.raw_data_hash, obj._raw_data_pending)
+        obj._raw_data_pending = None
+
+
+@event.listens_for(Session, "after_flush")
+def _prune_released_raw_texts(session, flush_context):
+    # Blobs are shared by identical postings: only those nothing points to any more are deleted
+    released = session.info.pop("released_raw_texts", None)
+    if released:
+        session.connection().execute(unreferenced_raw_texts(released))
+
+
+class ParseJob(Base):
+    __tablename__ = "parse_jobs"
+    __table_args__ = (
+        # lease_jobs: WHERE status AND available_at ORDER BY available_at
+        Index("ix_parse_jobs_status_available", "status", "available_at"),
+    )
+
+    id: Mapped[str] = mapped_column(primary_key=True, default=generate_uuid)
+    application_id: Mapped[str] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), unique=True)
+    status: Mapped[ParseJobStatus] = mapped_column(Enum(ParseJobStatus), default=ParseJobStatus.queued)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    available_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    leased_until: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    leased_by: Mapped[Optional[str]] = mapped_column(nullable=True)
+    bypass_cache: Mapped[bool] = mapped_column(Boolean, default=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    application: Mapped["JobApplication"] = relationship(back_populates="parse_job")
+
+
+class ParseCacheEntry(Base):
+    __tablename__ = "parse_cache"
 
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column()
+    prompt_version: Mapped[str] = mapped_column()
+    result: Mapped[str] = mapped_column(Text)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    last_used_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
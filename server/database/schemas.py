@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, ConfigDict
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 
 from database.models import ApplicationStatus, Seniority
@@ -63,6 +63,30 @@ class JobApplicationCreate(JobApplicationBase):
     company: Optional[str] = "Parsing..."
     position: Optional[str] = "Parsing..."
 
+SkillKind = Literal["required", "nice_to_have"]
+SkillMatch = Literal["any", "all"]
+
+class ApplicationFilters(BaseModel):
+    profile_id: Optional[str] = None
+    resume_version: Optional[int] = None
+    status: Optional[List[ApplicationStatus]] = None
+    is_archived: Optional[bool] = None
+    is_favorite: Optional[bool] = None
+    seniority: Optional[List[Seniority]] = None
+    work_mode: Optional[List[str]] = None
+    source: Optional[List[str]] = None
+    company: Optional[str] = None
+    applied_from: Optional[datetime] = None
+    applied_to: Optional[datetime] = None
+    skills: Optional[List[str]] = None  # normalized names, see services/skills.py
+    skills_match: SkillMatch = "any"
+
+ApplicationSortField = Literal["applied_at", "company", "position"]
+SortOrder = Literal["asc", "desc"]
+
+class JobApplicationBatchCreate(BaseModel):
+    items: List[JobApplicationCreate] = Field(min_length=1, max_length=500)
+
 class JobApplicationUpdate(BaseModel):
     company: Optional[str] = None
     position: Optional[str] = None
@@ -108,3 +132,85 @@ class JobApplication(JobApplicationBase):
         return v
 
 
+class JobApplicationSummary(BaseModel):
+    """List-view projection of JobApplication without the long text columns."""
+    id: str
+    profile_id: str
+    resume_id: str
+    resume_version: int
+    url: Optional[str] = None
+
+    company: str
+    position: str
+    location: Optional[str] = None
+    salary: Optional[str] = None
+    source: Optional[str] = None
+    tech_stack: List[str] = []
+    nice_to_have_stack: List[str] = []
+    responsibilities: List[str] = []
+    requirements: List[str] = []
+    work_mode: Optional[str] = None
+    employment_type: Optional[str] = None
+    seniority: Optional[Seniority] = None
+    status: ApplicationStatus = ApplicationStatus.parsing
+    is_favorite: bool = False
+    is_archived: bool = False
+
+    applied_at: datetime
+    responded_at: Optional[datetime]
+    interview_date: Optional[datetime]
+    rejected_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def validate_status(cls, v):
+        if v is None:
+            return ApplicationStatus.failed
+        return v
+
+ApplicationListView = Literal["summary", "full"]
+
+class ApplicationSearchResult(BaseModel):
+    application: JobApplicationSummary
+    rank: float  # higher is better; only comparable within one query
+    snippet: Optional[str] = None  # HTML-escaped, matches wrapped in <mark>
+
+
+class WeekCount(BaseModel):
+    week: str  # Monday of the week, YYYY-MM-DD
+    count: int
+
+class TermCount(BaseModel):
+    name: str
+    count: int
+
+class ParseModelStats(BaseModel):
+    model: str
+    requests: int
+    errors: int
+    cancelled: int  # lost a hedge race
+    window: int  # attempts the rates/percentiles below cover
+    error_rate: float
+    p50_seconds: Optional[float] = None
+    p95_seconds: Optional[float] = None
+    healthy: bool
+    hedge_after_seconds: Optional[float] = None
+
+class ApplicationStats(BaseModel):
+    total: int
+    responded: int
+    interviews: int
+    offers: int
+    response_rate: int  # percent of total
+    interview_rate: int  # percent of responded
+    median_days_to_response: Optional[float] = None
+    by_status: Dict[str, int]
+    by_source: Dict[str, int]
+    by_seniority: Dict[str, int]
+    by_work_mode: Dict[str, int]
+    by_week: List[WeekCount]
+    top_tech_stack: List[TermCount]
+    missing: Dict[str, int]  # description, requirements, responsibilities, tech_stack
+    incomplete: int
@@ -0,0 +1,102 @@
+"""
+Full-text index over applications, kept in sync by the database itself.
+
+SQLite: an FTS5 table `applications_fts` filled by triggers on applications.
+JSON list columns are flattened to comma-separated text, and only edits to
+indexed columns rewrite the entry (status changes don't).
+
+Postgres: a generated `search_vector` tsvector column with a GIN index.
+
+Neither is part of the ORM model. `create` runs from the applications table's
+after_create event for new databases and from migration 0003 for existing ones.
+"""
+from sqlalchemy import bindparam, inspect, text
+
+FTS_TABLE = "applications_fts"
+
+# bm25 weights, in FTS column order (application_id is unindexed)
+FTS_COLUMNS = ["company", "position", "location", "description", "requirements", "responsibilities", "tech_stack"]
+FTS_WEIGHTS = [0.0, 5.0, 5.0, 2.0, 1.0, 1.0, 1.0, 3.0]
+
+SQLITE_TRIGGERS = ["applications_fts_insert", "applications_fts_update", "applications_fts_delete"]
+
+_JSON_COLUMNS = {"requirements", "responsibilities", "tech_stack"}
+
+
+def _fts_values(row: str) -> str:
+    values = []
+    for column in FTS_COLUMNS:
+        if column in _JSON_COLUMNS:
+            values.append(f"(SELECT group_concat(value, ', ') FROM json_each({row}.{column}))")
+        else:
+            values.append(f"{row}.{column}")
+    return ", ".join(values)
+
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        application_id UNINDEXED, {", ".join(FTS_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+        INSERT INTO {FTS_TABLE} (application_id, {", ".join(FTS_COLUMNS)}) VALUES (new.id, {_fts_values("new")});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON applications BEGIN
+        DELETE FROM {FTS_TABLE} WHERE application_id = old.id;
+        INSERT INTO {FTS_TABLE} (application_id, {", ".join(FTS_COLUMNS)}) VALUES (new.id, {_fts_values("new")});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+        DELETE FROM {FTS_TABLE} WHERE application_id = old.id;
+    END""",
+]
+
+SQLITE_BACKFILL = f"""
+    INSERT INTO {FTS_TABLE} (application_id, {", ".join(FTS_COLUMNS)})
+    SELECT applications.id, {_fts_values("applications")} FROM applications
+"""
+
+_POSTGRES_VECTOR = " || ".join(
+    f"setweight(to_tsvector('simple', coalesce({expression}, '')), '{weight}')"
+    for expression, weight in [
+        ("company", "A"), ("position", "A"), ("tech_stack::text", "B"), ("location", "B"),
+        ("description", "C"), ("requirements::text", "C"), ("responsibilities::text", "C"),
+    ]
+)
+
+POSTGRES_DDL = [
+    f"ALTER TABLE applications ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({_POSTGRES_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_applications_search ON applications USING GIN (search_vector)",
+]
+
+
+def exists(connection) -> bool:
+    if connection.dialect.name == "sqlite":
+        # Rebuilding applications (batch migrations) drops the triggers but not the FTS table
+        names = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE name IN :names").bindparams(bindparam("names", expanding=True)),
+            {"names": [FTS_TABLE, *SQLITE_TRIGGERS]},
+        ).scalars()
+        return len(set(names)) == 1 + len(SQLITE_TRIGGERS)
+    return "search_vector" in {column["name"] for column in inspect(connection).get_columns("applications")}
+
+
+def create(connection):
+    """Create the index for the connection's dialect and index existing rows."""
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        connection.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        connection.execute(text(SQLITE_BACKFILL))
+    elif connection.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+
+def drop(connection):
+    if connection.dialect.name == "sqlite":
+        for trigger in SQLITE_TRIGGERS:
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    elif connection.dialect.name == "postgresql":
+        connection.execute(text("DROP INDEX IF EXISTS ix_applications_search"))
+        connection.execute(text("ALTER TABLE applications DROP COLUMN IF EXISTS search_vector"))
@@ -1,13 +1,17 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from core.database import check_connection, engine
+from core.database import AsyncSessionLocal, async_engine, async_read_engine, check_connection, get_async_db
 from core.config import settings
-from core.migration import migrate_data
+from core.migration import migrate_data, run_schema_migrations
 from database import models
 from routers import profiles, resumes, applications
+from services import metrics, profiling
+from services.parse_queue import ParseWorkerPool, queue_depth, recover_orphans
+from services.job_parser.ai.client import close_client
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -23,10 +27,30 @@ async def lifespan(app: FastAPI):
         legacy_uploads_path="uploads"
     )
     
-    check_connection()
-    models.Base.metadata.create_all(bind=engine)
+    # Through the async writer, so this process never opens a second one
+    await check_connection()
+    async with async_engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+        await connection.run_sync(run_schema_migrations)
+
+    async with AsyncSessionLocal() as db:
+        recovered = await db.run_sync(recover_orphans)
+    if recovered:
+        logger.info(f"♻️ Re-queued {recovered} applications left in parsing state")
+
+    parse_pool = ParseWorkerPool(
+        handler=applications.process_application_background,
+        batch_handler=applications.process_applications_batch
+    )
+    await parse_pool.start()
+    app.state.parse_pool = parse_pool
+
     logger.info("🚀 Server started successfully")
     yield
+    await parse_pool.stop()
+    await close_client()
+    for bind in {async_engine, async_read_engine}:
+        await bind.dispose()
 
 app = FastAPI(
     title="Vacancio API",
@@ -41,8 +65,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "Server-Timing"],
 )
 
+# Startup, requests and parse workers all go through the async engines
+engines = [async_engine.sync_engine, async_read_engine.sync_engine]
+
+if settings.METRICS_ENABLED:
+    for bind in engines:
+        metrics.instrument_engine(bind)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Inactive unless PROFILING_SAMPLE_RATE or PROFILING_ALLOW_HEADER is set
+for bind in engines:
+    profiling.instrument_engine(bind)
+app.add_middleware(profiling.ProfilingMiddleware)
+
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 app.include_router(profiles.router, prefix="/profiles", tags=["Profiles"])
 app.include_router(resumes.router, prefix="/resumes", tags=["Resumes"])
@@ -56,3 +94,13 @@ def root():
         "version": "2.0.0",
         "docs": "/docs"
     }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def read_metrics(db: AsyncSession = Depends(get_async_db)):
+    """Prometheus scrape endpoint; the parse queue depth is read from the database here."""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    for status, count in (await db.run_sync(queue_depth)).items():
+        metrics.PARSE_QUEUE_DEPTH.labels(status=status).set(count)
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,167 @@
+"""
+Frozen skill normalization rules and application_skills backfill for
+revisions 0004 and 0005.
+
+A migration has to replay the same way however the application code changes
+later, so nothing here imports from the app and nothing here is edited: new
+rules get a new revision with its own copy. Rows are normalized with the
+bundled rules only; deployments with a TECH_SYNONYMS_FILE rebuild the index
+with their own rules via `python -m services.skills` after upgrading.
+"""
+from typing import Callable, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+MAX_SKILL_LENGTH = 100
+BATCH_SIZE = 1000
+
+# KNOWN_TECHNOLOGIES of services/job_parser/validator.py at revision 0005
+TECHNOLOGIES_0005 = [
+    ".NET Core", "Adobe XD", "Airflow", "Android SDK", "Angular", "Ansible", "Apache", "Appium",
+    "ArgoCD", "AWS", "Azure", "Azure Networking", "Azure Storage", "Azure VM", "Bash", "Bitbucket",
+    "Bootstrap", "C#", "C++", "Cassandra", "Chef", "CI/CD", "CircleCI", "ClickHouse",
+    "CloudFormation", "CloudWatch", "Confluence", "CSS", "Cypress", "Dart", "Datadog",
+    "DigitalOcean", "Django", "DNS", "Docker", "DynamoDB", "EC2", "ECS", "EKS", "Elasticsearch",
+    "ELK", "Emotion", "Express", "FastAPI", "Figma", "Flask", "Flutter", "Flux", "GCP", "Git",
+    "GitHub Actions", "GitLab CI", "Go", "Google Cloud", "Grafana", "Hadoop", "HAProxy", "Helm",
+    "Heroku", "HTML", "HTTP", "HTTPS", "IAM", "iOS SDK", "Java", "JavaScript", "Jenkins", "Jest",
+    "Jetpack Compose", "Jira", "JUnit", "JWT", "Kafka", "Kibana", "Kotlin", "Kubernetes", "Lambda",
+    "Laravel", "Less", "Linux", "Logstash", "MacOS", "MariaDB", "MLflow", "MobX", "Mocha",
+    "MongoDB", "MySQL", "NestJS", "New Relic", "Next.js", "Nginx", "Node.js", "NumPy", "Nuxt.js",
+    "OAuth", "Objective-C", "OpenShift", "Oracle", "Pandas", "Photoshop", "PHP", "Playwright",
+    "PostgreSQL", "Postman", "Power BI", "PowerShell", "Prometheus", "Puppet", "Python", "PyTorch",
+    "Rancher", "React", "React Native", "Redis", "Redux", "Ruby", "Ruby on Rails", "Rust", "S3",
+    "Sass", "Scala", "Scikit-learn", "Selenium", "Sentry", "Sketch", "Spark", "Splunk",
+    "Spring Boot", "SQL", "SQL Server", "SQLite", "SSL/TLS", "Svelte", "SVN", "Swift", "SwiftUI",
+    "Symfony", "Tableau", "Tailwind", "TCP/IP", "TensorFlow", "Terraform", "TestNG", "Traefik",
+    "Travis CI", "Trello", "TypeScript", "UDP", "Unix", "Vite", "VPN", "Vue", "Webpack", "Windows",
+    "Zabbix", "Zustand",
+]
+# Revision 0004 spelled Kafka in capitals
+TECHNOLOGIES_0004 = ["KAFKA" if name == "Kafka" else name for name in TECHNOLOGIES_0005]
+
+# services/job_parser/tech_synonyms.json at revision 0005
+SYNONYMS_0005 = {
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud Platform"],
+    "Kubernetes": ["k8s", "kube"],
+    "Terraform": ["Terraform Cloud"],
+    "CI/CD": ["CICD", "CI CD", "CI-CD"],
+    "GitLab CI": ["GitLab CI/CD", "GitLab-CI"],
+    "Go": ["Golang"],
+    "JavaScript": ["JS", "ECMAScript", "ES6"],
+    "TypeScript": ["TS"],
+    "C#": ["CSharp", "C Sharp"],
+    "C++": ["CPP"],
+    "Objective-C": ["ObjC", "Objective C"],
+    "PostgreSQL": ["Postgres", "Postgre", "psql", "PostgresQL", "pgsql"],
+    "MongoDB": ["Mongo"],
+    "SQL Server": ["MSSQL", "MS SQL", "Microsoft SQL Server"],
+    "Elasticsearch": ["Elastic Search"],
+    "React": ["React.js", "ReactJS"],
+    "React Native": ["ReactNative"],
+    "Vue": ["Vue.js", "VueJS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Next.js": ["NextJS"],
+    "Nuxt.js": ["NuxtJS", "Nuxt"],
+    "Node.js": ["Node", "NodeJS"],
+    "NestJS": ["Nest.js"],
+    "Express": ["Express.js", "ExpressJS"],
+    "Tailwind": ["Tailwind CSS", "TailwindCSS"],
+    "Spring Boot": ["SpringBoot"],
+    ".NET Core": [".NET", "dotnet", "dotnet core", "ASP.NET Core"],
+    "Ruby on Rails": ["Rails", "RoR"],
+    "Kafka": ["Apache Kafka"],
+    "Spark": ["Apache Spark", "PySpark"],
+    "Airflow": ["Apache Airflow"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "PyTorch": ["Torch"],
+    "Power BI": ["PowerBI"],
+    "GitHub Actions": ["GH Actions"],
+    "SSL/TLS": ["SSL", "TLS"],
+    "MacOS": ["OS X", "OSX"],
+}
+
+applications = sa.table(
+    "applications",
+    sa.column("id", sa.String),
+    sa.column("tech_stack", sa.JSON),
+    sa.column("nice_to_have_stack", sa.JSON),
+)
+application_skills = sa.table(
+    "application_skills",
+    sa.column("application_id", sa.String),
+    sa.column("kind", sa.String),
+    sa.column("skill", sa.String),
+)
+
+
+def _fallback(tech: str) -> Optional[str]:
+    return tech if len(tech) > 1 else None
+
+
+def normalizer_0004() -> Callable[[str], Optional[str]]:
+    """Exact, then case-insensitive match against TECHNOLOGIES_0004."""
+    exact = set(TECHNOLOGIES_0004)
+    by_lower = {name.lower(): name for name in TECHNOLOGIES_0004}
+
+    def normalize(tech: str) -> Optional[str]:
+        tech = tech.strip()
+        if tech in exact:
+            return tech
+        return by_lower.get(tech.lower()) or _fallback(tech)
+
+    return normalize
+
+
+def normalizer_0005() -> Callable[[str], Optional[str]]:
+    """Whitespace- and case-insensitive lookup of names and SYNONYMS_0005 aliases."""
+
+    def key(name: str) -> str:
+        return " ".join(name.split()).casefold()
+
+    aliases = {key(name): name for name in TECHNOLOGIES_0005}
+    for canonical, names in SYNONYMS_0005.items():
+        for name in [canonical, *names]:
+            aliases[key(name)] = canonical
+
+    def normalize(tech: str) -> Optional[str]:
+        tech = tech.strip()
+        return aliases.get(key(tech)) or _fallback(tech)
+
+    return normalize
+
+
+def _skills(values: Optional[Iterable], normalize: Callable) -> List[str]:
+    skills = []
+    for value in values or []:
+        if not isinstance(value, str):
+            continue
+        skill = (normalize(value) or "")[:MAX_SKILL_LENGTH]
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def backfill(bind, normalize: Callable[[str], Optional[str]]):
+    """Rebuild application_skills from every application's stacks with `normalize`."""
+    bind.execute(sa.delete(application_skills))
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(applications.c.id, applications.c.tech_stack, applications.c.nice_to_have_stack)
+            .where(applications.c.id > last_id)
+            .order_by(applications.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        skill_rows = [
+            {"application_id": app_id, "kind": kind, "skill": skill}
+            for app_id, required, nice_to_have in rows
+            for kind, values in (("required", required), ("nice_to_have", nice_to_have))
+            for skill in _skills(values, normalize)
+        ]
+        if skill_rows:
+            bind.execute(sa.insert(application_skills), skill_rows)
+        last_id = rows[-1][0]
@@ -0,0 +1,60 @@
+"""Composite indexes for the list, import-dedup and parse-queue queries
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+Databases created by `create_all` already have these indexes (they are
+declared on the models), so every step checks what exists first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_resumes_profile_version", "resumes", ["profile_id", "version"]),
+    ("ix_applications_profile_applied", "applications", ["profile_id", "applied_at", "id"]),
+    ("ix_applications_applied", "applications", ["applied_at", "id"]),
+    ("ix_applications_profile_url", "applications", ["profile_id", "url"]),
+    ("ix_parse_jobs_status_available", "parse_jobs", ["status", "available_at"]),
+]
+
+
+def _existing_indexes(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+    # Superseded by ix_parse_jobs_status_available
+    existing = _existing_indexes("parse_jobs")
+    if existing and "ix_parse_jobs_status" in existing:
+        op.drop_index("ix_parse_jobs_status", table_name="parse_jobs")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes("parse_jobs")
+    if existing is not None and "ix_parse_jobs_status" not in existing:
+        op.create_index("ix_parse_jobs_status", "parse_jobs", ["status"])
+
+    for name, table, _ in reversed(INDEXES):
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,116 @@
+"""Move applications.raw_data into the compressed, deduplicated raw_texts table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+`create_all` may already have created raw_texts and raw_data_hash on startup,
+so each step checks what exists first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database import blob_store
+from database.models import raw_text_insert
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _columns(table: str) -> set:
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("applications"):
+        return
+
+    if not inspector.has_table("raw_texts"):
+        op.create_table(
+            "raw_texts",
+            sa.Column("hash", sa.String(64), primary_key=True),
+            sa.Column("codec", sa.String(16), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("data", sa.LargeBinary(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+    if "raw_data_hash" not in _columns("applications"):
+        op.add_column("applications", sa.Column("raw_data_hash", sa.String(64), nullable=True))
+        op.create_index("ix_applications_raw_data_hash", "applications", ["raw_data_hash"])
+        if bind.dialect.name != "sqlite":
+            op.create_foreign_key(
+                "fk_applications_raw_data_hash", "applications", "raw_texts", ["raw_data_hash"], ["hash"]
+            )
+
+    if "raw_data" not in _columns("applications"):
+        return
+
+    applications = sa.table(
+        "applications",
+        sa.column("id", sa.String),
+        sa.column("raw_data", sa.Text),
+        sa.column("raw_data_hash", sa.String),
+    )
+    insert_blobs = raw_text_insert(bind.dialect.name)
+    while True:
+        rows = bind.execute(
+            sa.select(applications.c.id, applications.c.raw_data)
+            .where(applications.c.raw_data.isnot(None), applications.c.raw_data_hash.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        blobs = {}
+        for _, raw_data in rows:
+            blob = blob_store.blob_row(raw_data)
+            blobs[blob["hash"]] = blob
+        bind.execute(insert_blobs, list(blobs.values()))
+        bind.execute(
+            applications.update()
+            .where(applications.c.id == sa.bindparam("app_id"))
+            .values(raw_data_hash=sa.bindparam("hash")),
+            [{"app_id": app_id, "hash": blob_store.text_hash(raw_data)} for app_id, raw_data in rows],
+        )
+
+    with op.batch_alter_table("applications") as batch_op:
+        batch_op.drop_column("raw_data")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if "raw_data" not in _columns("applications"):
+        op.add_column("applications", sa.Column("raw_data", sa.Text(), nullable=True))
+
+    raw_texts = sa.table(
+        "raw_texts",
+        sa.column("hash", sa.String),
+        sa.column("codec", sa.String),
+        sa.column("data", sa.LargeBinary),
+    )
+    applications = sa.table("applications", sa.column("raw_data", sa.Text), sa.column("raw_data_hash", sa.String))
+    for blob_hash, codec, data in bind.execute(sa.select(raw_texts.c.hash, raw_texts.c.codec, raw_texts.c.data)):
+        bind.execute(
+            applications.update()
+            .where(applications.c.raw_data_hash == blob_hash)
+            .values(raw_data=blob_store.decompress(codec, data))
+        )
+
+    if bind.dialect.name != "sqlite":
+        op.drop_constraint("fk_applications_raw_data_hash", "applications", type_="foreignkey")
+    op.drop_index("ix_applications_raw_data_hash", table_name="applications")
+    with op.batch_alter_table("applications") as batch_op:
+        batch_op.drop_column("raw_data_hash")
+    op.drop_table("raw_texts")
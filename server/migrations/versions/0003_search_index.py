@@ -0,0 +1,37 @@
+"""Add the full-text search index over applications
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+
+Databases created by `create_all` already have the index (it is created from
+the applications table's after_create event); this revision builds and fills
+it for databases that predate it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database import search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("applications"):
+        return
+    if not search_index.exists(bind):
+        search_index.create(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    search_index.drop(op.get_bind())
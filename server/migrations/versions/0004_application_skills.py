@@ -0,0 +1,45 @@
+"""Add the application_skills index and fill it from existing applications
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+
+`create_all` may already have created the (empty) table on startup. Rows
+are built with the rules frozen in migrations/skill_rules.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations import skill_rules
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("applications"):
+        return
+    if not inspector.has_table("application_skills"):
+        op.create_table(
+            "application_skills",
+            sa.Column("application_id", sa.String(), sa.ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("kind", sa.String(16), primary_key=True),
+            sa.Column("skill", sa.String(100), primary_key=True),
+        )
+        op.create_index("ix_application_skills_skill", "application_skills", ["skill", "kind", "application_id"])
+    skill_rules.backfill(bind, skill_rules.normalizer_0004())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_application_skills_skill", table_name="application_skills")
+    op.drop_table("application_skills")
@@ -0,0 +1,36 @@
+"""Rebuild application_skills with the alias index and synonyms table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+
+Synonyms like "k8s" and "Golang" now map to their canonical names, so rows
+written by the previous rules are rebuilt.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations import skill_rules
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table("application_skills"):
+        skill_rules.backfill(bind, skill_rules.normalizer_0005())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table("application_skills"):
+        skill_rules.backfill(bind, skill_rules.normalizer_0004())
@@ -1,16 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ConfigDict, TypeAdapter, create_model
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional
+import asyncio
+from functools import lru_cache
+import io
 import logging
+import time
 import traceback
+from datetime import datetime
 
 import json
 
-from core.database import get_db
+from core.config import settings
+from core.database import AsyncSessionLocal, get_async_db, iterate_sync
 from database import crud, schemas, models
-from services.job_parser.ai.parser import parse_with_ai
+from services import application_events, application_stats, metrics, parse_cache, search
+from services.skills import normalize_skills, top_skills
+from services.job_parser.ai import routing
+from services.job_parser.ai.parser import parse_with_ai_async, parse_batch_with_ai_async
+from services.job_parser.models import EmploymentType, WorkMode
+from services.data_export import iter_export, gzip_stream
+from services.data_import import import_applications_stream
+from services.parse_queue import enqueue_parse, enqueue_many
+from services.profiling import ProfiledRoute, serializing
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -29,103 +47,500 @@ def _format_salary(salary) -> Optional[str]:
     return " ".join(parts)
 
 
-def process_application_background(app_id: str):
+def _updates_from_parsed(parsed) -> schemas.JobApplicationUpdate:
+    return schemas.JobApplicationUpdate(
+        company=(parsed.company or "Unknown").strip()[:100],
+        position=(parsed.job_title or "Unknown Position").strip()[:100],
+        location=(parsed.location or "").strip()[:100],
+        salary=_format_salary(parsed.salary),
+        tech_stack=parsed.stack or [],
+        nice_to_have_stack=parsed.nice_to_have_stack or [],
+        responsibilities=parsed.responsibilities or [],
+        requirements=parsed.requirements or [],
+        description=parsed.project_description,
+        work_mode=parsed.work_mode,
+        employment_type=parsed.employment_type,
+        seniority=parsed.seniority,
+        status=models.ApplicationStatus.no_response
+    )
+
+
+def _updates_from_partial(fields: dict) -> Optional[schemas.JobApplicationUpdate]:
+    """
+    Updates for streamed LLM fields that are already usable as they are;
+    everything else waits for the validated posting.
+    """
+    updates = {}
+    for name, column in (("company", "company"), ("job_title", "position"), ("location", "location")):
+        value = fields.get(name)
+        if isinstance(value, str) and value.strip():
+            updates[column] = value.strip()[:100]
+    for name, enum in (("work_mode", WorkMode), ("employment_type", EmploymentType), ("seniority", models.Seniority)):
+        if fields.get(name) in {member.value for member in enum}:
+            updates[name] = fields[name]
+    for name, column in (("stack", "tech_stack"), ("nice_to_have_stack", "nice_to_have_stack"),
+                         ("requirements", "requirements"), ("responsibilities", "responsibilities")):
+        value = fields.get(name)
+        if isinstance(value, list):
+            items = [item.strip() for item in value if isinstance(item, str) and item.strip()]
+            updates[column] = normalize_skills(items) if name.endswith("stack") else items
+    if isinstance(fields.get("project_description"), str):
+        updates["description"] = fields["project_description"]
+    return schemas.JobApplicationUpdate(**updates) if updates else None
+
+
+@lru_cache(maxsize=64)
+def _adapter(model):
+    return TypeAdapter(model)
+
+
+async def _run(db: AsyncSession, model, fn, *args, **kwargs):
+    """
+    `fn(session, *args, **kwargs)` on the session, its ORM result validated into
+    `model` there: lazily loaded attributes (`raw_data`) can't load once the
+    result has left `run_sync`.
+    """
+    def run(session: Session):
+        result = fn(session, *args, **kwargs)
+        return None if result is None else _adapter(model).validate_python(result, from_attributes=True)
+    return await db.run_sync(run)
+
+
+def _parse_input(db: Session, app_id: str) -> Optional[tuple]:
+    """`(raw_data, url)` of an application, None if it doesn't exist."""
+    db_app = crud.get_application(db, app_id)
+    return (db_app.raw_data, db_app.url) if db_app else None
+
+
+async def _in_session(fn, *args, **kwargs):
+    """
+    `fn(session, *args, **kwargs)` on a session of its own. Parses hold no
+    session across the LLM call, which takes seconds: a pooled connection (and
+    on SQLite a read snapshot that blocks WAL checkpoints) would stay pinned.
+    """
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn, *args, **kwargs)
+
+
+async def process_application_background(app_id: str, final_attempt: bool = True, bypass_cache: bool = False):
+    """
+    Parse one application and store the result. Called by the parse worker pool;
+    raises on failure so the queue can retry, and only marks the application
+    `failed` once the last attempt is used up.
+    The LLM call is awaited on the shared async client and the DB reads and
+    writes on short-lived async sessions before and after it, so no thread or
+    connection is held while it runs. Identical postings are served from the
+    parse cache unless `bypass_cache` is set. With OPENROUTER_STREAMING,
+    fields are stored as soon as they stream in, while the status stays
+    `parsing`, so GET /applications/{id}/events can push them to the UI.
+    """
     logger.info(f"📋 Starting background parsing for application {app_id}")
-    db = next(get_db())
+    started = time.perf_counter()
+    outcome = "parsed"
+    cache_model = routing.cache_model()
     try:
-        db_app = crud.get_application(db, app_id)
-        if not db_app:
-            logger.warning(f"❌ Application {app_id} not found")
-            return
+        async with AsyncSessionLocal() as db:
+            parse_input = await db.run_sync(_parse_input, app_id)
+            if not parse_input:
+                logger.warning(f"❌ Application {app_id} not found")
+                outcome = "skipped"
+                return
+
+            raw_data, url = parse_input
+            if not raw_data:
+                logger.warning(f"❌ No raw data for application {app_id}")
+                outcome = "skipped"
+                return
+
+            parsed = None
+            if not bypass_cache:
+                with metrics.stage("cache_lookup"):
+                    parsed = await db.run_sync(parse_cache.get_cached, raw_data, cache_model, url)
 
-        if not db_app.raw_data:
-            logger.warning(f"❌ No raw data for application {app_id}")
-            return
+        if parsed:
+            logger.info(f"⚡ Parse cache hit for {app_id}")
+            outcome = "cached"
+        else:
+            async def store_partial(fields):
+                updates = _updates_from_partial(fields)
+                if updates is None:
+                    return
+                try:
+                    await _in_session(crud.update_application, app_id, updates)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not store streamed fields for {app_id}: {e}")
 
-        parsed = parse_with_ai(db_app.raw_data, source_url=db_app.url)
+            parsed = await parse_with_ai_async(raw_data, source_url=url, on_fields=store_partial)
         logger.info(f"✅ Parsing complete for {app_id}: {parsed.job_title} @ {parsed.company}")
-        
-        updates = schemas.JobApplicationUpdate(
-            company=(parsed.company or "Unknown").strip()[:100],
-            position=(parsed.job_title or "Unknown Position").strip()[:100],
-            location=(parsed.location or "").strip()[:100],
-            salary=_format_salary(parsed.salary),
-            tech_stack=parsed.stack or [],
-            nice_to_have_stack=parsed.nice_to_have_stack or [],
-            responsibilities=parsed.responsibilities or [],
-            requirements=parsed.requirements or [],
-            description=parsed.project_description,
-            work_mode=parsed.work_mode,
-            employment_type=parsed.employment_type,
-            seniority=parsed.seniority,
-            status=models.ApplicationStatus.no_response
-        )
-        
-        crud.update_application(db, app_id, updates)
+
+        async with AsyncSessionLocal() as db:
+            if outcome == "parsed":
+                with metrics.stage("cache_store"):
+                    await db.run_sync(parse_cache.store, raw_data, cache_model, parsed)
+            with metrics.stage("db_update"):
+                await db.run_sync(crud.update_application, app_id, _updates_from_parsed(parsed))
         logger.info(f"✅ Successfully updated application {app_id}")
-        
+
     except Exception as e:
+        outcome = "error"
+        metrics.PARSE_FAILURES.labels(reason=metrics.failure_reason(e)).inc()
         error_msg = f"Error processing application {app_id}: {e}\n{traceback.format_exc()}"
         logger.error(error_msg)
-        
+
+        if final_attempt:
+            try:
+                failed_updates = schemas.JobApplicationUpdate(
+                    status=models.ApplicationStatus.failed,
+                    description=f"❌ Parsing failed: {str(e)[:500]}"
+                )
+                await _in_session(crud.update_application, app_id, failed_updates)
+            except Exception as update_error:
+                logger.error(f"Failed to update application status: {update_error}")
+        raise
+    finally:
+        metrics.PARSE_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
+
+
+async def process_applications_batch(batch: list) -> dict:
+    """
+    Parse several queued applications with a single LLM call.
+    `batch` is `[(app_id, final_attempt, bypass_cache), ...]`. Cache hits are
+    applied directly; postings the batch response doesn't cover (or a malformed
+    response as a whole) fall back to `process_application_background`.
+    Like a single parse, no session is open during the LLM call.
+    Returns `{app_id: exception or None}` for the worker pool.
+    """
+    errors = {}
+    pending = []
+    fallback = []
+    started = time.perf_counter()
+    cache_model = routing.cache_model()
+    async with AsyncSessionLocal() as db:
+        for app_id, final_attempt, bypass_cache in batch:
+            parse_input = await db.run_sync(_parse_input, app_id)
+            if not parse_input or not parse_input[0]:
+                fallback.append((app_id, final_attempt, bypass_cache))
+                continue
+
+            raw_data, url = parse_input
+            parsed = None
+            if not bypass_cache:
+                with metrics.stage("cache_lookup"):
+                    parsed = await db.run_sync(parse_cache.get_cached, raw_data, cache_model, url)
+            if parsed:
+                logger.info(f"⚡ Parse cache hit for {app_id}")
+                with metrics.stage("db_update"):
+                    await db.run_sync(crud.update_application, app_id, _updates_from_parsed(parsed))
+                metrics.PARSE_SECONDS.labels(outcome="cached").observe(time.perf_counter() - started)
+                errors[app_id] = None
+            else:
+                pending.append((app_id, raw_data, url, final_attempt, bypass_cache))
+
+    results = [None] * len(pending)
+    if len(pending) > 1:
         try:
-            failed_updates = schemas.JobApplicationUpdate(
-                status=models.ApplicationStatus.failed,
-                description=f"❌ Parsing failed: {str(e)[:500]}"
+            results = await parse_batch_with_ai_async(
+                [raw for _, raw, _, _, _ in pending],
+                source_urls=[url for _, _, url, _, _ in pending],
             )
-            crud.update_application(db, app_id, failed_updates)
-        except Exception as update_error:
-            logger.error(f"Failed to update application status: {update_error}")
-    finally:
-        db.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Batch parse failed, falling back to single parses: {e}")
 
+    async with AsyncSessionLocal() as db:
+        for (app_id, raw, _, final_attempt, bypass_cache), parsed in zip(pending, results):
+            if parsed is None:
+                fallback.append((app_id, final_attempt, bypass_cache))
+                continue
+            try:
+                with metrics.stage("cache_store"):
+                    await db.run_sync(parse_cache.store, raw, cache_model, parsed)
+                with metrics.stage("db_update"):
+                    await db.run_sync(crud.update_application, app_id, _updates_from_parsed(parsed))
+                metrics.PARSE_SECONDS.labels(outcome="batched").observe(time.perf_counter() - started)
+                errors[app_id] = None
+            except Exception as e:
+                logger.error(f"❌ Failed to store batch result for {app_id}: {e}")
+                metrics.PARSE_FAILURES.labels(reason="db").inc()
+                await db.rollback()
+                errors[app_id] = e
 
-@router.get("/", response_model=List[schemas.JobApplication])
-def read_applications(
-    profile_id: Optional[str] = None, 
+    for app_id, final_attempt, bypass_cache in fallback:
+        try:
+            await process_application_background(app_id, final_attempt, bypass_cache=bypass_cache)
+            errors[app_id] = None
+        except Exception as e:
+            errors[app_id] = e
+    return errors
+
+
+def application_filters(
+    profile_id: Optional[str] = None,
     resume_version: Optional[int] = None,
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db)
+    status: Annotated[Optional[List[models.ApplicationStatus]], Query()] = None,
+    is_archived: Optional[bool] = None,
+    is_favorite: Optional[bool] = None,
+    seniority: Annotated[Optional[List[models.Seniority]], Query()] = None,
+    work_mode: Annotated[Optional[List[str]], Query()] = None,
+    source: Annotated[Optional[List[str]], Query()] = None,
+    company: Optional[str] = None,
+    applied_from: Optional[datetime] = None,
+    applied_to: Optional[datetime] = None,
+    skills: Annotated[Optional[List[str]], Query()] = None,
+    skills_match: schemas.SkillMatch = "any",
+) -> schemas.ApplicationFilters:
+    return schemas.ApplicationFilters(
+        profile_id=profile_id,
+        resume_version=resume_version,
+        status=status,
+        is_archived=is_archived,
+        is_favorite=is_favorite,
+        seniority=seniority,
+        work_mode=work_mode,
+        source=source,
+        company=company,
+        applied_from=applied_from,
+        applied_to=applied_to,
+        skills=normalize_skills(skills) or None,
+        skills_match=skills_match,
+    )
+
+
+@lru_cache(maxsize=64)
+def _fields_model(fields: tuple):
+    """Response model holding only `fields` of JobApplication, for `?fields=`."""
+    definitions = {
+        name: (Optional[schemas.JobApplication.model_fields[name].annotation], None)
+        for name in fields
+    }
+    return create_model("JobApplicationFields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+@lru_cache(maxsize=64)
+def _list_adapter(model):
+    return TypeAdapter(List[model])
+
+
+def _list_projection(view: schemas.ApplicationListView, fields: Optional[str], sort_by: str):
+    """Response model and columns to load for a list request (None columns = everything)."""
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(schemas.JobApplication.model_fields))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        names = list(dict.fromkeys(["id", *names]))
+        # The sort column is needed to build the next cursor even if it isn't returned
+        return _fields_model(tuple(names)), list(dict.fromkeys([*names, sort_by]))
+    if view == "summary":
+        return schemas.JobApplicationSummary, list(schemas.JobApplicationSummary.model_fields)
+    return schemas.JobApplication, None
+
+
+def _list_applications(db: Session, model, columns, filters, cursor, skip, limit, sort_by, order) -> Response:
+    """The page as a JSON response, serialized in the session so `raw_data` can still load."""
+    headers = {"X-Total-Count": str(crud.count_applications(db, filters))}
+
+    if skip and not cursor:
+        items = crud.get_applications(db, filters, skip=skip, limit=limit, columns=columns)
+    else:
+        try:
+            items, next_cursor = crud.get_applications_page(
+                db, filters, limit=limit, cursor=cursor, sort_by=sort_by, order=order, columns=columns
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+
+    adapter = _list_adapter(model)
+    with serializing():
+        content = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get("/", response_model=List[schemas.JobApplication])
+async def read_applications(
+    filters: schemas.ApplicationFilters = Depends(application_filters),
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    sort_by: schemas.ApplicationSortField = "applied_at",
+    order: schemas.SortOrder = "desc",
+    view: schemas.ApplicationListView = "full",
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return crud.get_applications(db, profile_id=profile_id, resume_version=resume_version, skip=skip, limit=limit)
+    """
+    Filtered, sorted list of applications. Pass the `X-Next-Cursor` header of a
+    page back as `cursor` to get the next one; `X-Total-Count` is the size of
+    the whole filtered set. `skip` is kept for older clients and ignored when a
+    cursor is given.
+
+    `view=summary` leaves out `description` and `raw_data`; `fields=a,b,c`
+    returns only those fields (plus `id`). Columns that aren't returned aren't
+    read from the database either.
+    """
+    model, columns = _list_projection(view, fields, sort_by)
+    return await db.run_sync(_list_applications, model, columns, filters, cursor, skip, limit, sort_by, order)
+
+
+def _create_application(db: Session, app_data: schemas.JobApplicationCreate) -> models.JobApplication:
+    new_app = crud.create_application(db, app_data)
+    enqueue_parse(db, new_app.id)
+    return new_app
 
 
 @router.post("/", response_model=schemas.JobApplication)
-def create_application(
+async def create_application(
     app_data: schemas.JobApplicationCreate, 
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    new_app = crud.create_application(db, app_data)
-    background_tasks.add_task(process_application_background, new_app.id)
-    return new_app
+    return await _run(db, schemas.JobApplication, _create_application, app_data)
+
+
+def _create_applications(db: Session, items: List[schemas.JobApplicationCreate]) -> List[models.JobApplication]:
+    new_apps = crud.create_applications(db, items)
+    app_ids = [new_app.id for new_app in new_apps]
+    enqueue_many(db, app_ids)
+    return crud.get_applications_by_ids(db, app_ids)
+
+
+@router.post("/batch", response_model=List[schemas.JobApplication])
+async def create_applications_batch(batch: schemas.JobApplicationBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, List[schemas.JobApplication], _create_applications, batch.items)
+
+
+@router.get("/stats", response_model=schemas.ApplicationStats)
+async def read_application_stats(profile_id: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """Dashboard aggregates, cached per profile until the next write."""
+    return await db.run_sync(application_stats.get_stats, profile_id)
+
+
+@router.get("/parse/models", response_model=List[schemas.ParseModelStats])
+async def read_parse_model_stats():
+    """Rolling latency and error rate per parse model, in this process."""
+    return routing.model_stats()
+
+
+@router.get("/skills", response_model=List[schemas.TermCount])
+async def read_top_skills(
+    profile_id: Optional[str] = None,
+    kind: schemas.SkillKind = "required",
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Most frequent normalized skills, from the application_skills index."""
+    return await db.run_sync(top_skills, profile_id=profile_id, kind=kind, limit=limit)
+
+
+@router.get("/search", response_model=List[schemas.ApplicationSearchResult])
+async def search_applications(
+    q: str = Query(..., min_length=1),
+    profile_id: Optional[str] = None,
+    limit: int = Query(search.DEFAULT_LIMIT, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked full-text search over company, position, location, description, requirements, responsibilities and tech stack."""
+    return await _run(
+        db, List[schemas.ApplicationSearchResult], search.search_applications, q, profile_id=profile_id, limit=limit
+    )
 
 
 @router.get("/{app_id}", response_model=schemas.JobApplication)
-def read_application(app_id: str, db: Session = Depends(get_db)):
-    db_app = crud.get_application(db, app_id)
+async def read_application(app_id: str, db: AsyncSession = Depends(get_async_db)):
+    db_app = await _run(db, schemas.JobApplication, crud.get_application, app_id)
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
     return db_app
 
 
+def _application_snapshot(db: Session, app_id: str) -> Optional[dict]:
+    db.expire_all()
+    db_app = crud.get_application(db, app_id)
+    snapshot = schemas.JobApplicationSummary.model_validate(db_app).model_dump(mode="json") if db_app else None
+    # Don't sit in an open transaction for the life of the stream
+    db.rollback()
+    return snapshot
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+@router.get("/{app_id}/events")
+async def application_events_stream(app_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Server-Sent Events for one application: `snapshot` with its current state,
+    then while it is parsing an `update` with the changed fields after every
+    commit, and finally `done` with the resulting status (`{"deleted": true}`
+    if it was deleted). Ends right after the snapshot when it isn't parsing.
+    """
+    parsing = models.ApplicationStatus.parsing.value
+    # Subscribe before reading so no commit can fall between the two
+    queue = application_events.subscribe(app_id)
+    try:
+        snapshot = await db.run_sync(_application_snapshot, app_id)
+    except Exception:
+        application_events.unsubscribe(app_id, queue)
+        raise
+    if snapshot is None:
+        application_events.unsubscribe(app_id, queue)
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    async def events():
+        # Re-reads use a session of their own: the request's may be closed before the body streams
+        stream_db = AsyncSessionLocal()
+        try:
+            yield _sse("snapshot", snapshot)
+            status = snapshot["status"]
+            while status == parsing:
+                try:
+                    changes = await asyncio.wait_for(queue.get(), settings.APPLICATION_EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Commits made by other processes never reach the queue
+                    current = await stream_db.run_sync(_application_snapshot, app_id)
+                    if current is None:
+                        yield _sse("done", {"deleted": True})
+                        return
+                    if current["status"] != parsing:
+                        yield _sse("update", current)
+                        status = current["status"]
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if changes.get("deleted"):
+                    yield _sse("done", {"deleted": True})
+                    return
+                changes = jsonable_encoder(changes)
+                yield _sse("update", changes)
+                status = changes.get("status", status)
+            yield _sse("done", {"status": status})
+        finally:
+            application_events.unsubscribe(app_id, queue)
+            await stream_db.close()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
 @router.put("/{app_id}", response_model=schemas.JobApplication)
-def update_application(app_id: str, updates: schemas.JobApplicationUpdate, db: Session = Depends(get_db)):
-    db_app = crud.update_application(db, app_id, updates)
+async def update_application(app_id: str, updates: schemas.JobApplicationUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_app = await _run(db, schemas.JobApplication, crud.update_application, app_id, updates)
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
     return db_app
 
 
 @router.delete("/{app_id}")
-def delete_application(app_id: str, db: Session = Depends(get_db)):
-    db_app = crud.delete_application(db, app_id)
+async def delete_application(app_id: str, db: AsyncSession = Depends(get_async_db)):
+    db_app = await db.run_sync(crud.delete_application, app_id)
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
     return {"ok": True}
-@router.post("/{app_id}/reparse", response_model=schemas.JobApplication)
-def reparse_application(app_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+
+
+def _reparse(db: Session, app_id: str, bypass_cache: bool) -> models.JobApplication:
     db_app = crud.get_application(db, app_id)
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -136,51 +551,82 @@ def reparse_application(app_id: str, background_tasks: BackgroundTasks, db: Sess
     updates = schemas.JobApplicationUpdate(status=models.ApplicationStatus.parsing)
     db_app = crud.update_application(db, app_id, updates)
     
-    background_tasks.add_task(process_application_background, app_id)
+    enqueue_parse(db, app_id, bypass_cache=bypass_cache)
     
     return db_app
 
-@router.get("/export/json", response_class=Response)
-def export_applications_json(db: Session = Depends(get_db)):
-    applications = crud.get_applications(db, skip=0, limit=10000)
-    def to_llm_format(app):
-        return {
-            "company": app.company,
-            "position": app.position,
-            "location": app.location,
-            "salary": app.salary,
-            "tech_stack": app.tech_stack,
-            "nice_to_have_stack": app.nice_to_have_stack,
-            "responsibilities": app.responsibilities,
-            "requirements": app.requirements,
-            "work_mode": app.work_mode,
-            "employment_type": app.employment_type,
-            "seniority": str(app.seniority) if app.seniority else None,
-            "description": app.description,
-            "source": app.source,
-            "url": app.url,
-        }
-    data = json.dumps([to_llm_format(app) for app in applications], ensure_ascii=False, indent=2)
+
+@router.post("/{app_id}/reparse", response_model=schemas.JobApplication)
+async def reparse_application(app_id: str, bypass_cache: bool = False, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, schemas.JobApplication, _reparse, app_id, bypass_cache)
+
+
+@router.get("/export/json", response_class=StreamingResponse)
+async def export_applications_json(
+    format: Literal["json", "ndjson"] = "json",
+    gzip: bool = False,
+    profile_id: Optional[str] = None,
+):
+    """Stream all applications (optionally one profile's) as a JSON array or NDJSON, optionally gzipped."""
+    def export_chunks(session: Session):
+        chunks = iter_export(session, fmt=format, profile_id=profile_id)
+        return gzip_stream(chunks) if gzip else chunks
+
+    async def stream():
+        # The stream outlives the handler, so it can't rely on a request-scoped session
+        async with AsyncSessionLocal() as db:
+            async for chunk in iterate_sync(db, export_chunks):
+                yield chunk
+
+    filename = "vacancies.json" if format == "json" else "vacancies.ndjson"
+    media_type = "application/json" if format == "json" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
     headers = {
-        "Content-Disposition": "attachment; filename=vacancies.json"
+        "Content-Disposition": f"attachment; filename={filename}"
     }
-    return Response(content=data, media_type="application/json", headers=headers)
-
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
 
-from services.data_import import import_applications
 
 @router.post("/import/json")
-async def import_applications_json(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    content = await file.read()
+async def import_applications_json(
+    file: UploadFile = File(...),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import a JSON array of vacancies. The upload is parsed incrementally and
+    inserted in chunks; with `stream=true` the response is NDJSON with one
+    progress line per chunk followed by the final result.
+
+    A malformed file is answered with 400 and the partial report: `count` and
+    `details` cover the chunks inserted before the error, which stay imported.
+    """
+    if stream:
+        # The stream outlives the handler. Depending on the FastAPI version the request-scoped
+        # session and the upload are closed before the body is sent, so it takes over the
+        # spooled file (the request closes an empty stand-in) and opens its own session
+        upload = UploadFile(file.file, size=file.size, filename=file.filename, headers=file.headers)
+        file.file = io.BytesIO()
+
+        async def progress_lines():
+            try:
+                async with AsyncSessionLocal() as stream_db:
+                    async for progress in import_applications_stream(stream_db, upload):
+                        yield json.dumps(progress) + "\n"
+            except Exception as e:
+                yield json.dumps({"status": "error", "detail": f"Import error: {e}"}) + "\n"
+            finally:
+                await upload.close()
+
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
     try:
-        applications = json.loads(content)
-        if not isinstance(applications, list):
-             raise HTTPException(status_code=400, detail="JSON must be a list of vacancies")
-        
-        result = import_applications(db, applications)
-        return {"status": "imported", "count": result["success_count"], "details": result}
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON file")
+        async for progress in import_applications_stream(db, file):
+            result = progress
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Import error: {e}")
-
+    if result["status"] == "error":
+        return JSONResponse(status_code=400, content=result)
+    return result
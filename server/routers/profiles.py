@@ -1,29 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from core.database import get_db
+from core.database import get_async_db
 from database import crud, schemas
+from services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/", response_model=List[schemas.Profile])
-def read_profiles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_profiles(db, skip=skip, limit=limit)
+async def read_profiles(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_profiles, skip=skip, limit=limit)
 
 
 @router.post("/", response_model=schemas.Profile)
-def create_profile(profile: schemas.ProfileCreate, db: Session = Depends(get_db)):
-    db_profile = crud.get_profile_by_name(db, name=profile.name)
+async def create_profile(profile: schemas.ProfileCreate, db: AsyncSession = Depends(get_async_db)):
+    db_profile = await db.run_sync(crud.get_profile_by_name, name=profile.name)
     if db_profile:
         raise HTTPException(status_code=400, detail="Profile already exists")
-    return crud.create_profile(db=db, profile=profile)
+    return await db.run_sync(crud.create_profile, profile=profile)
 
 
 @router.delete("/{profile_id}")
-def delete_profile(profile_id: str, db: Session = Depends(get_db)):
-    db_profile = crud.delete_profile(db, profile_id)
+async def delete_profile(profile_id: str, db: AsyncSession = Depends(get_async_db)):
+    db_profile = await db.run_sync(crud.delete_profile, profile_id)
     if not db_profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return {"ok": True}
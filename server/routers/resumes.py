@@ -1,38 +1,45 @@
 from fastapi import APIRouter, Depends, File, UploadFile, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import asyncio
 import os
 import shutil
 
-from core.database import get_db
+from core.database import get_async_db
 from core.config import settings
 from database import crud, schemas
+from services.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/", response_model=List[schemas.Resume])
-def read_resumes(profile_id: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_resumes(db, profile_id=profile_id, skip=skip, limit=limit)
+async def read_resumes(profile_id: Optional[str] = None, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(crud.get_resumes, profile_id=profile_id, skip=skip, limit=limit)
+
+
+def _save_upload(file: UploadFile, file_path: str):
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
 
 
 @router.post("/", response_model=schemas.Resume)
 async def create_resume(
     profile_id: str = Form(...),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    version = crud.get_latest_resume_version(db, profile_id) + 1
+    version = await db.run_sync(crud.get_latest_resume_version, profile_id) + 1
     
     safe_filename = file.filename.replace(" ", "_").replace("/", "").replace("\\", "")
     file_path = os.path.join(settings.UPLOAD_DIR, f"{profile_id}_v{version}_{safe_filename}")
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Disk writes stay off the event loop
+    await asyncio.to_thread(_save_upload, file, file_path)
         
     resume_create = schemas.ResumeCreate(
         name=file.filename.replace(".pdf", ""),
         profile_id=profile_id
     )
     
-    return crud.create_resume(db=db, resume=resume_create, file_path=file_path, version=version)
+    return await db.run_sync(crud.create_resume, resume=resume_create, file_path=file_path, version=version)
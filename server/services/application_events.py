@@ -0,0 +1,93 @@
+"""
+In-process change feed for applications, behind GET /applications/{id}/events.
+
+Committed ORM changes to an application are published as `{column: value}`
+dicts to every subscriber of that application's id. Subscribers are asyncio
+queues on the server's event loop; commits happen on worker threads, so
+delivery goes through `call_soon_threadsafe`. Nothing is collected while
+nobody is subscribed. Only this process's writes are seen; the SSE endpoint
+re-reads the row on its heartbeat to catch writes from other processes.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from database import models
+
+_PENDING_KEY = "application_events"
+# Internal bookkeeping, not part of the API representation
+_EXCLUDED_COLUMNS = {"id", "raw_data_hash"}
+
+_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+_lock = threading.Lock()
+
+
+def subscribe(app_id: str) -> asyncio.Queue:
+    """Queue receiving the change dicts of `app_id`; must be called on the event loop."""
+    queue = asyncio.Queue()
+    with _lock:
+        _subscribers[app_id].add((asyncio.get_running_loop(), queue))
+    return queue
+
+
+def unsubscribe(app_id: str, queue: asyncio.Queue):
+    with _lock:
+        subscribers = _subscribers.get(app_id)
+        if not subscribers:
+            return
+        subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+        if not subscribers:
+            del _subscribers[app_id]
+
+
+def has_subscribers() -> bool:
+    return bool(_subscribers)
+
+
+def publish(app_id: str, changes: dict):
+    with _lock:
+        subscribers = list(_subscribers.get(app_id, ()))
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, changes)
+        except RuntimeError:
+            # The subscriber's loop has shut down
+            unsubscribe(app_id, queue)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_application_changes(session, flush_context):
+    if not has_subscribers():
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in chain(session.dirty, session.deleted):
+        if not isinstance(obj, models.JobApplication) or obj.id not in _subscribers:
+            continue
+        if obj in session.deleted:
+            pending[obj.id] = {"deleted": True}
+            continue
+        state = inspect(obj)
+        changes = {
+            key: state.attrs[key].value
+            for key in state.mapper.column_attrs.keys()
+            if key not in _EXCLUDED_COLUMNS and state.attrs[key].history.has_changes()
+        }
+        if changes:
+            pending.setdefault(obj.id, {}).update(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    for app_id, changes in (pending or {}).items():
+        publish(app_id, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
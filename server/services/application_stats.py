@@ -0,0 +1,177 @@
+"""
+Dashboard aggregates computed in SQL, cached in-process per profile.
+
+The cache is invalidated from Session events: any committed flush touching a
+JobApplication drops that profile's entry (and the all-profiles entry), and
+bulk insert/update/delete statements on applications drop everything.
+"""
+import threading
+from itertools import chain
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, event, func, inspect, or_
+from sqlalchemy.orm import Session
+
+from database import crud, models, schemas
+
+TOP_TERMS = 15
+
+_ALL = "*"
+_DIRTY_KEY = "application_stats_dirty"
+
+_cache: Dict[Optional[str], dict] = {}
+_generation = 0
+_lock = threading.Lock()
+
+
+def get_stats(db: Session, profile_id: Optional[str] = None) -> dict:
+    """Cached stats for one profile, or for all applications when profile_id is None."""
+    with _lock:
+        cached = _cache.get(profile_id)
+        generation = _generation
+    if cached is not None:
+        return cached
+
+    stats = compute_stats(db, profile_id)
+    with _lock:
+        # A write committed while we were computing; don't cache a stale result
+        if generation == _generation:
+            _cache[profile_id] = stats
+    return stats
+
+
+def invalidate(profile_ids: Iterable[Optional[str]] = (_ALL,)):
+    global _generation
+    profile_ids = set(profile_ids)
+    with _lock:
+        _generation += 1
+        if _ALL in profile_ids:
+            _cache.clear()
+            return
+        for profile_id in profile_ids | {None}:
+            _cache.pop(profile_id, None)
+
+
+def compute_stats(db: Session, profile_id: Optional[str] = None, top_terms: int = TOP_TERMS) -> dict:
+    App = models.JobApplication
+    filters = schemas.ApplicationFilters(profile_id=profile_id) if profile_id else None
+    dialect = db.get_bind().dialect.name
+
+    def query(*columns, join=None):
+        base = db.query(*columns)
+        if join is not None:
+            base = base.select_from(App).join(*join)
+        return crud._filter_applications(base, filters)
+
+    def flag(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    S = models.ApplicationStatus
+    responded = or_(App.status.in_([S.screening, S.interview, S.offer]), App.responded_at.isnot(None))
+    interviewed = or_(App.status.in_([S.interview, S.offer]), App.interview_date.isnot(None))
+    missing = {
+        "description": or_(App.description.is_(None), func.trim(App.description) == ""),
+        "requirements": func.coalesce(func.json_array_length(App.requirements), 0) == 0,
+        "responsibilities": func.coalesce(func.json_array_length(App.responsibilities), 0) == 0,
+        "tech_stack": func.coalesce(func.json_array_length(App.tech_stack), 0) == 0,
+    }
+
+    row = query(
+        func.count(App.id),
+        flag(responded),
+        flag(interviewed),
+        flag(App.status == S.offer),
+        flag(or_(*missing.values())),
+        *(flag(condition) for condition in missing.values()),
+    ).one()
+    total, responded_count, interviews, offers, incomplete = row[:5]
+
+    def counts(column, default):
+        rows = query(column, func.count(App.id)).group_by(column)
+        return {
+            (getattr(key, "value", key) if key is not None else default): count
+            for key, count in rows
+        }
+
+    if dialect == "sqlite":
+        week = func.date(App.applied_at, "weekday 0", "-6 days")
+        days_to_response = func.julianday(App.responded_at) - func.julianday(App.applied_at)
+    else:
+        week = func.to_char(func.date_trunc("week", App.applied_at), "YYYY-MM-DD")
+        days_to_response = func.extract("epoch", App.responded_at - App.applied_at) / 86400
+
+    by_week = [
+        {"week": str(value), "count": count}
+        for value, count in query(week, func.count(App.id)).group_by(week).order_by(week)
+        if value is not None
+    ]
+
+    # Normalized names from the application_skills index (services/skills.py)
+    Skill = models.ApplicationSkill
+    top_tech_stack = [
+        {"name": name, "count": count}
+        for name, count in query(Skill.skill, func.count(), join=(Skill, Skill.application_id == App.id))
+        .filter(Skill.kind == "required")
+        .group_by(Skill.skill)
+        .order_by(func.count().desc(), Skill.skill)
+        .limit(top_terms)
+    ]
+
+    return {
+        "total": total,
+        "responded": responded_count,
+        "interviews": interviews,
+        "offers": offers,
+        "response_rate": round(responded_count / total * 100) if total else 0,
+        "interview_rate": round(interviews / responded_count * 100) if responded_count else 0,
+        "median_days_to_response": _median(query(days_to_response).filter(App.responded_at.isnot(None)), days_to_response),
+        "by_status": counts(App.status, "unknown"),
+        "by_source": counts(App.source, "other"),
+        "by_seniority": counts(App.seniority, "unknown"),
+        "by_work_mode": counts(App.work_mode, "unknown"),
+        "by_week": by_week,
+        "top_tech_stack": top_tech_stack,
+        "missing": dict(zip(missing, row[5:])),
+        "incomplete": incomplete,
+    }
+
+
+def _median(query, expression) -> Optional[float]:
+    """Median via ORDER BY/OFFSET, which works the same on SQLite and Postgres."""
+    count = query.with_entities(func.count()).scalar()
+    if not count:
+        return None
+    middle = query.order_by(expression).offset((count - 1) // 2).limit(2 - count % 2).all()
+    values = [value for (value,) in middle]
+    return round(sum(values) / len(values), 1)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_application_writes(session, flush_context):
+    dirty = session.info.setdefault(_DIRTY_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, models.JobApplication):
+            dirty.add(obj.profile_id)
+            # An application moved between profiles changes both
+            dirty.update(inspect(obj).attrs.profile_id.history.deleted)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_application_writes(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is models.JobApplication:
+        orm_execute_state.session.info.setdefault(_DIRTY_KEY, set()).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        invalidate(dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,69 @@
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+from sqlalchemy.orm import Session
+from core.config import settings
+from database import models, schemas, crud
+
+EXPORT_FORMATS = ("json", "ndjson")
+
+
+def export_record(app: models.JobApplication) -> Dict[str, Any]:
+    """LLM-friendly representation of an application, accepted back by the importer."""
+    return {
+        "company": app.company,
+        "position": app.position,
+        "location": app.location,
+        "salary": app.salary,
+        "tech_stack": app.tech_stack,
+        "nice_to_have_stack": app.nice_to_have_stack,
+        "responsibilities": app.responsibilities,
+        "requirements": app.requirements,
+        "work_mode": app.work_mode,
+        "employment_type": app.employment_type,
+        "seniority": str(app.seniority) if app.seniority else None,
+        "description": app.description,
+        "source": app.source,
+        "url": app.url,
+    }
+
+
+def iter_export(db: Session, fmt: str = "json", profile_id: Optional[str] = None, batch_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Serialize applications row by row. Yields the opening bracket before the
+    query runs, then one string per fetched batch, so memory is bounded by
+    `batch_size` rows regardless of how many are exported.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    filters = schemas.ApplicationFilters(profile_id=profile_id) if profile_id else None
+
+    if fmt == "json":
+        yield "["
+    separator = "\n" if fmt == "json" else ""
+    pending = []
+    for app in crud.iter_applications(db, filters, batch_size=batch_size):
+        line = json.dumps(export_record(app), ensure_ascii=False)
+        if fmt == "json":
+            pending.append(separator + "  " + line)
+            separator = ",\n"
+        else:
+            pending.append(line + "\n")
+        if len(pending) >= batch_size:
+            yield "".join(pending)
+            pending = []
+    if pending:
+        yield "".join(pending)
+    if fmt == "json":
+        yield "\n]\n"
+
+
+def gzip_stream(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Gzip a text stream, flushing after every chunk so output keeps flowing."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
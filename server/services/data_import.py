@@ -1,98 +1,299 @@
+import codecs
 import json
-from typing import List, Dict, Any, Optional
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database import models, schemas, crud
+from core.config import settings
+from database import blob_store, models, schemas, crud
+from services import skills
 
-def import_applications(db: Session, data: List[Dict[str, Any]], profile_name: str = None) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+_JSON_WHITESPACE = " \t\n\r"
+
+
+def _normalize_seniority(seniority_val):
+    if not seniority_val:
+        return seniority_val
+    if isinstance(seniority_val, str) and seniority_val.startswith("Seniority."):
+        seniority_val = seniority_val.split(".")[1]
+
+    valid_seniorities = [e.value for e in models.Seniority]
+    if seniority_val not in valid_seniorities:
+        if seniority_val in models.Seniority.__members__:
+            return models.Seniority[seniority_val].value
+        return None
+    return seniority_val
+
+
+def _build_application(item: Dict[str, Any], profile, resume, resume_version: int) -> schemas.JobApplicationCreate:
+    return schemas.JobApplicationCreate(
+        profile_id=profile.id,
+        resume_id=resume.id,
+        resume_version=resume_version,
+        url=item.get("url"),
+        company=item.get("company") or "Unknown Company",
+        position=item.get("position") or "Unknown Position",
+        location=item.get("location"),
+        salary=item.get("salary"),
+        source=item.get("source"),
+        tech_stack=item.get("tech_stack", []),
+        nice_to_have_stack=item.get("nice_to_have_stack", []),
+        responsibilities=item.get("responsibilities", []),
+        requirements=item.get("requirements", []),
+        work_mode=item.get("work_mode"),
+        employment_type=item.get("employment_type"),
+        seniority=_normalize_seniority(item.get("seniority")),
+        description=item.get("description"),
+        raw_data=json.dumps(item),
+        status=models.ApplicationStatus.no_response
+    )
+
+
+def _application_row(app_create: schemas.JobApplicationCreate) -> tuple:
+    """Insert values for the applications table plus the raw text stored alongside."""
+    row = app_create.model_dump()
+    # Assigned here so the skill rows can reference it
+    row["id"] = models.generate_uuid()
+    raw_data = row.pop("raw_data")
+    row["raw_data_hash"] = blob_store.text_hash(raw_data) if raw_data is not None else None
+    return row, raw_data
+
+
+def _insert_rows(db: Session, rows: List[tuple]):
+    crud.store_raw_texts(db, [raw_data for _, _, raw_data in rows if raw_data is not None])
+    db.execute(insert(models.JobApplication), [row for _, row, _ in rows])
+    skills.replace_skills(db.connection(), {
+        row["id"]: (row["tech_stack"], row["nice_to_have_stack"]) for _, row, _ in rows
+    })
+
+
+def _insert_chunk(db: Session, rows: List[tuple], results: Dict[str, Any], seen_urls: set):
+    """Insert validated rows in one transaction; on failure retry row by row to isolate the bad item."""
+    if not rows:
+        return
+    try:
+        _insert_rows(db, rows)
+        db.commit()
+        results["success_count"] += len(rows)
+        return
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️ Import chunk of {len(rows)} failed, retrying row by row: {e}")
+
+    for index, row, raw_data in rows:
+        try:
+            _insert_rows(db, [(index, row, raw_data)])
+            db.commit()
+            results["success_count"] += 1
+        except Exception as e:
+            db.rollback()
+            seen_urls.discard(row.get("url"))
+            results["errors"].append(f"Failed item {index}: {str(e)}")
+
+
+class ApplicationImporter:
+    """
+    Chunked import state for one profile: resolves the profile and resume,
+    prefetches existing URLs once and accumulates the result report across
+    `import_chunk` calls.
+    """
+
+    def __init__(self, db: Session, profile_name: str = None):
+        self.db = db
+        self.processed = 0
+        self.results = {
+            "success_count": 0,
+            "errors": [],
+            "profile_used": None,
+            "total_items": 0
+        }
+
+        profile = None
+        if profile_name:
+            profile = crud.get_profile_by_name(db, profile_name)
+            if not profile:
+                profile_create = schemas.ProfileCreate(name=profile_name)
+                profile = crud.create_profile(db, profile_create)
+        else:
+            profile = db.query(models.Profile).order_by(models.Profile.created_at.desc()).first()
+            if not profile:
+                profile_create = schemas.ProfileCreate(name="Restored User")
+                profile = crud.create_profile(db, profile_create)
+
+        self.profile = profile
+        self.results["profile_used"] = profile.name
+
+        resume_version = crud.get_latest_resume_version(db, profile.id)
+        if resume_version == 0:
+            resume_create = schemas.ResumeCreate(name="Default Resume", profile_id=profile.id)
+            self.resume = crud.create_resume(db, resume_create, file_path="placeholder.pdf", version=1)
+            resume_version = 1
+        else:
+            self.resume = db.query(models.Resume).filter(
+                models.Resume.profile_id == profile.id,
+                models.Resume.version == resume_version
+            ).first()
+        self.resume_version = resume_version
+
+        # Covers URLs already in the database and duplicates within the import
+        self.seen_urls = crud.get_application_urls(db, profile.id)
+
+    def import_chunk(self, items: List[Dict[str, Any]]):
+        """Validate `items` and insert them in one transaction."""
+        rows = []
+        for index, item in enumerate(items, start=self.processed):
+            try:
+                app_create = _build_application(item, self.profile, self.resume, self.resume_version)
+            except Exception as e:
+                self.results["errors"].append(f"Failed item {index}: {str(e)}")
+                continue
+
+            if app_create.url and app_create.url in self.seen_urls:
+                self.results["errors"].append(f"Skipped duplicate (Index {index}): {app_create.company} - {app_create.url}")
+                continue
+            if app_create.url:
+                self.seen_urls.add(app_create.url)
+            rows.append((index, *_application_row(app_create)))
+
+        self.processed += len(items)
+        self.results["total_items"] = self.processed
+        _insert_chunk(self.db, rows, self.results, self.seen_urls)
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "success_count": self.results["success_count"],
+            "error_count": len(self.results["errors"]),
+        }
+
+
+def import_applications(db: Session, data: List[Dict[str, Any]], profile_name: str = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
     """
     Import applications from a list of dictionaries.
     If profile_name is provided, tries to use/create that profile.
     Otherwise, uses the most recent profile.
+
+    Existing URLs for the profile are loaded once; rows are validated and
+    bulk-inserted in chunks of `chunk_size`, one transaction per chunk.
     """
-    results = {
-        "success_count": 0,
-        "errors": [],
-        "profile_used": None,
-        "total_items": len(data)
-    }
-
-    profile = None
-    if profile_name:
-        profile = crud.get_profile_by_name(db, profile_name)
-        if not profile:
-            profile_create = schemas.ProfileCreate(name=profile_name)
-            profile = crud.create_profile(db, profile_create)
-    else:
-        profile = db.query(models.Profile).order_by(models.Profile.created_at.desc()).first()
-        if not profile:
-            profile_create = schemas.ProfileCreate(name="Restored User")
-            profile = crud.create_profile(db, profile_create)
-    
-    results["profile_used"] = profile.name
-
-    resume_version = crud.get_latest_resume_version(db, profile.id)
-    resume = None
-    
-    if resume_version == 0:
-        resume_create = schemas.ResumeCreate(name="Default Resume", profile_id=profile.id)
-        resume = crud.create_resume(db, resume_create, file_path="placeholder.pdf", version=1)
-        resume_version = 1
-    else:
-        resume = db.query(models.Resume).filter(
-            models.Resume.profile_id == profile.id,
-            models.Resume.version == resume_version
-        ).first()
-
-    for index, item in enumerate(data):
-        try:
-            seniority_val = item.get("seniority")
-            if seniority_val:
-                if isinstance(seniority_val, str) and seniority_val.startswith("Seniority."):
-                    seniority_val = seniority_val.split(".")[1]
-                
-                valid_seniorities = [e.value for e in models.Seniority]
-                if seniority_val not in valid_seniorities:
-                     if seniority_val in models.Seniority.__members__:
-                        seniority_val = models.Seniority[seniority_val].value
-                     else:
-                        seniority_val = None
-            
-            app_create = schemas.JobApplicationCreate(
-                profile_id=profile.id,
-                resume_id=resume.id,
-                resume_version=resume_version,
-                url=item.get("url"),
-                company=item.get("company") or "Unknown Company",
-                position=item.get("position") or "Unknown Position",
-                location=item.get("location"),
-                salary=item.get("salary"),
-                source=item.get("source"),
-                tech_stack=item.get("tech_stack", []),
-                nice_to_have_stack=item.get("nice_to_have_stack", []),
-                responsibilities=item.get("responsibilities", []),
-                requirements=item.get("requirements", []),
-                work_mode=item.get("work_mode"),
-                employment_type=item.get("employment_type"),
-                seniority=seniority_val,
-                description=item.get("description"),
-                raw_data=json.dumps(item), 
-                status=models.ApplicationStatus.no_response
-            )
-            
-            existing = None
-            if app_create.url:
-                 existing = db.query(models.JobApplication).filter(
-                    models.JobApplication.url == app_create.url,
-                    models.JobApplication.profile_id == profile.id
-                ).first()
-            
-            if not existing:
-                crud.create_application(db, app_create)
-                results["success_count"] += 1
-            else:
-                 results["errors"].append(f"Skipped duplicate (Index {index}): {app_create.company} - {app_create.url}")
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    importer = ApplicationImporter(db, profile_name)
+    for start in range(0, len(data), chunk_size):
+        importer.import_chunk(data[start:start + chunk_size])
 
-        except Exception as e:
-            results["errors"].append(f"Failed item {index}: {str(e)}")
-            
+    results = importer.results
+    logger.info(f"📥 Imported {results['success_count']}/{results['total_items']} applications ({len(results['errors'])} errors)")
     return results
+
+
+async def iter_json_array(file, read_size: Optional[int] = None) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a top-level JSON array read from `file` (anything with
+    an async `read(size)`, e.g. UploadFile) without loading the whole document.
+
+    Raises ValueError if the document is not an array and json.JSONDecodeError
+    if it is malformed.
+    """
+    read_size = read_size or settings.IMPORT_READ_SIZE
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    eof = False
+    state = "start"
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+            pos += 1
+
+        if state == "end":
+            if pos < len(buffer):
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+            if eof:
+                return
+        elif pos < len(buffer):
+            char = buffer[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError("JSON must be a list of vacancies")
+                pos += 1
+                state = "first"
+                continue
+            if char == "]" and state in ("first", "next"):
+                pos += 1
+                state = "end"
+                continue
+            if state == "next":
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                state = "value"
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A value touching the end of the buffer (e.g. a number) may continue in the next read
+            if end is not None and (end < len(buffer) or eof):
+                pos = end
+                state = "next"
+                yield value
+                continue
+        elif eof:
+            raise json.JSONDecodeError("Unexpected end of JSON input", buffer, pos)
+
+        chunk = await file.read(read_size)
+        eof = not chunk
+        buffer = buffer[pos:] + text_decoder.decode(chunk, final=eof)
+        pos = 0
+
+
+async def import_applications_stream(db: AsyncSession, file, profile_name: str = None, chunk_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a JSON array upload into the import pipeline `chunk_size` items at a
+    time, yielding a progress dict after every chunk and a final
+    {"status": "imported", ...} dict with the full result report.
+    Only one chunk of parsed items is held in memory at a time; chunks are
+    inserted through `db.run_sync`.
+
+    A malformed document ends the import with {"status": "error", "detail", "count",
+    "details"}: chunks inserted before the error stay committed and are reported,
+    items of the unfinished chunk are not inserted.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    importer = None
+    chunk = []
+
+    try:
+        async for item in iter_json_array(file):
+            if importer is None:
+                importer = await db.run_sync(ApplicationImporter, profile_name)
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                await db.run_sync(lambda session: importer.import_chunk(chunk))
+                chunk = []
+                progress = importer.progress()
+                logger.info(f"📥 Import progress: {progress['processed']} processed, {progress['error_count']} errors")
+                yield {"status": "importing", **progress}
+    except ValueError as e:
+        detail = "Invalid JSON file" if isinstance(e, json.JSONDecodeError) else str(e)
+        results = importer.results if importer else None
+        count = results["success_count"] if results else 0
+        logger.warning(f"⚠️ Import stopped by malformed JSON after {count} imported applications: {e}")
+        yield {"status": "error", "detail": detail, "count": count, "details": results}
+        return
+
+    if importer is None:
+        importer = await db.run_sync(ApplicationImporter, profile_name)
+    if chunk:
+        await db.run_sync(lambda session: importer.import_chunk(chunk))
+
+    results = importer.results
+    logger.info(f"📥 Imported {results['success_count']}/{results['total_items']} applications ({len(results['errors'])} errors)")
+    yield {"status": "imported", "count": results["success_count"], "details": results}
@@ -1,7 +1,7 @@
 """Job parsing module"""
 from .models import Salary, JobPosting, WorkMode, EmploymentType, Seniority
 from .validator import auto_fix_job_posting
-from .ai import parse_with_ai
+from .ai import parse_with_ai, parse_with_ai_async, parse_batch_with_ai_async
 
 __all__ = [
     "Salary",
@@ -11,4 +11,6 @@ __all__ = [
     "Seniority",
     "auto_fix_job_posting",
     "parse_with_ai",
+    "parse_with_ai_async",
+    "parse_batch_with_ai_async",
 ]
\ No newline at end of file
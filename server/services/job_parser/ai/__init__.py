@@ -1,5 +1,5 @@
 """AI parsing module"""
-from .parser import parse_with_ai
-from .prompts import DEFAULT_PROMPT
+from .parser import parse_with_ai, parse_with_ai_async, parse_batch_with_ai_async
+from .prompts import DEFAULT_PROMPT, BATCH_PROMPT
 
-__all__ = ["parse_with_ai", "DEFAULT_PROMPT"]
+__all__ = ["parse_with_ai", "parse_with_ai_async", "parse_batch_with_ai_async", "DEFAULT_PROMPT", "BATCH_PROMPT"]
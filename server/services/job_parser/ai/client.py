@@ -0,0 +1,61 @@
+"""Shared keep-alive HTTP client for OpenRouter"""
+import asyncio
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.OPENROUTER_HTTP2 and _http2_available()
+    logger.info(
+        f"🔌 OpenRouter client: {settings.OPENROUTER_BASE_URL} "
+        f"(max {settings.OPENROUTER_MAX_CONNECTIONS} connections, http2={http2})"
+    )
+    return httpx.AsyncClient(
+        base_url=settings.OPENROUTER_BASE_URL,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.OPENROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENROUTER_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENROUTER_TIMEOUT_SECONDS,
+            connect=settings.OPENROUTER_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide client, creating it on first use.
+    Pooled connections belong to the event loop that opened them, so a new
+    loop (e.g. a fresh `asyncio.run`) gets a new client.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _build_client()
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -2,12 +2,25 @@
 import os
 import json
 import logging
+import httpx
 import requests
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from pydantic import ValidationError
+
+from core.config import settings
+from services import metrics
+from ..compaction import compact_text
+from ..extractors import extract_fields, is_sufficient, missing_fields
 from ..models import JobPosting
 from ..validator import auto_fix_job_posting
-from .prompts import DEFAULT_PROMPT
+from .client import get_client
+from .partial_json import completed_fields
+from . import routing
+from .prompts import BATCH_PROMPT, DEFAULT_PROMPT, PARTIAL_PROMPT, REPAIR_PROMPT
+from .schema import response_format
 
 logger = logging.getLogger(__name__)
 
@@ -22,34 +35,71 @@ SOURCE_MAPPINGS = {
 
 def parse_with_ai(
     text: str,
-    model: str = "openai/gpt-4o-mini",
+    model: str = None,
     custom_prompt: str = None,
     source_url: str = None
 ) -> JobPosting:
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY not set")
-    
-    prompt = custom_prompt or DEFAULT_PROMPT
-    full_prompt = f"{prompt}\n\nJob text:\n{text}"
-    
+    """
+    Parse with `model`, or without one with the routed PARSE_MODELS, each
+    tried in turn until one returns a valid posting (no hedging here, this
+    path holds a thread per request).
+    """
+    known = _extract(text, source_url)
+    job = _job_from_extracted(known, source_url)
+    if job:
+        return job
+
+    compacted = _compact(text, source_url)
+    last_error = None
+    for name in [model] if model else routing.model_order():
+        started = time.perf_counter()
+        try:
+            job = _parse_llm_sync(compacted, name, custom_prompt, known)
+        except (ValueError, requests.exceptions.RequestException) as e:
+            routing.record(name, time.perf_counter() - started, routing.ERROR)
+            logger.warning(f"⚠️ {name} failed: {e}")
+            last_error = e
+            continue
+        routing.record(name, time.perf_counter() - started, routing.OK)
+        return _finish(job, source_url)
+    raise last_error
+
+
+def _parse_llm_sync(text: str, model: str, custom_prompt: str = None, known: dict = None) -> JobPosting:
     logger.info(f"🤖 Parsing with {model}")
-    
+    response_data = _post_completion_sync(_build_payload(text, model, custom_prompt, known))
+
+    job, data, invalid = _validate_content(_response_content(response_data), known)
+    if job is None:
+        repaired = None
+        if settings.PARSE_REPAIR_ENABLED:
+            logger.info(f"🩹 Repairing {', '.join(invalid)} with {model}")
+            try:
+                repaired = _response_content(_post_completion_sync(_repair_payload(text, model, data, invalid)))
+            except (ValueError, requests.exceptions.RequestException) as e:
+                logger.warning(f"⚠️ Repair request failed: {e}")
+        job = _apply_repair(data, invalid, repaired)
+    return job
+
+
+def _post_completion_sync(payload: dict) -> dict:
+    with metrics.llm_request(payload["model"]):
+        response_data = _request_completion_sync(payload)
+    metrics.record_usage(payload["model"], response_data)
+    return response_data
+
+
+def _request_completion_sync(payload: dict) -> dict:
+    api_key = _get_api_key()
     try:
         response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": full_prompt}]
-            },
-            timeout=60
+            f"{settings.OPENROUTER_BASE_URL}/chat/completions",
+            headers=_build_headers(api_key),
+            json=payload,
+            timeout=settings.OPENROUTER_TIMEOUT_SECONDS
         )
     except requests.exceptions.Timeout:
-        logger.error("❌ OpenRouter request timed out after 60s")
+        logger.error(f"❌ OpenRouter request timed out after {settings.OPENROUTER_TIMEOUT_SECONDS}s")
         raise
     except requests.exceptions.RequestException as e:
         logger.error(f"❌ OpenRouter request failed: {e}")
@@ -62,19 +112,429 @@ def parse_with_ai(
         raise ValueError(f"API request failed: {e}")
     
     try:
-        response_data = response.json()
-        content = response_data["choices"][0]["message"]["content"]
-    except (KeyError, json.JSONDecodeError) as e:
+        return response.json()
+    except json.JSONDecodeError as e:
         logger.error(f"❌ Invalid API response format: {e}")
         raise ValueError(f"Invalid API response: {e}")
+
+
+async def parse_with_ai_async(
+    text: str,
+    model: str = None,
+    custom_prompt: str = None,
+    source_url: str = None,
+    timeout: float = None,
+    on_fields: Optional[Callable[[dict], Awaitable[None]]] = None
+) -> JobPosting:
+    """
+    Non-blocking `parse_with_ai` over the shared keep-alive client,
+    so many parses can be in flight without holding a thread each.
+    Without `model`, PARSE_MODELS are raced through `routing.hedged`.
+    Fields found by the extractors are not asked for again; when they cover
+    PARSE_EXTRACTOR_SUFFICIENT_FIELDS the LLM is not called at all.
+    With `on_fields`, the completion is streamed (OPENROUTER_STREAMING) and
+    `on_fields` is awaited with each batch of raw JobPosting fields as soon as
+    they are complete, extracted ones first; the validated posting is still
+    what gets returned.
+    """
+    known = _extract(text, source_url)
+    job = _job_from_extracted(known, source_url)
+    if job:
+        return job
+
+    compacted = _compact(text, source_url)
+
+    async def attempt(name: str, index: int) -> JobPosting:
+        # Only the primary streams partial fields, so a hedge can't interleave its own
+        return await _parse_llm_async(compacted, name, custom_prompt, known, timeout, on_fields if index == 0 else None)
+
+    job = await routing.hedged(attempt, [model] if model else None)
+    return _finish(job, source_url)
+
+
+async def _parse_llm_async(
+    text: str,
+    model: str,
+    custom_prompt: str = None,
+    known: dict = None,
+    timeout: float = None,
+    on_fields: Optional[Callable[[dict], Awaitable[None]]] = None
+) -> JobPosting:
+    logger.info(f"🤖 Parsing with {model}")
+    payload = _build_payload(text, model, custom_prompt, known)
+    if on_fields is None or not settings.OPENROUTER_STREAMING:
+        content = _response_content(await _post_completion(payload, timeout))
+    else:
+        if known:
+            await on_fields(dict(known))
+        content = await _stream_completion(payload, on_fields, skip=set(known), timeout=timeout)
+
+    job, data, invalid = _validate_content(content, known)
+    if job is None:
+        repaired = None
+        if settings.PARSE_REPAIR_ENABLED:
+            logger.info(f"🩹 Repairing {', '.join(invalid)} with {model}")
+            try:
+                repaired = _response_content(await _post_completion(_repair_payload(text, model, data, invalid), timeout))
+            except (ValueError, httpx.HTTPError) as e:
+                logger.warning(f"⚠️ Repair request failed: {e}")
+        job = _apply_repair(data, invalid, repaired)
+    return job
+
+
+async def parse_batch_with_ai_async(
+    texts: List[str],
+    model: str = None,
+    source_urls: List[Optional[str]] = None,
+    timeout: float = None
+) -> List[Optional[JobPosting]]:
+    """
+    Parse several postings with one chat completion. The prompt is sent once
+    and the model answers with a JSON array; entries are matched back by their
+    `index`. Entries that are missing or fail validation come back as None so
+    the caller can retry them individually. Raises ValueError if the response
+    is not a usable array at all. Without `model` the first routed model is
+    used; batches are not hedged, that would pay for the whole batch twice.
+    """
+    source_urls = source_urls or [None] * len(texts)
+    known = [_extract(text, url) for text, url in zip(texts, source_urls)]
+    results = [_job_from_extracted(fields, url) for fields, url in zip(known, source_urls)]
+    # Only postings the extractors couldn't cover go to the LLM, renumbered from 0
+    llm_indexes = [i for i, job in enumerate(results) if job is None]
+    if not llm_indexes:
+        return results
+    llm_results = await routing.hedged(
+        lambda name, _: _parse_batch(
+            [texts[i] for i in llm_indexes],
+            name,
+            [source_urls[i] for i in llm_indexes],
+            [known[i] for i in llm_indexes],
+            timeout,
+        ),
+        [model] if model else routing.model_order()[:1],
+    )
+    for i, job in zip(llm_indexes, llm_results):
+        results[i] = job
+
+    parsed = sum(1 for job in results if job)
+    logger.info(f"✅ Batch parsed {parsed}/{len(texts)} postings")
+    return results
+
+
+async def _parse_batch(
+    texts: List[str],
+    model: str,
+    source_urls: List[Optional[str]],
+    known: List[dict],
+    timeout: float = None
+) -> List[Optional[JobPosting]]:
+    logger.info(f"🤖 Batch parsing {len(texts)} postings with {model}")
+
+    jobs_text = "\n\n".join(
+        f"### JOB {i}\n{_compact(text, url)}" for i, (text, url) in enumerate(zip(texts, source_urls))
+    )
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": f"{BATCH_PROMPT}\n\n{jobs_text}"}]
+    }
+    response_data = await _post_completion(payload, timeout)
+    content = _response_content(response_data)
+
+    try:
+        items = json.loads(_extract_json_array(content))
+    except json.JSONDecodeError as e:
+        logger.error(f"❌ Failed to parse JSON array from batch response: {e}")
+        raise ValueError(f"Invalid JSON in batch LLM response: {e}")
+    if not isinstance(items, list):
+        raise ValueError("Batch LLM response is not a JSON array")
+
+    by_index = {}
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", None)
+        if not isinstance(index, int):
+            # Positional matching is only trustworthy if nothing was dropped
+            if len(items) != len(texts):
+                continue
+            index = position
+        if 0 <= index < len(texts):
+            by_index[index] = item
+
+    results = []
+    for i in range(len(texts)):
+        data = by_index.get(i)
+        job = None
+        if data is not None:
+            try:
+                job = _job_from_data({**data, **known[i]}, source_urls[i])
+            except ValueError:
+                pass
+        results.append(job)
+    return results
+
+
+async def _post_completion(payload: dict, timeout: float = None) -> dict:
+    with metrics.llm_request(payload["model"]):
+        response_data = await _request_completion(payload, timeout)
+    metrics.record_usage(payload["model"], response_data)
+    return response_data
+
+
+async def _request_completion(payload: dict, timeout: float = None) -> dict:
+    api_key = _get_api_key()
+    try:
+        response = await get_client().post(
+            "/chat/completions",
+            headers=_build_headers(api_key),
+            json=payload,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+    except httpx.TimeoutException:
+        logger.error("❌ OpenRouter request timed out")
+        raise
+    except httpx.HTTPError as e:
+        logger.error(f"❌ OpenRouter request failed: {e}")
+        raise
     
     try:
-        json_str = _extract_json(content)
-        data = json.loads(json_str)
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        logger.error(f"❌ OpenRouter HTTP error: {e}")
+        raise ValueError(f"API request failed: {e}")
+    
+    try:
+        return response.json()
+    except json.JSONDecodeError as e:
+        logger.error(f"❌ Invalid API response format: {e}")
+        raise ValueError(f"Invalid API response: {e}")
+
+
+async def _stream_completion(
+    payload: dict,
+    on_fields: Callable[[dict], Awaitable[None]],
+    skip: set = None,
+    timeout: float = None
+) -> str:
+    """
+    POST with `"stream": true` and read the SSE chunks; returns the full
+    message content. Top-level fields not in `skip` are handed to `on_fields`
+    once each, as soon as their value is complete.
+    """
+    with metrics.llm_request(payload["model"]):
+        return await _read_stream(payload, on_fields, skip, timeout)
+
+
+async def _read_stream(
+    payload: dict,
+    on_fields: Callable[[dict], Awaitable[None]],
+    skip: set = None,
+    timeout: float = None
+) -> str:
+    api_key = _get_api_key()
+    seen = set(skip or ())
+    content = ""
+    try:
+        async with get_client().stream(
+            "POST",
+            "/chat/completions",
+            headers=_build_headers(api_key),
+            json={**payload, "stream": True},
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"❌ OpenRouter HTTP error: {e}")
+                    raise ValueError(f"API request failed: {e}")
+
+            async for line in response.aiter_lines():
+                # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                if "error" in chunk:
+                    logger.error(f"❌ OpenRouter stream error: {chunk['error']}")
+                    raise ValueError(f"API request failed: {chunk['error']}")
+                # The final chunk carries the usage of the whole completion
+                metrics.record_usage(payload["model"], chunk)
+                try:
+                    delta = chunk["choices"][0]["delta"].get("content") or ""
+                except (KeyError, IndexError, TypeError, AttributeError):
+                    continue
+                content += delta
+                # A field can only have completed if its closing , or } just arrived
+                if "," not in delta and "}" not in delta:
+                    continue
+                new = {key: value for key, value in completed_fields(content).items() if key not in seen}
+                if new:
+                    seen.update(new)
+                    await on_fields(_normalize_enums(new))
+    except httpx.TimeoutException:
+        logger.error("❌ OpenRouter request timed out")
+        raise
+    except httpx.HTTPError as e:
+        logger.error(f"❌ OpenRouter request failed: {e}")
+        raise
+    return content
+
+
+def _get_api_key() -> str:
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise ValueError("OPENROUTER_API_KEY not set")
+    return api_key
+
+
+def _build_headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def _extract(text: str, source_url: str = None) -> dict:
+    with metrics.stage("extract"):
+        return extract_fields(text, _extract_source(source_url) if source_url else None)
+
+
+def _compact(text: str, source_url: str = None) -> str:
+    # Runs after the extractors, which need the page's markup
+    with metrics.stage("compact"):
+        return compact_text(text, _extract_source(source_url) if source_url else None)
+
+
+def _job_from_extracted(known: dict, source_url: str = None) -> Optional[JobPosting]:
+    """The posting built from extracted fields alone, if they are enough to skip the LLM."""
+    if not is_sufficient(known):
+        return None
+    try:
+        job = _job_from_data(dict(known), source_url)
+    except ValueError:
+        return None
+    logger.info(f"⚡ Extracted {job.job_title} @ {job.company} without the LLM")
+    return job
+
+
+def _build_payload(text: str, model: str, custom_prompt: str = None, known: dict = None) -> dict:
+    prompt = custom_prompt or DEFAULT_PROMPT
+    if known:
+        prompt += PARTIAL_PROMPT.format(
+            known=json.dumps(known, ensure_ascii=False), missing=", ".join(missing_fields(known))
+        )
+    full_prompt = f"{prompt}\n\nJob text:\n{text}"
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": full_prompt}]
+    }
+    if settings.OPENROUTER_STRUCTURED_OUTPUT:
+        # Providers without structured outputs ignore it; their free text goes through _validate_content
+        payload["response_format"] = response_format(missing_fields(known) if known else None)
+    return payload
+
+
+def _repair_payload(text: str, model: str, data: dict, invalid: dict) -> dict:
+    errors = "\n".join(
+        f"- {field}: {json.dumps(data.get(field), ensure_ascii=False)} ({message})" for field, message in invalid.items()
+    )
+    prompt = REPAIR_PROMPT.format(errors=errors, fields=", ".join(invalid))
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": f"{prompt}\n\nJob text:\n{text}"}]
+    }
+    if settings.OPENROUTER_STRUCTURED_OUTPUT:
+        payload["response_format"] = response_format(invalid)
+    return payload
+
+
+def _response_content(response_data: dict) -> str:
+    try:
+        return response_data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as e:
+        logger.error(f"❌ Invalid API response format: {e}")
+        raise ValueError(f"Invalid API response: {e}")
+
+
+def _validate_content(content: str, known: dict = None) -> Tuple[Optional[JobPosting], dict, dict]:
+    """
+    `(job, data, invalid)` for a completion. A schema-conformant object is
+    validated in a single `model_validate_json` pass; anything else is parsed
+    leniently and enum-normalized, and if fields still fail, `job` is None and
+    `invalid` maps them to their error for `_repair_payload`. Raises
+    ValueError when there is no JSON object to work with at all.
+    """
+    if not known:
+        try:
+            with metrics.stage("validate"):
+                return JobPosting.model_validate_json(content), {}, {}
+        except ValidationError:
+            pass
+    try:
+        with metrics.stage("json_extract"):
+            data = json.loads(_extract_json(content))
     except json.JSONDecodeError as e:
         logger.error(f"❌ Failed to parse JSON from LLM response: {e}")
         raise ValueError(f"Invalid JSON in LLM response: {e}")
-    
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON in LLM response: not an object")
+    if known:
+        # Extracted values are taken from the page as-is; the LLM only fills the gaps
+        data = {**data, **known}
+    return _validate_data(data)
+
+
+def _validate_data(data: dict) -> Tuple[Optional[JobPosting], dict, dict]:
+    with metrics.stage("normalize"):
+        data = _normalize_enums(data)
+    try:
+        with metrics.stage("validate"):
+            return JobPosting.model_validate(data), data, {}
+    except ValidationError as e:
+        invalid = {}
+        for error in e.errors():
+            if not error["loc"]:
+                raise ValueError(f"Job posting validation failed: {e}")
+            invalid.setdefault(str(error["loc"][0]), error["msg"])
+        return None, data, invalid
+
+
+def _apply_repair(data: dict, invalid: dict, content: Optional[str]) -> JobPosting:
+    """Merge repaired values over the invalid fields; those still invalid are dropped, not fatal."""
+    repaired = {}
+    if content:
+        try:
+            repaired = json.loads(_extract_json(content))
+        except json.JSONDecodeError:
+            logger.warning("⚠️ Repair response is not valid JSON")
+    if isinstance(repaired, dict):
+        data = {**data, **{field: value for field, value in repaired.items() if field in invalid}}
+    job, data, still_invalid = _validate_data(data)
+    if job is None:
+        logger.warning(f"⚠️ Dropping invalid fields: {', '.join(still_invalid)}")
+        job, _, still_invalid = _validate_data({key: value for key, value in data.items() if key not in still_invalid})
+        if job is None:
+            raise ValueError(f"Job posting validation failed: {still_invalid}")
+    return job
+
+
+def _finish(job: JobPosting, source_url: str = None) -> JobPosting:
+    if source_url:
+        job.source = _extract_source(source_url)
+    with metrics.stage("auto_fix"):
+        job = auto_fix_job_posting(job)
+    logger.info(f"✅ Parsed: {job.job_title} @ {job.company}")
+    return job
+
+
+def _job_from_data(data: dict, source_url: str = None) -> JobPosting:
     try:
         data = _normalize_enums(data)
         
@@ -82,13 +542,10 @@ def parse_with_ai(
             data["source"] = _extract_source(source_url)
         
         job = JobPosting(**data)
-        job = auto_fix_job_posting(job)
+        return auto_fix_job_posting(job)
     except Exception as e:
         logger.error(f"❌ Validation error: {e}")
         raise ValueError(f"Job posting validation failed: {e}")
-    
-    logger.info(f"✅ Parsed: {job.job_title} @ {job.company}")
-    return job
 
 
 def _extract_source(url: str) -> str:
@@ -127,8 +584,27 @@ def _extract_json(text: str) -> str:
     return text
 
 
+def _extract_json_array(text: str) -> str:
+    """Like `_extract_json`, but for a top-level JSON array."""
+    text = text.strip()
+    
+    if "```" in text:
+        try:
+            block = text.split("```")[1]
+            return block[4:].strip() if block.startswith("json") else block.strip()
+        except IndexError:
+            pass
+
+    start = text.find('[')
+    end = text.rfind(']')
+    if start != -1 and end != -1 and end > start:
+        return text[start:end+1]
+
+    return text
+
+
 def _normalize_enums(data: dict) -> dict:
-    if data.get("work_mode"):
+    if isinstance(data.get("work_mode"), str):
         wm = data["work_mode"].lower().replace("-", "").replace("_", "")
         data["work_mode"] = wm
     
@@ -151,18 +627,18 @@ def _normalize_enums(data: dict) -> dict:
             # If nothing matches, it's better to set to None than keep garbage
             data["employment_type"] = None
     
-    if data.get("salary"):
+    if isinstance(data.get("salary"), dict):
         salary = data["salary"]
-        if salary.get("currency"):
+        if isinstance(salary.get("currency"), str):
             salary["currency"] = salary["currency"].upper()
-        if salary.get("unit"):
+        if isinstance(salary.get("unit"), str):
             unit = salary["unit"].lower()
             unit_map = {"month": "month", "year": "year", "hour": "hour"}
             for key, value in unit_map.items():
                 if key in unit:
                     salary["unit"] = value
                     break
-        if salary.get("gross_net"):
+        if isinstance(salary.get("gross_net"), str):
             salary["gross_net"] = salary["gross_net"].lower()
     
     return data
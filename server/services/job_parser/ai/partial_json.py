@@ -0,0 +1,44 @@
+"""Reading fields out of a JSON object whose text is still streaming in"""
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+def completed_fields(buffer: str) -> dict:
+    """
+    Top-level members of the (possibly truncated) JSON object in `buffer`
+    whose values have fully arrived. A value only counts once the `,` or `}`
+    after it is there, so `2000` is never reported as `200`. Leading noise
+    such as a ```json fence is skipped.
+    """
+    pos = buffer.find("{")
+    if pos < 0:
+        return {}
+    fields = {}
+    end = len(buffer)
+    pos += 1
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= end or buffer[pos] != '"':
+            return fields
+        try:
+            key, pos = _decoder.raw_decode(buffer, pos)
+        except ValueError:
+            return fields
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= end or buffer[pos] != ":":
+            return fields
+        pos = _WHITESPACE.match(buffer, pos + 1).end()
+        try:
+            value, pos = _decoder.raw_decode(buffer, pos)
+        except ValueError:
+            return fields
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= end or buffer[pos] not in ",}":
+            return fields
+        fields[key] = value
+        if buffer[pos] == "}":
+            return fields
+        pos += 1
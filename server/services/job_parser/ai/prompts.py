@@ -1,5 +1,8 @@
 """LLM prompts for job parsing"""
 
+# Bump whenever DEFAULT_PROMPT changes so cached parse results are not reused
+PROMPT_VERSION = "1"
+
 DEFAULT_PROMPT = """You are extracting structured job data.
 
 CRITICAL RULES:
@@ -53,3 +56,33 @@ Return valid JSON:
   "responsibilities": ["responsibility descriptions"],
   "project_description": "string or null"
 }"""
+
+
+BATCH_PROMPT = DEFAULT_PROMPT + """
+
+BATCH MODE:
+You will receive several job postings, each starting with a line "### JOB <n>".
+Extract every posting independently using the rules above.
+Return ONLY a JSON array with exactly one object per posting, in the same order.
+Each object has the fields above plus "index": <n> (the number from its "### JOB" line)."""
+
+
+# Appended to DEFAULT_PROMPT when extractors already found some fields
+PARTIAL_PROMPT = """
+
+ALREADY EXTRACTED from structured data in the page (do not return these):
+{known}
+
+Return ONLY a JSON object with these remaining fields: {missing}"""
+
+
+# Follow-up for the fields of a completion that failed validation; only those are regenerated
+REPAIR_PROMPT = """You extracted structured data from the job posting below, but some fields are invalid.
+
+INVALID FIELDS (value and problem):
+{errors}
+
+Return ONLY a JSON object with corrected values for these fields: {fields}
+Use the enum values exactly as listed (lowercase work_mode/employment_type/seniority/unit,
+uppercase currency), integers for salary amounts with max >= min, and null or [] when
+the posting has no valid value. Do NOT infer or guess values."""
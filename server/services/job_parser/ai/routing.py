@@ -0,0 +1,207 @@
+"""
+Model routing for parse requests.
+
+PARSE_MODELS is tried in order, except that models whose recent error rate
+is above PARSE_ROUTER_MAX_ERROR_RATE move to the back. `hedged` starts the
+first model and, if it hasn't answered by its deadline (its rolling p95,
+clamped to PARSE_HEDGE_MIN_SECONDS..PARSE_HEDGE_SECONDS), also starts the
+next one; the first valid result wins and the rest are cancelled. A failed
+attempt starts the next model straight away.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+OK = "ok"
+ERROR = "error"
+# Lost a hedge race; its latency is only a lower bound
+CANCELLED = "cancelled"
+
+
+class ModelStats:
+    """Rolling window of the last PARSE_ROUTER_WINDOW attempts of one model."""
+
+    def __init__(self):
+        self._samples = deque(maxlen=settings.PARSE_ROUTER_WINDOW)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    def record(self, seconds: float, outcome: str):
+        with self._lock:
+            self._samples.append((seconds, outcome))
+            self.requests += 1
+            if outcome == ERROR:
+                self.errors += 1
+            elif outcome == CANCELLED:
+                self.cancelled += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = list(self._samples)
+        # Fast failures would drag the percentiles down
+        latencies = sorted(seconds for seconds, outcome in samples if outcome != ERROR)
+        errors = sum(1 for _, outcome in samples if outcome == ERROR)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "window": len(samples),
+            "error_rate": round(errors / len(samples), 3) if samples else 0.0,
+            "p50_seconds": _percentile(latencies, 0.50),
+            "p95_seconds": _percentile(latencies, 0.95),
+        }
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    # Nearest rank
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return round(values[index], 3)
+
+
+_stats: Dict[str, ModelStats] = {}
+_stats_lock = threading.Lock()
+
+
+def stats_for(model: str) -> ModelStats:
+    with _stats_lock:
+        if model not in _stats:
+            _stats[model] = ModelStats()
+        return _stats[model]
+
+
+def record(model: str, seconds: float, outcome: str):
+    stats_for(model).record(seconds, outcome)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _healthy(summary: dict) -> bool:
+    if summary["window"] < settings.PARSE_ROUTER_MIN_SAMPLES:
+        return True
+    return summary["error_rate"] <= settings.PARSE_ROUTER_MAX_ERROR_RATE
+
+
+def cache_model() -> str:
+    """
+    Model part of the parse cache key: the configured PARSE_MODELS. Routing and
+    hedging let any of them answer, so their results are shared; changing the
+    list stops serving results of models that are no longer configured.
+    """
+    return ",".join(dict.fromkeys(settings.PARSE_MODELS))
+
+
+def model_order() -> List[str]:
+    """PARSE_MODELS with unhealthy models moved to the back, order otherwise kept."""
+    models = list(dict.fromkeys(settings.PARSE_MODELS))
+    return sorted(models, key=lambda model: not _healthy(stats_for(model).summary()))
+
+
+def hedge_deadline(model: str) -> Optional[float]:
+    """Seconds to wait for `model` before hedging; None when hedging is off."""
+    if settings.PARSE_HEDGE_SECONDS <= 0:
+        return None
+    summary = stats_for(model).summary()
+    if summary["p95_seconds"] is None or summary["window"] < settings.PARSE_ROUTER_MIN_SAMPLES:
+        return settings.PARSE_HEDGE_SECONDS
+    return min(settings.PARSE_HEDGE_SECONDS, max(settings.PARSE_HEDGE_MIN_SECONDS, summary["p95_seconds"]))
+
+
+def model_stats() -> List[dict]:
+    """Per-model summary for the configured models first, then any others that were used."""
+    with _stats_lock:
+        used = list(_stats)
+    models = list(dict.fromkeys(list(settings.PARSE_MODELS) + used))
+    result = []
+    for model in models:
+        summary = stats_for(model).summary()
+        result.append({
+            "model": model,
+            **summary,
+            "healthy": _healthy(summary),
+            "hedge_after_seconds": hedge_deadline(model),
+        })
+    return result
+
+
+async def _timed(model: str, call: Awaitable[T]) -> T:
+    started = time.perf_counter()
+    try:
+        result = await call
+    except asyncio.CancelledError:
+        record(model, time.perf_counter() - started, CANCELLED)
+        raise
+    except Exception:
+        record(model, time.perf_counter() - started, ERROR)
+        raise
+    record(model, time.perf_counter() - started, OK)
+    return result
+
+
+async def hedged(call: Callable[[str, int], Awaitable[T]], models: Optional[List[str]] = None) -> T:
+    """
+    Run `call(model, attempt)` over `models` (default `model_order()`) with
+    hedging and fallback as described above; `attempt` is 0 for the primary.
+    Raises the last error if every model failed.
+    """
+    models = list(models or model_order())
+    models_started: List[str] = []
+    pending: Dict[asyncio.Task, str] = {}
+    last_error: Optional[BaseException] = None
+    hedge_at = None
+
+    def launch():
+        nonlocal hedge_at
+        attempt = len(models_started)
+        model = models[attempt]
+        models_started.append(model)
+        pending[asyncio.create_task(_timed(model, call(model, attempt)))] = model
+        deadline = hedge_deadline(model) if len(models_started) < len(models) else None
+        hedge_at = time.monotonic() + deadline if deadline is not None else None
+
+    launch()
+    try:
+        while pending:
+            timeout = max(0.0, hedge_at - time.monotonic()) if hedge_at is not None else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info(
+                    f"⏱️ {models_started[-1]} has not answered in {hedge_deadline(models_started[-1]):.1f}s, "
+                    f"hedging with {models[len(models_started)]}"
+                )
+                launch()
+                continue
+            for task in done:
+                model = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"⚠️ {model} failed: {e}")
+                    if len(models_started) < len(models):
+                        launch()
+                    continue
+                if len(models_started) > 1:
+                    logger.info(f"🏁 {model} won after {len(models_started)} attempts")
+                return result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    raise last_error
@@ -0,0 +1,55 @@
+"""Structured-output JSON schema for the LLM, generated from JobPosting"""
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from ..models import JobPosting
+
+# Filled in by the parser, never asked from the model
+EXCLUDED_FIELDS = {"raw_data", "source"}
+# Annotations strict mode rejects or doesn't need
+_DROPPED_KEYWORDS = {"title", "default", "description"}
+
+
+def _strict(node, defs: dict):
+    """Inline $refs and make every object closed with all properties required."""
+    if isinstance(node, list):
+        return [_strict(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        return _strict(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+    strict = {}
+    for key, value in node.items():
+        if key in _DROPPED_KEYWORDS or key == "$defs":
+            continue
+        if key == "properties":
+            strict[key] = {name: _strict(prop, defs) for name, prop in value.items()}
+        else:
+            strict[key] = _strict(value, defs)
+    if strict.get("type") == "object" and "properties" in strict:
+        strict["required"] = list(strict["properties"])
+        strict["additionalProperties"] = False
+    return strict
+
+
+@lru_cache(maxsize=None)
+def _schema(fields: Optional[tuple]) -> dict:
+    schema = JobPosting.model_json_schema()
+    properties = {
+        name: prop for name, prop in schema["properties"].items()
+        if name not in EXCLUDED_FIELDS and (fields is None or name in fields)
+    }
+    return _strict({"type": "object", "properties": properties}, schema.get("$defs", {}))
+
+
+def job_posting_schema(fields: Optional[Iterable[str]] = None) -> dict:
+    """Strict schema for `fields` (default: every field the model fills); optional fields are nullable."""
+    return _schema(tuple(fields) if fields is not None else None)
+
+
+def response_format(fields: Optional[Iterable[str]] = None) -> dict:
+    """`response_format` for a chat completion returning one JobPosting object."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "job_posting", "strict": True, "schema": job_posting_schema(fields)},
+    }
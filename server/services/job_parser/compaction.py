@@ -0,0 +1,147 @@
+"""
+Shrinks raw posting text before it is put into the LLM prompt.
+
+Users paste whole pages: HTML remnants, navigation, cookie banners, share
+buttons and "similar offers" lists. `compact_text` strips markup, collapses
+whitespace, drops boilerplate lines (generic plus per-source rules keyed by
+`_extract_source` names) and cuts the result to PARSE_INPUT_MAX_TOKENS.
+
+Rules err on the side of keeping text: the posting's own title often sits in
+a `<header>`, and requirement bullets can mention cookies or repeat.
+"""
+import html
+import logging
+import re
+from typing import Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English/Polish prose; only used for the budget, no tokenizer needed
+CHARS_PER_TOKEN = 4
+
+_DROPPED_ELEMENTS = re.compile(
+    r"<(script|style|noscript|svg|nav|footer|form|iframe|template)\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+# A <header> inside <main>/<article> is the posting's own (title, company); outside it is the site's
+_CONTENT_ELEMENT = re.compile(r"<(main|article)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HEADER_ELEMENT = re.compile(r"<header\b[^>]*>.*?</header\s*>", re.IGNORECASE | re.DOTALL)
+_BLOCK_TAG = re.compile(r"<\s*/?\s*(?:br|p|div|li|ul|ol|tr|h\d|section|article|dd|dt)\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0\u200b]+")
+
+# Whole lines that are page chrome, compared casefolded
+BOILERPLATE_LINES = {
+    "menu", "home", "search", "share", "save", "apply", "apply now", "sign in", "log in", "login", "sign up",
+    "register", "skip to main content", "back to search", "report this job", "report this offer",
+    "show more", "show less", "see more", "read more", "copy link", "close", "×",
+    "zaloguj się", "zaloguj", "zarejestruj się", "udostępnij", "zapisz", "aplikuj", "aplikuj teraz",
+    "pokaż więcej", "zgłoś ofertę", "wróć do wyszukiwania", "zamknij",
+}
+# Cookie/consent banners and legal footers; a line is dropped only if one of these matches it whole
+BOILERPLATE_PATTERN = re.compile(
+    r"(?:we use|this (?:site|website) uses|(?:ta )?strona (?:używa|wykorzystuje)|(?:serwis )?używamy) "
+    r"(?:cookies|plików cookie|ciasteczek)\b.*"
+    r"|(?:cookie|cookies) (?:settings|preferences|policy|consent)|(?:ustawienia|polityka) (?:plików )?cookies?"
+    r"|(?:accept|reject|allow) all(?: cookies)?|akceptuj\w* wszystk\w*(?: ciasteczka| pliki cookies?)?"
+    r"|privacy policy|polityk\w* prywatności"
+    r"|(?:©|copyright ©?) ?\d{4}\b.*|.*\ball rights reserved\.?|.*\bwszelkie prawa zastrzeżone\.?",
+    re.IGNORECASE,
+)
+# Longer lines are prose, not a banner or footer
+BOILERPLATE_MAX_LENGTH = 200
+
+# Per-source rules: extra lines to drop, and markers after which the rest of the page is chrome
+SOURCE_RULES = {
+    "linkedin": {
+        "drop": re.compile(r"^(?:\d+ applicants?|promoted|easy apply|over \d+ applicants|reposted .* ago)$", re.IGNORECASE),
+        "stop": re.compile(r"^(?:people also viewed|similar jobs|more jobs|looking for talent\?)", re.IGNORECASE),
+    },
+    "indeed": {
+        "drop": re.compile(r"^(?:.*- job post|report job|hiring insights)$", re.IGNORECASE),
+        "stop": re.compile(r"^(?:people also searched|explore other jobs|salary search)", re.IGNORECASE),
+    },
+    "pracuj": {
+        "drop": re.compile(r"^(?:aplikuj szybko|oferta ważna do.*|sprawdź, jak dojechać)$", re.IGNORECASE),
+        "stop": re.compile(r"^(?:podobne oferty|zobacz także|inne oferty pracodawcy)", re.IGNORECASE),
+    },
+    "justjoin": {
+        "drop": re.compile(r"^(?:post a job|brands|top offers|geek)$", re.IGNORECASE),
+        "stop": re.compile(r"^(?:similar offers|check similar offers)", re.IGNORECASE),
+    },
+    "nofluffjobs": {
+        "drop": re.compile(r"^(?:dla firm|for companies|obserwuj)$", re.IGNORECASE),
+        "stop": re.compile(r"^(?:podobne oferty|similar offers|polecane oferty)", re.IGNORECASE),
+    },
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _drop_site_headers(text: str) -> str:
+    """Drop <header> elements outside <main>/<article>; pages without either keep them."""
+    content = list(_CONTENT_ELEMENT.finditer(text))
+    if not content:
+        return text
+    parts = []
+    pos = 0
+    for match in content:
+        parts.append(_HEADER_ELEMENT.sub("\n", text[pos:match.start()]))
+        parts.append(match.group(0))
+        pos = match.end()
+    parts.append(_HEADER_ELEMENT.sub("\n", text[pos:]))
+    return "".join(parts)
+
+
+def strip_html(text: str) -> str:
+    """Markup to plain lines; block elements become line breaks."""
+    if "<" not in text and "&" not in text:
+        return text
+    text = _drop_site_headers(_DROPPED_ELEMENTS.sub("\n", text))
+    text = _BLOCK_TAG.sub("\n", text)
+    return html.unescape(_TAG.sub(" ", text))
+
+
+def compact_text(text: str, source: Optional[str] = None, max_tokens: Optional[int] = None) -> str:
+    """
+    Plain posting text within the token budget; a line repeating the one
+    before it is dropped, repeats further apart are kept.
+    `max_tokens` defaults to PARSE_INPUT_MAX_TOKENS; 0 disables the cut.
+    """
+    if not text or not settings.PARSE_COMPACTION_ENABLED:
+        return text
+    rules = SOURCE_RULES.get(source, {})
+    drop, stop = rules.get("drop"), rules.get("stop")
+
+    lines = []
+    for line in strip_html(text).split("\n"):
+        line = _SPACES.sub(" ", line).strip()
+        if not line:
+            continue
+        if stop and lines and stop.match(line):
+            break
+        key = line.casefold()
+        if (lines and key == lines[-1].casefold()) or key in BOILERPLATE_LINES or (drop and drop.match(line)):
+            continue
+        if len(line) <= BOILERPLATE_MAX_LENGTH and BOILERPLATE_PATTERN.fullmatch(line):
+            continue
+        lines.append(line)
+
+    compacted = "\n".join(lines)
+    if not compacted:
+        return text
+    budget = settings.PARSE_INPUT_MAX_TOKENS if max_tokens is None else max_tokens
+    if budget and estimate_tokens(compacted) > budget:
+        # The posting itself comes first on every board; cut the tail at a line break
+        cut = compacted[:budget * CHARS_PER_TOKEN]
+        compacted = cut.rsplit("\n", 1)[0] if "\n" in cut else cut
+
+    logger.info(
+        f"✂️ Compacted posting{f' ({source})' if source else ''}: {len(text):,} → {len(compacted):,} chars "
+        f"(~{estimate_tokens(text):,} → ~{estimate_tokens(compacted):,} tokens)"
+    )
+    return compacted
@@ -0,0 +1,61 @@
+"""
+Deterministic extractors that run before the LLM.
+
+An extractor takes the raw posting text and returns whatever JobPosting fields
+it can read from structured data (JSON-LD, known markup) as a plain dict.
+Extractors registered for a source only run for URLs `_extract_source` maps to
+it; the rest run for every posting. The first extractor to find a field wins.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from . import jsonld
+
+logger = logging.getLogger(__name__)
+
+Extractor = Callable[[str], Dict]
+
+# Fields the LLM prompt asks for, in prompt order
+FIELDS = [
+    "job_title", "company", "location", "work_mode", "employment_type", "seniority", "salary",
+    "stack", "nice_to_have_stack", "requirements", "responsibilities", "project_description",
+]
+
+_extractors: List[Tuple[Optional[frozenset], Extractor]] = []
+
+
+def register(extractor: Extractor, sources: Optional[Iterable[str]] = None) -> Extractor:
+    _extractors.append((frozenset(sources) if sources else None, extractor))
+    return extractor
+
+
+def extract_fields(text: str, source: Optional[str] = None) -> Dict:
+    """Fields found by the registered extractors; empty values are left out."""
+    if not settings.PARSE_EXTRACTORS_ENABLED or not text:
+        return {}
+    fields = {}
+    for sources, extractor in _extractors:
+        if sources is not None and source not in sources:
+            continue
+        try:
+            found = extractor(text)
+        except Exception as e:
+            logger.warning(f"⚠️ Extractor {extractor.__name__} failed: {e}")
+            continue
+        for name, value in found.items():
+            if name in FIELDS and value not in (None, "", [], {}) and name not in fields:
+                fields[name] = value
+    return fields
+
+
+def missing_fields(fields: Dict) -> List[str]:
+    return [name for name in FIELDS if name not in fields]
+
+
+def is_sufficient(fields: Dict) -> bool:
+    """Whether the extracted fields are enough to skip the LLM (PARSE_EXTRACTOR_SUFFICIENT_FIELDS)."""
+    return bool(fields) and all(name in fields for name in settings.PARSE_EXTRACTOR_SUFFICIENT_FIELDS)
+
+
+register(jsonld.extract)
@@ -0,0 +1,162 @@
+"""schema.org JobPosting embedded as JSON-LD (<script type="application/ld+json">)"""
+import html
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..validator import normalize_location
+
+_SCRIPT = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG = re.compile(r"<[^>]+>")
+_BLOCK_BREAK = re.compile(r"<\s*(?:br|/p|/li|/div|/h\d)\s*/?>|<\s*li[^>]*>", re.IGNORECASE)
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•·–]|\d+[.)])\s*")
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+DESCRIPTION_LIMIT = 2000
+
+EMPLOYMENT_TYPES = {
+    "FULL_TIME": "full-time",
+    "PART_TIME": "part-time",
+    "CONTRACTOR": "contract",
+    "TEMPORARY": "contract",
+    "INTERN": "internship",
+}
+SALARY_UNITS = {"MONTH": "month", "YEAR": "year", "HOUR": "hour"}
+CURRENCIES = {"PLN", "USD", "EUR"}
+
+
+def extract(text: str) -> Dict[str, Any]:
+    posting = _find_job_posting(text)
+    if posting is None:
+        return {}
+    return {
+        "job_title": _text(posting.get("title")),
+        "company": _company(posting.get("hiringOrganization")),
+        "location": _location(posting.get("jobLocation")),
+        "work_mode": "remote" if _first(posting.get("jobLocationType")) == "TELECOMMUTE" else None,
+        "employment_type": _employment_type(posting.get("employmentType")),
+        "salary": _salary(posting.get("baseSalary")),
+        "stack": _items(posting.get("skills"), split_commas=True),
+        "requirements": _items(posting.get("qualifications")) or _items(posting.get("experienceRequirements")),
+        "responsibilities": _items(posting.get("responsibilities")),
+        "project_description": _description(posting.get("description")),
+    }
+
+
+def _find_job_posting(text: str) -> Optional[dict]:
+    for match in _SCRIPT.finditer(text):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except json.JSONDecodeError:
+            continue
+        for node in _nodes(data):
+            types = node.get("@type")
+            if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+                return node
+    return None
+
+
+def _nodes(data) -> Iterator[dict]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _nodes(data["@graph"])
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _text(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    # Boards put both raw and entity-escaped HTML in JSON-LD strings
+    value = _TAG.sub(" ", html.unescape(_TAG.sub(" ", value)))
+    value = _WHITESPACE.sub(" ", value).strip()
+    return value or None
+
+
+def _company(organization) -> Optional[str]:
+    organization = _first(organization)
+    if isinstance(organization, dict):
+        return _text(organization.get("name"))
+    return _text(organization)
+
+
+def _location(locations) -> Optional[str]:
+    place = _first(locations)
+    if not isinstance(place, dict):
+        return None
+    address = place.get("address")
+    if isinstance(address, dict):
+        return normalize_location(_text(address.get("addressLocality")))
+    return normalize_location(_text(address))
+
+
+def _employment_type(value) -> Optional[str]:
+    for item in value if isinstance(value, list) else [value]:
+        if isinstance(item, str) and item.upper() in EMPLOYMENT_TYPES:
+            return EMPLOYMENT_TYPES[item.upper()]
+    return None
+
+
+def _number(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _salary(amount) -> Optional[dict]:
+    amount = _first(amount)
+    if not isinstance(amount, dict):
+        return None
+    value = amount.get("value")
+    if isinstance(value, dict):
+        low = _number(value.get("minValue", value.get("value")))
+        high = _number(value.get("maxValue", value.get("value")))
+        unit = SALARY_UNITS.get(str(value.get("unitText", "")).upper())
+    else:
+        low = high = _number(value)
+        unit = None
+    if low is None and high is None:
+        return None
+    if low is not None and high is not None and high < low:
+        low, high = high, low
+    currency = str(amount.get("currency", "")).upper()
+    return {"min": low, "max": high, "currency": currency if currency in CURRENCIES else None, "unit": unit}
+
+
+def _items(value, split_commas: bool = False) -> List[str]:
+    """List fields arrive as arrays, newline/bullet text or HTML lists."""
+    values = value if isinstance(value, list) else [value]
+    items = []
+    for value in values:
+        if isinstance(value, dict):
+            value = value.get("name")
+        if not isinstance(value, str):
+            continue
+        lines = _BLOCK_BREAK.sub("\n", html.unescape(value)).split("\n")
+        for line in lines:
+            parts = line.split(",") if split_commas else [line]
+            for part in parts:
+                item = _LIST_MARKER.sub("", _text(part) or "")
+                if item:
+                    items.append(item)
+    return items
+
+
+def _description(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    lines = (_text(line) for line in _BLOCK_BREAK.sub("\n", html.unescape(value)).split("\n"))
+    text = "\n".join(line for line in lines if line)
+    if not text or len(text) <= DESCRIPTION_LIMIT:
+        return text
+    return text[:DESCRIPTION_LIMIT].rsplit(" ", 1)[0] + "…"
@@ -1,7 +1,11 @@
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from .models import JobPosting
+from core.config import settings
+import json
 import logging
+import os
 import re
+import unicodedata
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +45,7 @@ KNOWN_TECHNOLOGIES = {
 
     # Data Science & AI
     "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Tableau",
-    "Power BI", "Spark", "Hadoop", "KAFKA", "Airflow", "MLflow",
+    "Power BI", "Spark", "Hadoop", "Kafka", "Airflow", "MLflow",
 
     # QA & Testing
     "Selenium", "Cypress", "Playwright", "Jest", "Mocha", "Appium", "JUnit",
@@ -73,38 +77,70 @@ LOCATION_MAPPINGS = {
 }
 
 
+SYNONYMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tech_synonyms.json")
+
+_ZIP_CODE = re.compile(r'\b\d{2}-\d{3}\b')
+
+
+def _alias_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def load_synonyms(*paths: Optional[str]) -> Dict[str, list]:
+    """Merge {canonical: [alias, ...]} files; later files win for the same canonical name."""
+    synonyms = {}
+    for path in paths:
+        if path:
+            with open(path, encoding="utf-8") as f:
+                synonyms.update(json.load(f))
+    return synonyms
+
+
+def build_alias_index(known: Iterable[str], synonyms: Dict[str, list]) -> Dict[str, str]:
+    """Casefolded name or alias -> canonical name."""
+    index = {_alias_key(name): name for name in known}
+    for canonical, aliases in synonyms.items():
+        for alias in [canonical, *aliases]:
+            index[_alias_key(alias)] = canonical
+    return index
+
+
+# Built once at import; TECH_SYNONYMS_FILE adds to or overrides the bundled table
+TECH_ALIASES = build_alias_index(KNOWN_TECHNOLOGIES, load_synonyms(SYNONYMS_FILE, settings.TECH_SYNONYMS_FILE))
+
+
+def _strip_diacritics(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).replace("ł", "l")
+
+
+# Polish spellings and their ASCII forms; longest first so the longer key wins at the same position
+_LOCATION_KEYS = {key: city for pl, city in LOCATION_MAPPINGS.items() for key in (pl, _strip_diacritics(pl))}
+_LOCATION_PATTERN = re.compile("|".join(re.escape(key) for key in sorted(_LOCATION_KEYS, key=len, reverse=True)))
+
+
 def normalize_technology(tech: str) -> Optional[str]:
     tech_clean = tech.strip()
-    
-    if tech_clean in KNOWN_TECHNOLOGIES:
-        return tech_clean
-    
-    for known_tech in KNOWN_TECHNOLOGIES:
-        if tech_clean.lower() == known_tech.lower():
-            return known_tech
-    
-    tech_upper = tech_clean.upper()
-    if tech_upper in KNOWN_TECHNOLOGIES:
-        return tech_upper
-    
+
+    canonical = TECH_ALIASES.get(_alias_key(tech_clean))
+    if canonical:
+        return canonical
+
     if len(tech_clean) > 1:
         return tech_clean
-    
+
     return None
 
 
 def normalize_location(location: Optional[str]) -> Optional[str]:
     if not location:
         return None
-    
-    loc = location.strip()
-    loc = re.sub(r'\b\d{2}-\d{3}\b', '', loc).strip()
-    
-    loc_lower = loc.lower()
-    for pl, en in LOCATION_MAPPINGS.items():
-        if pl in loc_lower:
-            return en
-    
+
+    loc = _ZIP_CODE.sub('', location.strip()).strip()
+
+    match = _LOCATION_PATTERN.search(loc.casefold())
+    if match:
+        return _LOCATION_KEYS[match.group()]
+
     return loc
 
 
@@ -0,0 +1,205 @@
+"""
+In-process metrics for the parse pipeline, the database and HTTP requests,
+kept in prometheus_client collectors on a dedicated registry and exposed at
+GET /metrics.
+
+Values live in this process only; with several server processes each one is
+scraped on its own (label them by instance in the scrape config).
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+
+import httpx
+import requests
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.config import settings
+
+# Seconds; parses span milliseconds (extractors, cache hits) to about a minute (LLM timeout)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Not the prometheus_client default registry, so only these metrics are exposed
+REGISTRY = CollectorRegistry()
+
+PARSE_SECONDS = Histogram(
+    "vacancio_parse_seconds", "Time to parse and store one application.", ("outcome",),
+    buckets=DEFAULT_BUCKETS, registry=REGISTRY,
+)
+PARSE_STAGE_SECONDS = Histogram(
+    "vacancio_parse_stage_seconds", "Time spent in each parse pipeline stage.", ("stage",),
+    buckets=DEFAULT_BUCKETS, registry=REGISTRY,
+)
+PARSE_FAILURES = Counter(
+    "vacancio_parse_failures_total", "Failed parse attempts by reason.", ("reason",), registry=REGISTRY
+)
+PARSES_IN_FLIGHT = Gauge(
+    "vacancio_parses_in_flight", "Parse jobs currently held by workers.", registry=REGISTRY
+)
+PARSE_QUEUE_DEPTH = Gauge(
+    "vacancio_parse_queue_depth", "Jobs in parse_jobs by status (read at scrape time).", ("status",),
+    registry=REGISTRY,
+)
+LLM_TOKENS = Counter(
+    "vacancio_llm_tokens_total", "Tokens reported in OpenRouter usage.", ("model", "kind"), registry=REGISTRY
+)
+LLM_REQUESTS = Counter(
+    "vacancio_llm_requests_total", "OpenRouter completion requests.", ("model", "outcome"), registry=REGISTRY
+)
+DB_QUERY_SECONDS = Histogram(
+    "vacancio_db_query_seconds", "SQL statement execution time.", ("operation",),
+    buckets=DB_BUCKETS, registry=REGISTRY,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "vacancio_http_request_seconds", "HTTP request handling time.", ("method", "handler", "status"),
+    buckets=DEFAULT_BUCKETS, registry=REGISTRY,
+)
+
+
+def stage(name: str):
+    """`with stage("validate"): ...` times one step of the parse pipeline."""
+    return PARSE_STAGE_SECONDS.labels(stage=name).time()
+
+
+@contextmanager
+def llm_request(model: str):
+    """Time one OpenRouter request into the llm_request stage and count its outcome."""
+    with stage("llm_request"):
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Lost a hedge race
+            LLM_REQUESTS.labels(model=model, outcome="cancelled").inc()
+            raise
+        except Exception:
+            LLM_REQUESTS.labels(model=model, outcome="error").inc()
+            raise
+        LLM_REQUESTS.labels(model=model, outcome="ok").inc()
+
+
+def record_usage(model: str, response_data):
+    """Count the prompt/completion tokens of an OpenRouter response's (or last stream chunk's) `usage`."""
+    usage = response_data.get("usage") if isinstance(response_data, dict) else None
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if isinstance(tokens, (int, float)) and tokens > 0:
+            LLM_TOKENS.labels(model=model, kind=kind).inc(tokens)
+
+
+def failure_reason(error: BaseException) -> str:
+    """Coarse, low-cardinality label for a parse failure."""
+    if isinstance(error, (httpx.TimeoutException, requests.exceptions.Timeout, TimeoutError)):
+        return "timeout"
+    if isinstance(error, (httpx.HTTPError, requests.exceptions.RequestException)):
+        return "network"
+    if isinstance(error, SQLAlchemyError):
+        return "db"
+    message = str(error)
+    if "OPENROUTER_API_KEY" in message:
+        return "config"
+    if message.startswith("API request failed"):
+        return "api_error"
+    if message.startswith("Invalid API response"):
+        return "invalid_response"
+    if message.startswith("Invalid JSON"):
+        return "invalid_json"
+    if "validation failed" in message:
+        return "validation"
+    return "other"
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return word if word in ("select", "insert", "update", "delete") else "other"
+
+
+def instrument_engine(engine):
+    """Time every statement `engine` executes into DB_QUERY_SECONDS."""
+    if getattr(engine, "_vacancio_metrics", False):
+        return
+    engine._vacancio_metrics = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_metrics_started")
+        if started:
+            DB_QUERY_SECONDS.labels(operation=_operation(statement)).observe(time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("_metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request into HTTP_REQUEST_SECONDS, by
+    route name (not path, so ids don't blow up the label set), until the body is
+    fully sent. With METRICS_TIMING_HEADERS, the time until the response starts is
+    sent as `Server-Timing: app;dur=<ms>` (headers go out before a stream).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        timing_header = settings.METRICS_TIMING_HEADERS
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timing_header:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", f"app;dur={elapsed_ms:.1f}".encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            handler = getattr(scope.get("route"), "name", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(method=scope["method"], handler=handler, status=status).observe(
+                time.perf_counter() - started
+            )
+
+
+@contextmanager
+def in_flight(count: int = 1):
+    """Raise PARSES_IN_FLIGHT by `count` while the block runs."""
+    PARSES_IN_FLIGHT.inc(count)
+    try:
+        yield
+    finally:
+        PARSES_IN_FLIGHT.dec(count)
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
+
+
+def reset():
+    """Forget every recorded value (tests)."""
+    for metric in (PARSE_SECONDS, PARSE_STAGE_SECONDS, PARSE_FAILURES, PARSE_QUEUE_DEPTH,
+                   LLM_TOKENS, LLM_REQUESTS, DB_QUERY_SECONDS, HTTP_REQUEST_SECONDS):
+        metric.clear()
+    PARSES_IN_FLIGHT.set(0)
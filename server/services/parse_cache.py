@@ -0,0 +1,98 @@
+"""Content-addressed cache of validated LLM parse results"""
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import models
+from database.models import utcnow
+from services.job_parser.ai.parser import _extract_source
+from services.job_parser.ai.prompts import PROMPT_VERSION
+from services.job_parser.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_job_text(text: str) -> str:
+    """Collapse formatting differences that don't change what the LLM sees."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def cache_key(text: str, model: str, prompt_version: str = PROMPT_VERSION) -> str:
+    digest = hashlib.sha256()
+    for part in (normalize_job_text(text), model, prompt_version):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached(db: Session, text: str, model: str, source_url: str = None) -> Optional[JobPosting]:
+    if not settings.PARSE_CACHE_ENABLED:
+        return None
+
+    entry = db.get(models.ParseCacheEntry, cache_key(text, model))
+    if entry is None:
+        return None
+
+    ttl = timedelta(days=settings.PARSE_CACHE_TTL_DAYS)
+    if entry.created_at.replace(tzinfo=None) + ttl < utcnow().replace(tzinfo=None):
+        db.delete(entry)
+        db.commit()
+        return None
+
+    entry.hits += 1
+    entry.last_used_at = utcnow()
+    db.commit()
+
+    job = JobPosting.model_validate_json(entry.result)
+    # The source depends on where this copy was posted, not on the text
+    job.source = _extract_source(source_url) if source_url else None
+    return job
+
+
+def store(db: Session, text: str, model: str, job: JobPosting):
+    if not settings.PARSE_CACHE_ENABLED:
+        return
+
+    key = cache_key(text, model)
+    entry = db.get(models.ParseCacheEntry, key)
+    if entry is None:
+        entry = models.ParseCacheEntry(key=key, model=model, prompt_version=PROMPT_VERSION)
+        db.add(entry)
+
+    entry.result = job.model_dump_json(exclude={"source", "raw_data"})
+    entry.created_at = utcnow()
+    entry.last_used_at = utcnow()
+    db.commit()
+    evict(db)
+
+
+def evict(db: Session) -> int:
+    """Drop expired entries, then the least recently used ones above the size limit."""
+    cutoff = utcnow() - timedelta(days=settings.PARSE_CACHE_TTL_DAYS)
+    removed = db.execute(
+        delete(models.ParseCacheEntry).where(models.ParseCacheEntry.created_at < cutoff)
+    ).rowcount
+
+    keep = select(models.ParseCacheEntry.key).order_by(
+        models.ParseCacheEntry.last_used_at.desc()
+    ).limit(settings.PARSE_CACHE_MAX_ENTRIES)
+    removed += db.execute(
+        delete(models.ParseCacheEntry)
+        .where(models.ParseCacheEntry.key.not_in(keep.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    if removed:
+        logger.info(f"🧹 Evicted {removed} parse cache entries")
+    return removed
@@ -0,0 +1,343 @@
+"""Persistent parse job queue with a bounded worker pool"""
+import asyncio
+import inspect
+import logging
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from database import models
+from database.models import utcnow
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _leasable(now):
+    """Jobs that are due, or whose lease expired because the worker holding them died."""
+    return or_(
+        and_(
+            models.ParseJob.status == models.ParseJobStatus.queued,
+            models.ParseJob.available_at <= now,
+        ),
+        and_(
+            models.ParseJob.status == models.ParseJobStatus.leased,
+            models.ParseJob.leased_until < now,
+        ),
+    )
+
+
+def enqueue_parse(
+    db: Session, application_id: str, bypass_cache: bool = False, commit: bool = True
+) -> models.ParseJob:
+    """
+    Queue an application for parsing.
+    A job that is already pending is left alone, a failed one is reset.
+    `bypass_cache` forces a fresh LLM call instead of a cached result.
+    """
+    job = db.query(models.ParseJob).filter(models.ParseJob.application_id == application_id).first()
+    if job is None:
+        job = models.ParseJob(application_id=application_id, bypass_cache=bypass_cache)
+        db.add(job)
+    else:
+        job.bypass_cache = job.bypass_cache or bypass_cache
+
+    if job.status == models.ParseJobStatus.failed:
+        job.status = models.ParseJobStatus.queued
+        job.attempts = 0
+        job.available_at = utcnow()
+        job.leased_until = None
+        job.leased_by = None
+        job.last_error = None
+
+    if commit:
+        db.commit()
+    return job
+
+
+def enqueue_many(db: Session, application_ids: List[str]) -> List[models.ParseJob]:
+    """Queue freshly created applications (which can't have a job yet) in one transaction."""
+    jobs = [models.ParseJob(application_id=app_id) for app_id in application_ids]
+    db.add_all(jobs)
+    db.commit()
+    return jobs
+
+
+def lease_jobs(db: Session, worker_id: str, limit: int = 1, lease_seconds: int = None) -> List[models.ParseJob]:
+    """
+    Atomically claim up to `limit` of the oldest due jobs for `worker_id`.
+    The conditional UPDATE makes concurrent workers (or processes) race safely:
+    a job only goes to the worker whose UPDATE matched it.
+    """
+    lease_seconds = lease_seconds or settings.PARSE_LEASE_SECONDS
+
+    for _ in range(3):
+        now = utcnow()
+        job_ids = db.execute(
+            select(models.ParseJob.id)
+            .where(_leasable(now))
+            .order_by(models.ParseJob.available_at)
+            .limit(limit)
+        ).scalars().all()
+        if not job_ids:
+            return []
+
+        leased_until = now + timedelta(seconds=lease_seconds)
+        db.execute(
+            update(models.ParseJob)
+            .where(models.ParseJob.id.in_(job_ids), _leasable(now))
+            .values(
+                status=models.ParseJobStatus.leased,
+                leased_by=worker_id,
+                leased_until=leased_until,
+                attempts=models.ParseJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        jobs = db.execute(
+            select(models.ParseJob)
+            .where(
+                models.ParseJob.id.in_(job_ids),
+                models.ParseJob.leased_by == worker_id,
+                models.ParseJob.leased_until == leased_until,
+            )
+            .order_by(models.ParseJob.available_at)
+        ).scalars().all()
+        if jobs:
+            return jobs
+
+    return []
+
+
+def lease_job(db: Session, worker_id: str, lease_seconds: int = None) -> Optional[models.ParseJob]:
+    jobs = lease_jobs(db, worker_id, limit=1, lease_seconds=lease_seconds)
+    return jobs[0] if jobs else None
+
+
+def renew_leases(db: Session, job_ids: List[str], worker_id: str, lease_seconds: int = None) -> int:
+    """
+    Push back the lease expiry of the jobs of `job_ids` that `worker_id` still
+    holds, so a long parse isn't leased again by another worker. Returns the
+    number of leases renewed.
+    """
+    lease_seconds = lease_seconds or settings.PARSE_LEASE_SECONDS
+    result = db.execute(
+        update(models.ParseJob)
+        .where(
+            models.ParseJob.id.in_(job_ids),
+            models.ParseJob.status == models.ParseJobStatus.leased,
+            models.ParseJob.leased_by == worker_id,
+        )
+        .values(leased_until=utcnow() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def complete_job(db: Session, job_id: str):
+    job = db.get(models.ParseJob, job_id)
+    if job:
+        db.delete(job)
+        db.commit()
+
+
+def fail_job(db: Session, job_id: str, error: str, max_attempts: int = None) -> bool:
+    """
+    Record a failed attempt. Returns True if the job was rescheduled with
+    exponential backoff, False if it ran out of attempts.
+    """
+    max_attempts = max_attempts or settings.PARSE_MAX_ATTEMPTS
+    job = db.get(models.ParseJob, job_id)
+    if not job:
+        return False
+
+    job.last_error = error[:1000]
+    job.leased_until = None
+    job.leased_by = None
+
+    retry = job.attempts < max_attempts
+    if retry:
+        delay = settings.PARSE_RETRY_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+        job.status = models.ParseJobStatus.queued
+        job.available_at = utcnow() + timedelta(seconds=delay)
+    else:
+        job.status = models.ParseJobStatus.failed
+
+    db.commit()
+    return retry
+
+
+def queue_depth(db: Session) -> dict:
+    """`{status: job count}` over every ParseJobStatus, zeros included."""
+    counts = dict(
+        db.execute(
+            select(models.ParseJob.status, func.count()).group_by(models.ParseJob.status)
+        ).all()
+    )
+    return {status.value: counts.get(status, 0) for status in models.ParseJobStatus}
+
+
+def recover_orphans(db: Session) -> int:
+    """
+    Enqueue applications stuck in `parsing` without a job, e.g. rows created
+    before the queue existed or whose job was lost between commits.
+    Jobs leased by a dead worker are picked up again once their lease expires.
+    """
+    orphan_ids = db.execute(
+        select(models.JobApplication.id)
+        .outerjoin(models.ParseJob, models.ParseJob.application_id == models.JobApplication.id)
+        .where(
+            models.JobApplication.status == models.ApplicationStatus.parsing,
+            models.ParseJob.id.is_(None),
+        )
+    ).scalars().all()
+
+    for app_id in orphan_ids:
+        db.add(models.ParseJob(application_id=app_id))
+    db.commit()
+    return len(orphan_ids)
+
+
+class ParseWorkerPool:
+    """
+    Fixed number of asyncio workers draining the `parse_jobs` table.
+    `handler(app_id, final_attempt, bypass_cache=...)` does the actual parsing and raises on failure;
+    blocking handlers run in a thread so they never stall the event loop.
+
+    With a `batch_handler`, a worker leases up to `batch_size` jobs at once and
+    passes them as `[(app_id, final_attempt, bypass_cache), ...]`; it returns
+    `{app_id: exception or None}` so every job is completed or retried on its own.
+
+    Leases, completions and failures run on sessions of `session_factory`
+    (async sessions; the queue functions above are passed to `run_sync`).
+    While jobs are processed their leases are renewed every third of
+    `lease_seconds`: a batch whose postings fall back to single parses can take
+    longer than one lease.
+    """
+
+    def __init__(
+        self,
+        handler: Callable,
+        workers: int = None,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        poll_interval: float = None,
+        batch_handler: Callable = None,
+        batch_size: int = None,
+        lease_seconds: float = None,
+    ):
+        self.handler = handler
+        self.batch_handler = batch_handler
+        self.batch_size = (settings.PARSE_BATCH_SIZE if batch_size is None else batch_size) if batch_handler else 1
+        self.workers = settings.PARSE_WORKERS if workers is None else workers
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval or settings.PARSE_POLL_INTERVAL_SECONDS
+        self.lease_seconds = lease_seconds or settings.PARSE_LEASE_SECONDS
+        self._tasks = []
+        self._stopping = None
+
+    async def start(self):
+        self._stopping = asyncio.Event()
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._run(f"worker-{i}")))
+        if self.workers:
+            logger.info(f"👷 Started {self.workers} parse workers")
+
+    async def stop(self):
+        if self._stopping:
+            self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                jobs = await self._lease(worker_id)
+                if not jobs:
+                    await self._idle()
+                    continue
+                renewal = asyncio.create_task(self._renew(worker_id, [job[0] for job in jobs]))
+                try:
+                    if len(jobs) == 1:
+                        await self._process(*jobs[0])
+                    else:
+                        await self._process_batch(jobs)
+                finally:
+                    renewal.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Parse worker {worker_id} error: {e}")
+                await self._idle()
+
+    async def _idle(self):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _process(self, job_id: str, app_id: str, attempts: int, bypass_cache: bool):
+        final_attempt = attempts >= settings.PARSE_MAX_ATTEMPTS
+        try:
+            with metrics.in_flight():
+                if inspect.iscoroutinefunction(self.handler):
+                    await self.handler(app_id, final_attempt, bypass_cache=bypass_cache)
+                else:
+                    await asyncio.to_thread(self.handler, app_id, final_attempt, bypass_cache=bypass_cache)
+        except Exception as e:
+            retry = await self._fail(job_id, str(e))
+            if retry:
+                logger.warning(f"🔁 Parse of {app_id} failed (attempt {attempts}), retrying later")
+        else:
+            await self._complete(job_id)
+
+    async def _process_batch(self, jobs: list):
+        batch = [
+            (app_id, attempts >= settings.PARSE_MAX_ATTEMPTS, bypass_cache)
+            for _, app_id, attempts, bypass_cache in jobs
+        ]
+        try:
+            with metrics.in_flight(len(batch)):
+                errors = await self.batch_handler(batch)
+        except Exception as e:
+            errors = {app_id: e for app_id, _, _ in batch}
+
+        for job_id, app_id, attempts, _ in jobs:
+            error = errors.get(app_id)
+            if error is None:
+                await self._complete(job_id)
+            else:
+                retry = await self._fail(job_id, str(error))
+                if retry:
+                    logger.warning(f"🔁 Parse of {app_id} failed (attempt {attempts}), retrying later")
+
+    async def _renew(self, worker_id: str, job_ids: list):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.run_sync(renew_leases, job_ids, worker_id, lease_seconds=self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not renew parse leases of {worker_id}: {e}")
+
+    async def _lease(self, worker_id: str) -> list:
+        async with self.session_factory() as db:
+            jobs = await db.run_sync(lease_jobs, worker_id, limit=self.batch_size, lease_seconds=self.lease_seconds)
+            return [(job.id, job.application_id, job.attempts, job.bypass_cache) for job in jobs]
+
+    async def _complete(self, job_id: str):
+        async with self.session_factory() as db:
+            await db.run_sync(complete_job, job_id)
+
+    async def _fail(self, job_id: str, error: str) -> bool:
+        async with self.session_factory() as db:
+            return await db.run_sync(fail_job, job_id, error)
@@ -0,0 +1,322 @@
+"""
+Opt-in request profiling.
+
+A request is profiled when it is sampled (PROFILING_SAMPLE_RATE) or sends
+`X-Profile: 1` while PROFILING_ALLOW_HEADER is on. For a profiled request
+the SQL statements it runs are counted and timed (cursor events on the
+instrumented engine), its endpoint runs under a profiler and its
+serialization is timed. That is the time from the endpoint returning to the
+response starting (response model validation and JSON encoding) or, for an
+endpoint that returns a Response it built itself, the blocks it wraps in
+`serializing()`; such a Response without them has no serialize entry. The
+numbers go out as `Server-Timing` entries and, with the profiler output, to
+DATA_DIR/profiles/.
+
+Statements that repeat within one request are listed in the summary; many
+repeats of the same SELECT usually mean lazy relationship loads (N+1).
+"""
+import asyncio
+import cProfile
+import functools
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+def _pyinstrument_available() -> bool:
+    return importlib.util.find_spec("pyinstrument") is not None
+
+
+class RequestProfile:
+    """Timings of one profiled request; shared with the worker threads it runs on."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.handler = None
+        self.status = None
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.statements = Counter()
+        self.handler_seconds = None
+        self.handler_finished = None
+        self.response_started = None
+        self.prebuilt_response = False
+        self.inline_serialize_seconds = None
+        self.report = None  # (suffix, write(path)) from the endpoint's profiler
+        self._lock = threading.Lock()
+
+    def record_sql(self, statement: str, seconds: float):
+        with self._lock:
+            self.sql_count += 1
+            self.sql_seconds += seconds
+            self.statements[" ".join(statement.split())] += 1
+
+    def record_serialize(self, seconds: float):
+        with self._lock:
+            self.inline_serialize_seconds = (self.inline_serialize_seconds or 0.0) + seconds
+
+    @property
+    def serialize_seconds(self) -> Optional[float]:
+        if self.inline_serialize_seconds is not None:
+            return self.inline_serialize_seconds
+        # A prebuilt Response was serialized in the endpoint; the gap after it is only sending
+        if self.prebuilt_response or self.handler_finished is None or self.response_started is None:
+            return None
+        return max(0.0, self.response_started - self.handler_finished)
+
+    def repeated_statements(self, limit: int = 5) -> list:
+        with self._lock:
+            common = self.statements.most_common(limit)
+        return [{"statement": statement, "count": count} for statement, count in common if count > 1]
+
+    def server_timing(self) -> str:
+        entries = [f'sql;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} statements"']
+        if self.handler_seconds is not None:
+            entries.append(f"handler;dur={self.handler_seconds * 1000:.1f}")
+        if self.serialize_seconds is not None:
+            entries.append(f"serialize;dur={self.serialize_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+    def summary(self, total_seconds: float) -> dict:
+        def ms(seconds):
+            return round(seconds * 1000, 2) if seconds is not None else None
+
+        return {
+            "method": self.method,
+            "path": self.path,
+            "handler": self.handler,
+            "status": self.status,
+            "total_ms": ms(total_seconds),
+            "handler_ms": ms(self.handler_seconds),
+            "serialize_ms": ms(self.serialize_seconds),
+            "sql_count": self.sql_count,
+            "sql_ms": ms(self.sql_seconds),
+            "repeated_statements": self.repeated_statements(),
+        }
+
+
+def instrument_engine(engine):
+    """Count and time the statements of profiled requests on `engine`."""
+    if getattr(engine, "_vacancio_profiling", False):
+        return
+    engine._vacancio_profiling = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("_profiling_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _current.get()
+        started = conn.info.get("_profiling_started")
+        if profile is not None and started:
+            profile.record_sql(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("_profiling_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def _start_profiler(is_async: bool):
+    """A running profiler, or None if another one is already active (e.g. a concurrent profiled request)."""
+    try:
+        return _new_profiler(is_async)
+    except (ValueError, RuntimeError) as e:
+        logger.warning(f"⚠️ Request profiler not started: {e}")
+        return None
+
+
+def _new_profiler(is_async: bool):
+    if _pyinstrument_available():
+        from pyinstrument import Profiler
+
+        profiler = Profiler(async_mode="enabled" if is_async else "disabled")
+        profiler.start()
+        return profiler
+    # cProfile sees only this thread: for async endpoints, other tasks on the loop show up too
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler, profile: RequestProfile):
+    if profiler is None:
+        return
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        profile.report = (".prof", profiler.dump_stats)
+    else:
+        profiler.stop()
+
+        def write_html(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+
+        profile.report = (".html", write_html)
+
+
+@contextmanager
+def serializing():
+    """Time the block as the serialization of the profiled request, for endpoints that build their Response."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record_serialize(time.perf_counter() - started)
+
+
+def _handler_finished(profile: RequestProfile, started: float, profiler, result=None):
+    profile.handler_finished = time.perf_counter()
+    profile.handler_seconds = profile.handler_finished - started
+    profile.prebuilt_response = isinstance(result, Response)
+    _stop_profiler(profiler, profile)
+
+
+def _profiled_endpoint(endpoint):
+    """Time `endpoint` (and run it under a profiler) when the request is being profiled."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            profiler = _start_profiler(is_async=True)
+            started = time.perf_counter()
+            result = None
+            try:
+                result = await endpoint(*args, **kwargs)
+                return result
+            finally:
+                _handler_finished(profile, started, profiler, result)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            profiler = _start_profiler(is_async=False)
+            started = time.perf_counter()
+            result = None
+            try:
+                result = endpoint(*args, **kwargs)
+                return result
+            finally:
+                _handler_finished(profile, started, profiler, result)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose endpoint reports its own time to the request profile; routers use it as `route_class`."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _profiled_endpoint(endpoint), **kwargs)
+
+
+def _should_profile(scope) -> bool:
+    if settings.PROFILING_ALLOW_HEADER:
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER.encode() and value.decode().lower() in ("1", "true", "yes"):
+                return True
+    return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def _write_report(profile: RequestProfile, summary: dict):
+    directory = os.path.join(settings.DATA_DIR, "profiles")
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    base = os.path.join(directory, f"{stamp}-{re.sub(r'[^A-Za-z0-9_]+', '_', profile.handler or 'unmatched')}")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    if profile.report:
+        suffix, write = profile.report
+        write(base + suffix)
+    _prune(directory)
+
+
+def _prune(directory: str):
+    """Keep the newest PROFILING_MAX_REPORTS reports (a summary and its profiler output each)."""
+    summaries = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    for name in summaries[:max(0, len(summaries) - settings.PROFILING_MAX_REPORTS)]:
+        stem = name[:-len(".json")]
+        for suffix in (".json", ".prof", ".html"):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles sampled (or `X-Profile`) requests as described above."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                profile.response_started = time.perf_counter()
+                profile.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            profile.handler = getattr(scope.get("route"), "name", None)
+            summary = profile.summary(time.perf_counter() - profile.started)
+            repeats = summary["repeated_statements"]
+            logger.info(
+                f"🔬 {profile.method} {profile.path}: {summary['total_ms']} ms, "
+                f"{profile.sql_count} SQL ({summary['sql_ms']} ms), serialize {summary['serialize_ms']} ms"
+            )
+            if repeats and repeats[0]["count"] >= settings.PROFILING_REPEAT_WARNING:
+                logger.warning(
+                    f"⚠️ {profile.method} {profile.path} ran one statement {repeats[0]['count']} times "
+                    f"(N+1?): {repeats[0]['statement'][:200]}"
+                )
+            try:
+                await asyncio.to_thread(_write_report, profile, summary)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write request profile: {e}")
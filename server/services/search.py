@@ -0,0 +1,80 @@
+"""
+Ranked full-text search over applications (see database/search_index.py).
+
+Every word of the query must match, as a prefix, in any indexed column.
+Company and position weigh most, then tech stack and location, then the long
+text columns. Snippets are HTML-escaped with matches wrapped in <mark>.
+"""
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import crud, schemas, search_index
+
+DEFAULT_LIMIT = 20
+SNIPPET_TOKENS = 16
+
+_TOKEN = re.compile(r"\w+")
+# Private-use characters: absent from real postings and untouched by html.escape
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+
+def query_tokens(q: str) -> List[str]:
+    return _TOKEN.findall(q or "")
+
+
+def search_applications(db: Session, q: str, profile_id: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> List[dict]:
+    """
+    Applications matching `q`, best first, as dicts with the application
+    (summary columns only), its `rank` (higher is better) and a `snippet`.
+    """
+    tokens = query_tokens(q)
+    if not tokens:
+        return []
+
+    params = {"limit": limit, "profile_id": profile_id}
+    profile_filter = "AND applications.profile_id = :profile_id" if profile_id else ""
+    if db.get_bind().dialect.name == "sqlite":
+        params["match"] = " ".join(f'"{token}"*' for token in tokens)
+        params["rank"] = f"bm25({', '.join(str(weight) for weight in search_index.FTS_WEIGHTS)})"
+        if profile_id:
+            profile_filter = "AND application_id IN (SELECT id FROM applications WHERE profile_id = :profile_id)"
+        statement = f"""
+            SELECT application_id, -rank,
+                   snippet({search_index.FTS_TABLE}, -1, '{_MARK_START}', '{_MARK_END}', '…', {SNIPPET_TOKENS})
+            FROM {search_index.FTS_TABLE}
+            WHERE {search_index.FTS_TABLE} MATCH :match AND rank MATCH :rank {profile_filter}
+            ORDER BY rank
+            LIMIT :limit
+        """
+    else:
+        params["query"] = " & ".join(f"{token}:*" for token in tokens)
+        headline_options = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords={SNIPPET_TOKENS}, MinWords=5, MaxFragments=1"
+        statement = f"""
+            SELECT applications.id, ts_rank_cd(search_vector, query) AS rank,
+                   ts_headline('simple', concat_ws(' ', company, position, location, description), query, '{headline_options}')
+            FROM applications, to_tsquery('simple', :query) AS query
+            WHERE search_vector @@ query {profile_filter}
+            ORDER BY rank DESC
+            LIMIT :limit
+        """
+
+    hits = db.execute(text(statement), params).all()
+    columns = list(schemas.JobApplicationSummary.model_fields)
+    applications = crud.get_applications_by_ids(db, [app_id for app_id, _, _ in hits], columns=columns)
+    by_id = {application.id: application for application in applications}
+    return [
+        {"application": by_id[app_id], "rank": rank, "snippet": _snippet_html(snippet)}
+        for app_id, rank, snippet in hits
+        if app_id in by_id
+    ]
+
+
+def _snippet_html(snippet: Optional[str]) -> Optional[str]:
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
@@ -0,0 +1,127 @@
+"""
+The application_skills index: one row per normalized technology of an
+application's tech_stack ("required") and nice_to_have_stack ("nice_to_have").
+
+ORM writes (create, update, parse, delete) are synced from a Session
+after_flush hook; bulk inserts (import) call `replace_skills` themselves.
+Rebuild the whole table after changing normalization rules with:
+
+    cd server && python -m services.skills
+"""
+import logging
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from database import models
+from services.job_parser.validator import normalize_technology
+
+logger = logging.getLogger(__name__)
+
+REQUIRED = "required"
+NICE_TO_HAVE = "nice_to_have"
+
+MAX_SKILL_LENGTH = 100
+BACKFILL_BATCH_SIZE = 1000
+
+_STACK_COLUMNS = {REQUIRED: "tech_stack", NICE_TO_HAVE: "nice_to_have_stack"}
+
+
+def normalize_skills(values: Optional[Iterable[str]]) -> List[str]:
+    """Canonical, de-duplicated skill names in their original order."""
+    skills = []
+    for value in values or []:
+        if not isinstance(value, str):
+            continue
+        skill = (normalize_technology(value) or "")[:MAX_SKILL_LENGTH]
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def skill_rows(application_id: str, tech_stack, nice_to_have_stack) -> List[dict]:
+    stacks = {REQUIRED: tech_stack, NICE_TO_HAVE: nice_to_have_stack}
+    return [
+        {"application_id": application_id, "kind": kind, "skill": skill}
+        for kind, values in stacks.items()
+        for skill in normalize_skills(values)
+    ]
+
+
+def replace_skills(connection, stacks: Dict[str, Tuple[list, list]]):
+    """Rewrite the skill rows of {application_id: (tech_stack, nice_to_have_stack)}."""
+    if not stacks:
+        return
+    Skill = models.ApplicationSkill
+    connection.execute(delete(Skill).where(Skill.application_id.in_(list(stacks))))
+    rows = list(chain.from_iterable(skill_rows(app_id, *pair) for app_id, pair in stacks.items()))
+    if rows:
+        connection.execute(insert(Skill), rows)
+
+
+def backfill(connection, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Rebuild application_skills from every application; returns the number of applications."""
+    App = models.JobApplication
+    connection.execute(delete(models.ApplicationSkill))
+    done = 0
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            select(App.id, App.tech_stack, App.nice_to_have_stack)
+            .where(App.id > last_id)
+            .order_by(App.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return done
+        skill_batch = list(chain.from_iterable(skill_rows(*row) for row in rows))
+        if skill_batch:
+            connection.execute(insert(models.ApplicationSkill), skill_batch)
+        done += len(rows)
+        last_id = rows[-1][0]
+
+
+def top_skills(db: Session, profile_id: Optional[str] = None, kind: str = REQUIRED, limit: int = 20) -> List[dict]:
+    """Most frequent skills as [{"name", "count"}], for one profile or all applications."""
+    Skill = models.ApplicationSkill
+    query = db.query(Skill.skill, func.count()).filter(Skill.kind == kind)
+    if profile_id:
+        query = query.join(models.JobApplication, models.JobApplication.id == Skill.application_id).filter(
+            models.JobApplication.profile_id == profile_id
+        )
+    rows = query.group_by(Skill.skill).order_by(func.count().desc(), Skill.skill).limit(limit)
+    return [{"name": name, "count": count} for name, count in rows]
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_application_skills(session, flush_context):
+    stacks = {}
+    deleted = []
+    for obj in chain(session.new, session.dirty):
+        if not isinstance(obj, models.JobApplication):
+            continue
+        state = inspect(obj)
+        if obj in session.new or any(state.attrs[column].history.has_changes() for column in _STACK_COLUMNS.values()):
+            stacks[obj.id] = (obj.tech_stack, obj.nice_to_have_stack)
+    for obj in session.deleted:
+        if isinstance(obj, models.JobApplication):
+            deleted.append(obj.id)
+
+    if not (stacks or deleted):
+        return
+    connection = session.connection()
+    if deleted:
+        Skill = models.ApplicationSkill
+        connection.execute(delete(Skill).where(Skill.application_id.in_(deleted)))
+    replace_skills(connection, stacks)
+
+
+if __name__ == "__main__":
+    from core.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        count = backfill(connection)
+    logger.info(f"🧩 Rebuilt skills for {count} applications")
@@ -1,3 +1,19 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Parse jobs are driven explicitly in tests instead of by the lifespan worker pool
+os.environ["PARSE_WORKERS"] = "0"
+
+# The engines are built from settings at import time, and the client's lifespan
+# (create_all, migrations, orphan recovery) runs on them: keep both off data/
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="vacancio-tests-")
+atexit.register(shutil.rmtree, TEST_DATA_DIR, ignore_errors=True)
+os.environ["DATA_DIR"] = TEST_DATA_DIR
+os.environ["UPLOAD_DIR"] = os.path.join(TEST_DATA_DIR, "uploads")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DATA_DIR, 'vacancio.db')}"
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -5,7 +21,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from main import app
-from core.database import Base, get_db
+from routers import applications
+from core.database import Base, SyncSessionAdapter, get_async_db, get_db
+from database import models
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -16,6 +34,14 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_sessions(factory):
+    """Factory of AsyncSession stand-ins over the sync sessions of `factory`."""
+    return lambda: SyncSessionAdapter(factory())
+
+
+TestingAsyncSessionLocal = async_sessions(TestingSessionLocal)
+
 @pytest.fixture(scope="function")
 def db_session():
     """
@@ -33,9 +59,10 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, monkeypatch):
     """
     Dependency override to use the testing database session.
+    Sessions the app opens itself (background parses, streamed responses) get it too.
     """
     def override_get_db():
         try:
@@ -44,8 +71,45 @@ def client(db_session):
             pass
             
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = lambda: SyncSessionAdapter(db_session)
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
     
     with TestClient(app) as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
+
+@pytest.fixture
+def test_profile(db_session):
+    profile = models.Profile(name="Test User App")
+    db_session.add(profile)
+    db_session.commit()
+    db_session.refresh(profile)
+    return profile
+
+@pytest.fixture
+def test_resume(db_session, test_profile):
+    resume = models.Resume(
+        name="Resume.pdf", 
+        version=1, 
+        file_path="/tmp/Resume.pdf", 
+        profile_id=test_profile.id
+    )
+    db_session.add(resume)
+    db_session.commit()
+    db_session.refresh(resume)
+    return resume
+
+@pytest.fixture
+def fake_openrouter(monkeypatch):
+    """
+    Local OpenRouter stub; both the sync and async parsers are pointed at it.
+    """
+    from core.config import settings
+    from tests.fake_openrouter import FakeOpenRouter
+
+    server = FakeOpenRouter().start()
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "OPENROUTER_BASE_URL", server.url)
+    yield server
+    server.stop()
@@ -0,0 +1,109 @@
+"""Local stand-in for the OpenRouter chat completions API"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_JOB = {
+    "job_title": "Senior Python Developer",
+    "company": "TechCorp",
+    "location": "Warszawa",
+    "work_mode": "Remote",
+    "employment_type": "B2B contract",
+    "seniority": "senior",
+    "salary": {"min": 20000, "max": 28000, "currency": "pln", "unit": "monthly", "gross_net": "net"},
+    "stack": ["python", "FastAPI", "postgresql"],
+    "nice_to_have_stack": ["docker"],
+    "requirements": ["5+ years of Python"],
+    "responsibilities": ["Build APIs"],
+    "project_description": "Fintech platform",
+}
+
+
+def completion(content: str, usage: dict = None) -> dict:
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+    if usage:
+        body["usage"] = usage
+    return body
+
+
+class FakeOpenRouter:
+    """
+    Threaded HTTP/1.1 server answering `POST /chat/completions`.
+    `responder(payload) -> (status, body)` customises replies; `latency`
+    delays every response. Requests and client connections are recorded.
+    `"stream": true` requests get the completion content as SSE deltas of
+    `chunk_size` characters, `chunk_delay` seconds apart.
+    """
+
+    def __init__(self, responder=None, latency: float = 0.0, chunk_size: int = 16, chunk_delay: float = 0.0):
+        self.responder = responder or (lambda payload: (200, completion(json.dumps(DEFAULT_JOB))))
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests.append(payload)
+                    fake.connections.add(self.client_address)
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                status, body = fake.responder(payload)
+                if payload.get("stream") and status == 200 and isinstance(body, dict):
+                    self._stream(body["choices"][0]["message"]["content"])
+                    return
+                data = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, content):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+                for start in range(0, len(content), fake.chunk_size):
+                    delta = {"choices": [{"delta": {"content": content[start:start + fake.chunk_size]}}]}
+                    self.wfile.write(f"data: {json.dumps(delta)}\n\n".encode())
+                    self.wfile.flush()
+                    if fake.chunk_delay:
+                        time.sleep(fake.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from services.job_parser.ai.client import close_client, get_client
+from services.job_parser.ai.parser import parse_with_ai, parse_with_ai_async
+
+
+def test_parse_with_ai_async_against_stub(fake_openrouter):
+    async def run():
+        try:
+            return await parse_with_ai_async("Job text", source_url="https://justjoin.it/offers/1")
+        finally:
+            await close_client()
+
+    job = asyncio.run(run())
+
+    assert job.job_title == "Senior Python Developer"
+    assert job.location == "Warszawa"
+    assert job.work_mode.value == "remote"
+    assert job.employment_type.value == "b2b"
+    assert job.salary.currency.value == "PLN"
+    assert job.stack == ["Python", "FastAPI", "PostgreSQL"]
+    assert job.source == "justjoin"
+
+    payload = fake_openrouter.requests[0]
+    assert payload["model"] == "openai/gpt-4o-mini"
+    assert "Job text" in payload["messages"][0]["content"]
+
+
+def test_sync_parse_uses_configured_base_url(fake_openrouter):
+    job = parse_with_ai("Job text")
+    assert job.company == "TechCorp"
+    assert len(fake_openrouter.requests) == 1
+
+
+def test_concurrent_parses_share_pooled_connections(fake_openrouter):
+    fake_openrouter.latency = 0.2
+
+    async def run():
+        try:
+            for _ in range(2):
+                await asyncio.gather(*(parse_with_ai_async(f"Job {i}") for i in range(20)))
+        finally:
+            await close_client()
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert len(fake_openrouter.requests) == 40
+    # Two waves of 20 in-flight requests, not 40 sequential round-trips
+    assert elapsed < 2.0
+    # The second wave reuses the keep-alive connections of the first
+    assert len(fake_openrouter.connections) <= 20
+
+
+def test_per_request_timeout(fake_openrouter):
+    fake_openrouter.latency = 0.5
+
+    async def run():
+        try:
+            await parse_with_ai_async("Job text", timeout=0.05)
+        finally:
+            await close_client()
+
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(run())
+
+
+def test_http_error_raises_value_error(fake_openrouter):
+    fake_openrouter.responder = lambda payload: (502, {"error": "bad gateway"})
+
+    async def run():
+        try:
+            await parse_with_ai_async("Job text")
+        finally:
+            await close_client()
+
+    with pytest.raises(ValueError, match="API request failed"):
+        asyncio.run(run())
+
+
+def test_client_is_shared_within_a_loop():
+    async def run():
+        try:
+            return get_client() is get_client()
+        finally:
+            await close_client()
+
+    assert asyncio.run(run())
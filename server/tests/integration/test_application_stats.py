@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from database import models
+from services import application_stats
+
+
+@pytest.fixture(autouse=True)
+def clear_stats_cache():
+    application_stats.invalidate()
+    yield
+    application_stats.invalidate()
+
+
+def _add(db_session, profile, resume, **fields):
+    app = models.JobApplication(
+        profile_id=profile.id,
+        resume_id=resume.id,
+        resume_version=resume.version,
+        **{"company": "Comp", "position": "Dev", **fields},
+    )
+    db_session.add(app)
+    db_session.commit()
+    return app
+
+
+@pytest.fixture
+def apps(db_session, test_profile, test_resume):
+    monday = datetime(2026, 10, 5, 12, 0)
+    S = models.ApplicationStatus
+    specs = [
+        dict(status=S.interview, source="justjoin", seniority=models.Seniority.senior, work_mode="remote",
+             tech_stack=["Python", "FastAPI"], description="x", requirements=["a"], responsibilities=["b"],
+             applied_at=monday, responded_at=monday + timedelta(days=2)),
+        dict(status=S.offer, source="justjoin", tech_stack=["Python"],
+             applied_at=monday + timedelta(days=3), responded_at=monday + timedelta(days=7)),
+        dict(status=S.rejected, source=None, tech_stack=["Go", "Python"],
+             applied_at=monday + timedelta(days=8), responded_at=monday + timedelta(days=9)),
+        dict(status=S.no_response, source="linkedin", applied_at=monday + timedelta(days=9)),
+    ]
+    return [_add(db_session, test_profile, test_resume, **spec) for spec in specs]
+
+
+def test_stats_aggregates_in_sql(client, apps, test_profile):
+    response = client.get(f"/applications/stats?profile_id={test_profile.id}")
+    assert response.status_code == 200
+    stats = response.json()
+
+    assert stats["total"] == 4
+    # rejected counts as responded because responded_at is set, like the dashboard did
+    assert stats["responded"] == 3
+    assert stats["interviews"] == 2
+    assert stats["offers"] == 1
+    assert stats["response_rate"] == 75
+    assert stats["interview_rate"] == 67
+    assert stats["median_days_to_response"] == 2.0
+    assert stats["by_status"] == {"interview": 1, "offer": 1, "rejected": 1, "no_response": 1}
+    assert stats["by_source"] == {"justjoin": 2, "other": 1, "linkedin": 1}
+    assert stats["by_seniority"] == {"senior": 1, "unknown": 3}
+    assert stats["by_week"] == [{"week": "2026-10-05", "count": 2}, {"week": "2026-10-12", "count": 2}]
+    assert stats["top_tech_stack"][0] == {"name": "Python", "count": 3}
+    assert {"name": "Go", "count": 1} in stats["top_tech_stack"]
+    assert stats["missing"] == {"description": 3, "requirements": 3, "responsibilities": 3, "tech_stack": 1}
+    assert stats["incomplete"] == 3
+
+
+def test_stats_are_cached_until_a_write(client, db_session, apps, test_profile, test_resume):
+    assert client.get("/applications/stats").json()["total"] == 4
+
+    # Cached: a change made behind the ORM is not seen...
+    db_session.connection().exec_driver_sql("UPDATE applications SET status = 'offer'")
+    assert client.get("/applications/stats").json()["offers"] == 1
+
+    # ...until an ORM write to applications commits
+    _add(db_session, test_profile, test_resume)
+    stats = client.get("/applications/stats").json()
+    assert stats["total"] == 5
+    assert stats["offers"] == 4
+
+
+def test_stats_invalidated_by_api_writes(client, apps, test_profile):
+    client.get(f"/applications/stats?profile_id={test_profile.id}")
+    client.put(f"/applications/{apps[3].id}", json={"status": "offer"})
+    assert client.get(f"/applications/stats?profile_id={test_profile.id}").json()["offers"] == 2
+
+    client.delete(f"/applications/{apps[3].id}")
+    assert client.get("/applications/stats").json()["total"] == 3
+
+
+def test_stats_invalidated_by_bulk_import(client, apps, test_profile):
+    client.get(f"/applications/stats?profile_id={test_profile.id}")
+    files = {"file": ("apps.json", b'[{"url": "https://example.com/new", "company": "New"}]', "application/json")}
+    client.post("/applications/import/json", files=files)
+    assert client.get(f"/applications/stats?profile_id={test_profile.id}").json()["total"] == 5
+
+
+def test_stats_for_empty_profile(client):
+    stats = client.get("/applications/stats?profile_id=nobody").json()
+    assert stats["total"] == 0
+    assert stats["response_rate"] == 0
+    assert stats["median_days_to_response"] is None
+    assert stats["top_tech_stack"] == []
@@ -1,33 +1,10 @@
 from fastapi.testclient import TestClient
 import pytest
+from sqlalchemy import event
 from database import models
 from routers import applications
 
-@pytest.fixture
-def test_profile(db_session):
-    profile = models.Profile(name="Test User App")
-    db_session.add(profile)
-    db_session.commit()
-    db_session.refresh(profile)
-    return profile
-
-@pytest.fixture
-def test_resume(db_session, test_profile):
-    resume = models.Resume(
-        name="Resume.pdf", 
-        version=1, 
-        file_path="/tmp/Resume.pdf", 
-        profile_id=test_profile.id
-    )
-    db_session.add(resume)
-    db_session.commit()
-    db_session.refresh(resume)
-    return resume
-
-def test_create_application_success(client: TestClient, db_session, test_profile, test_resume, mocker):
-    # Mock the background task
-    mock_bg = mocker.patch("routers.applications.process_application_background")
-
+def test_create_application_success(client: TestClient, db_session, test_profile, test_resume):
     payload = {
         "profile_id": test_profile.id,
         "resume_id": test_resume.id,
@@ -47,9 +24,9 @@ def test_create_application_success(client: TestClient, db_session, test_profile
     assert data["position"] == "Test Position"
     assert data["status"] == "parsing"
 
-    mock_bg.assert_called_once()
-    args, _ = mock_bg.call_args
-    assert args[0] == data["id"]
+    job = db_session.query(models.ParseJob).filter_by(application_id=data["id"]).first()
+    assert job is not None
+    assert job.status == models.ParseJobStatus.queued
 
 def test_read_applications(client: TestClient, db_session, test_profile, test_resume):
     app1 = models.JobApplication(
@@ -134,3 +111,171 @@ def test_update_application_status(client: TestClient, db_session, test_profile,
 
     db_session.refresh(app1)
     assert app1.status == models.ApplicationStatus.interview
+
+def _add_apps(db_session, test_profile, test_resume, specs):
+    apps = []
+    for spec in specs:
+        app = models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            **{"position": "Pos", "status": models.ApplicationStatus.no_response, **spec}
+        )
+        db_session.add(app)
+        apps.append(app)
+    db_session.commit()
+    return apps
+
+def test_keyset_pagination_walks_all_rows(client: TestClient, db_session, test_profile, test_resume):
+    # Same-second server defaults: ordering has to fall back to the id tie-breaker
+    _add_apps(db_session, test_profile, test_resume, [{"company": f"Comp {i}"} for i in range(7)])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/applications/", params=params)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "7"
+        seen += [d["id"] for d in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 7
+
+def test_keyset_pagination_by_applied_at(client: TestClient, db_session, test_profile, test_resume):
+    from datetime import datetime, timedelta
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    _add_apps(db_session, test_profile, test_resume, [
+        {"company": f"Comp {i}", "applied_at": base + timedelta(days=i)} for i in range(5)
+    ])
+
+    first = client.get("/applications/", params={"limit": 2})
+    assert [d["company"] for d in first.json()] == ["Comp 4", "Comp 3"]
+    second = client.get("/applications/", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [d["company"] for d in second.json()] == ["Comp 2", "Comp 1"]
+
+    ascending = client.get("/applications/", params={"limit": 10, "order": "asc"})
+    assert [d["company"] for d in ascending.json()] == [f"Comp {i}" for i in range(5)]
+    assert "X-Next-Cursor" not in ascending.headers
+
+def test_keyset_pagination_with_tied_applied_at(client: TestClient, db_session, test_profile, test_resume):
+    from datetime import datetime, timedelta
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    same = datetime(2025, 1, 3, 9, 0, 0)
+    # Zero microseconds: SQLite stores the ORM's value as "... 09:00:00.000000"
+    _add_apps(db_session, test_profile, test_resume, [
+        *({"company": f"C{i}", "applied_at": base + timedelta(days=i)} for i in range(5)),
+        *({"company": f"Same{i}", "applied_at": same} for i in range(3)),
+        # Server defaults are stored without microseconds
+        *({"company": f"Default{i}"} for i in range(2)),
+    ])
+
+    def walk(order):
+        seen = []
+        cursor = None
+        for _ in range(20):
+            params = {"limit": 2, "order": order}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/applications/", params=params)
+            assert response.status_code == 200
+            seen += [d["company"] for d in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen
+        raise AssertionError(f"{order} pagination never ended: {seen}")
+
+    descending = walk("desc")
+    assert sorted(descending) == sorted([f"C{i}" for i in range(5)] + [f"Same{i}" for i in range(3)]
+                                        + ["Default0", "Default1"])
+    assert walk("asc") == descending[::-1]
+
+def test_server_side_filters(client: TestClient, db_session, test_profile, test_resume):
+    from datetime import datetime
+    _add_apps(db_session, test_profile, test_resume, [
+        {"company": "Acme Corp", "source": "justjoin", "work_mode": "remote", "is_favorite": True,
+         "seniority": models.Seniority.senior, "applied_at": datetime(2025, 3, 1)},
+        {"company": "Globex", "source": "linkedin", "work_mode": "onsite", "is_archived": True,
+         "status": models.ApplicationStatus.rejected, "applied_at": datetime(2025, 1, 1)},
+        {"company": "Initech", "source": "justjoin", "work_mode": "hybrid",
+         "seniority": models.Seniority.junior, "applied_at": datetime(2025, 2, 1)},
+    ])
+
+    def companies(**params):
+        response = client.get("/applications/", params=params)
+        assert response.status_code == 200, response.text
+        assert response.headers["X-Total-Count"] == str(len(response.json()))
+        return sorted(d["company"] for d in response.json())
+
+    assert companies(source="justjoin") == ["Acme Corp", "Initech"]
+    assert companies(status=["rejected", "interview"]) == ["Globex"]
+    assert companies(is_archived="false") == ["Acme Corp", "Initech"]
+    assert companies(is_favorite="true") == ["Acme Corp"]
+    assert companies(seniority="junior") == ["Initech"]
+    assert companies(work_mode=["remote", "onsite"]) == ["Acme Corp", "Globex"]
+    assert companies(company="acme") == ["Acme Corp"]
+    assert companies(applied_from="2025-01-15T00:00:00", applied_to="2025-02-15T00:00:00") == ["Initech"]
+    assert companies(sort_by="company", order="asc") == ["Acme Corp", "Globex", "Initech"]
+
+def test_invalid_cursor_is_rejected(client: TestClient):
+    response = client.get("/applications/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+@pytest.fixture
+def captured_sql(db_session):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+def test_summary_view_skips_long_text_columns(client: TestClient, db_session, test_profile, test_resume, captured_sql):
+    _add_apps(db_session, test_profile, test_resume, [
+        {"company": "Comp", "description": "Long text", "raw_data": "x" * 10000}
+    ])
+    db_session.expunge_all()
+    captured_sql.clear()
+
+    response = client.get("/applications/?view=summary")
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["company"] == "Comp"
+    assert "raw_data" not in data[0] and "description" not in data[0]
+    assert response.headers["X-Total-Count"] == "1"
+
+    list_query = next(s for s in captured_sql if "LIMIT" in s)
+    assert "raw_data" not in list_query and "description" not in list_query
+
+    # Default and detail keep everything
+    assert client.get("/applications/").json()[0]["raw_data"] == "x" * 10000
+    assert client.get(f"/applications/{data[0]['id']}").json()["description"] == "Long text"
+
+def test_fields_projection_pages_with_cursor(client: TestClient, db_session, test_profile, test_resume):
+    _add_apps(db_session, test_profile, test_resume, [{"company": f"Comp {i}"} for i in range(3)])
+
+    response = client.get("/applications/?fields=company,status&sort_by=company&order=asc&limit=2")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": response.json()[0]["id"], "company": "Comp 0", "status": "no_response"},
+        {"id": response.json()[1]["id"], "company": "Comp 1", "status": "no_response"},
+    ]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/applications/?fields=company&sort_by=company&order=asc&limit=2&cursor={cursor}")
+    assert [item["company"] for item in response.json()] == ["Comp 2"]
+
+def test_unknown_fields_are_rejected(client: TestClient):
+    response = client.get("/applications/?fields=company,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
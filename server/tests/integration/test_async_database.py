@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+import httpx
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.migration import ALEMBIC_INI
+from core.database import (
+    RoutingSession,
+    async_url,
+    create_async_session_factory,
+    create_engines,
+    create_session_factory,
+    get_async_db,
+)
+from database import models
+from main import app
+from routers import applications
+from services import parse_queue
+from services.parse_queue import ParseWorkerPool
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """The app on a managed SQLite file through aiosqlite, as it runs outside tests."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine, read_engine = create_engines(url)
+    models.Base.metadata.create_all(bind=engine)
+    async_engine, async_read_engine = create_engines(async_url(url), create=create_async_engine)
+    factory = create_async_session_factory(async_engine, async_read_engine)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    monkeypatch.setattr(applications, "AsyncSessionLocal", factory)
+    yield create_session_factory(engine, read_engine), factory, (async_engine, async_read_engine)
+    app.dependency_overrides.pop(get_async_db, None)
+    engine.dispose()
+    read_engine.dispose()
+
+
+@pytest.fixture
+def resume(databases):
+    sync_factory, _, _ = databases
+    with sync_factory() as db:
+        profile = models.Profile(name="Async")
+        db.add(profile)
+        db.flush()
+        resume = models.Resume(profile_id=profile.id, name="cv.pdf", version=1, file_path="cv.pdf")
+        db.add(resume)
+        db.commit()
+        return {"profile_id": profile.id, "resume_id": resume.id, "resume_version": resume.version}
+
+
+def _run(databases, coro_fn):
+    async def run():
+        try:
+            return await coro_fn()
+        finally:
+            for bind in set(databases[2]):
+                await bind.dispose()
+    return asyncio.run(run())
+
+
+def test_async_urls_use_async_drivers():
+    assert async_url("sqlite:///data/vacancio.db") == "sqlite+aiosqlite:///data/vacancio.db"
+    assert async_url("postgresql://user:secret@db/vacancio") == "postgresql+asyncpg://user:secret@db/vacancio"
+
+
+def test_async_sessions_route_reads_like_sync_ones(databases):
+    _, factory, _ = databases
+    assert factory.kw["sync_session_class"] is RoutingSession
+
+
+def test_concurrent_requests_on_the_async_engine(databases, resume):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            creates = [
+                client.post("/applications/", json={**resume, "raw_data": f"Posting {i}"})
+                for i in range(20)
+            ]
+            lists = [client.get("/applications/", params={"profile_id": resume["profile_id"]}) for _ in range(20)]
+            responses = await asyncio.gather(*creates, *lists)
+            assert [r.status_code for r in responses] == [200] * 40
+
+            created = responses[0].json()
+            # raw_data is a lazy relationship; it must be loaded before the session is left
+            detail = await client.get(f"/applications/{created['id']}")
+            assert detail.json()["raw_data"] == "Posting 0"
+
+            async with client.stream("GET", "/applications/export/json", params={"format": "ndjson"}) as response:
+                body = b"".join([chunk async for chunk in response.aiter_bytes()])
+            return [json.loads(line) for line in body.splitlines()]
+
+    exported = _run(databases, scenario)
+    assert len(exported) == 20
+
+
+def test_worker_pool_on_the_async_engine(databases, resume):
+    sync_factory, factory, _ = databases
+    with sync_factory() as db:
+        apps = [models.JobApplication(**resume, company="Parsing...", position="Parsing...", raw_data=f"Job {i}") for i in range(6)]
+        db.add_all(apps)
+        db.commit()
+        app_ids = [app.id for app in apps]
+        parse_queue.enqueue_many(db, app_ids)
+
+    handled = []
+
+    def handler(app_id, final_attempt, bypass_cache=False):
+        handled.append(app_id)
+
+    def remaining():
+        with sync_factory() as db:
+            return db.query(models.ParseJob).count()
+
+    async def scenario():
+        pool = ParseWorkerPool(handler, workers=3, session_factory=factory, poll_interval=0.01)
+        await pool.start()
+        for _ in range(200):
+            if not await asyncio.to_thread(remaining):
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+    _run(databases, scenario)
+    assert sorted(handled) == sorted(app_ids)
+    assert remaining() == 0
+
+
+def test_server_startup_opens_no_second_sqlite_writer(tmp_path):
+    """Startup migrates and recovers through the async writer; the lazy sync engines are never built."""
+    script = textwrap.dedent("""
+        from fastapi.testclient import TestClient
+        from core import database
+        from main import app
+
+        with TestClient(app) as client:
+            assert client.get("/applications/").status_code == 200
+        assert not database.sync_engines_built()
+    """)
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'app.db'}",
+        "DATA_DIR": str(tmp_path / "data"),
+        "UPLOAD_DIR": str(tmp_path / "data" / "uploads"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=os.path.dirname(ALEMBIC_INI), env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+    with sqlite3.connect(tmp_path / "app.db") as conn:
+        [(revision,)] = conn.execute("SELECT version_num FROM alembic_version").fetchall()
+    assert revision == ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def test_client_lifespan_stays_off_the_data_directory(client):
+    """The test client's startup migrates a temporary database and starts no parse workers."""
+    from core.database import async_engine
+    from tests.conftest import TEST_DATA_DIR
+
+    assert async_engine.url.database == os.path.join(TEST_DATA_DIR, "vacancio.db")
+    assert os.path.exists(async_engine.url.database)
+    assert client.app.state.parse_pool._tasks == []
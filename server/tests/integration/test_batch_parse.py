@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+import pytest
+from core.database import SyncSessionAdapter
+from database import models
+from routers import applications
+from services.job_parser.ai.client import close_client
+from services.job_parser.ai.parser import parse_batch_with_ai_async
+from tests.fake_openrouter import DEFAULT_JOB, completion
+from tests.conftest import async_sessions
+
+
+def _batch_responder(entries):
+    """Answer batch prompts with `entries`, single prompts with DEFAULT_JOB."""
+    def respond(payload):
+        content = payload["messages"][0]["content"]
+        if "### JOB" in content:
+            return 200, completion(json.dumps(entries))
+        return 200, completion(json.dumps(DEFAULT_JOB))
+    return respond
+
+
+def _run(coro_fn, *args, **kwargs):
+    async def run():
+        try:
+            return await coro_fn(*args, **kwargs)
+        finally:
+            await close_client()
+    return asyncio.run(run())
+
+
+def test_create_batch_inserts_rows_and_jobs(client, db_session, test_profile, test_resume):
+    items = [
+        {
+            "profile_id": test_profile.id,
+            "resume_id": test_resume.id,
+            "resume_version": test_resume.version,
+            "url": f"https://example.com/job/{i}",
+            "raw_data": f"Posting {i}",
+        }
+        for i in range(3)
+    ]
+    response = client.post("/applications/batch", json={"items": items})
+    assert response.status_code == 200, response.text
+    data = response.json()
+
+    assert [d["url"] for d in data] == [item["url"] for item in items]
+    assert all(d["status"] == "parsing" for d in data)
+    assert db_session.query(models.ParseJob).count() == 3
+
+
+def test_create_batch_rejects_empty(client):
+    response = client.post("/applications/batch", json={"items": []})
+    assert response.status_code == 422
+
+
+def test_batch_results_are_matched_by_index(fake_openrouter):
+    entries = [
+        dict(DEFAULT_JOB, index=1, company="Second"),
+        dict(DEFAULT_JOB, index=0, company="First"),
+        dict(DEFAULT_JOB, index=2, salary={"min": 5, "max": 1}),
+    ]
+    fake_openrouter.responder = _batch_responder(entries)
+
+    results = _run(parse_batch_with_ai_async, ["a", "b", "c"], source_urls=[None, "https://justjoin.it/1", None])
+
+    assert results[0].company == "First"
+    assert results[1].company == "Second"
+    assert results[1].source == "justjoin"
+    # Invalid salary range fails validation for that entry only
+    assert results[2] is None
+
+    content = fake_openrouter.requests[0]["messages"][0]["content"]
+    assert content.count("CRITICAL RULES") == 1
+    assert "### JOB 2\nc" in content
+
+
+def test_malformed_batch_response_raises(fake_openrouter):
+    fake_openrouter.responder = lambda payload: (200, completion("Sorry, I can't help with that."))
+    with pytest.raises(ValueError):
+        _run(parse_batch_with_ai_async, ["a", "b"])
+
+
+@pytest.fixture
+def parsing_apps(db_session, test_profile, test_resume):
+    apps = []
+    for i in range(2):
+        app = models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            company="Parsing...",
+            position="Parsing...",
+            raw_data=f"Posting {i}",
+            status=models.ApplicationStatus.parsing,
+        )
+        db_session.add(app)
+        apps.append(app)
+    db_session.commit()
+    return [app.id for app in apps]
+
+
+def test_batch_handler_falls_back_for_missing_entries(db_session, fake_openrouter, parsing_apps, monkeypatch):
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    fake_openrouter.responder = _batch_responder([dict(DEFAULT_JOB, index=0, company="Batched")])
+
+    errors = _run(applications.process_applications_batch, [(app_id, False, False) for app_id in parsing_apps])
+
+    assert errors == {parsing_apps[0]: None, parsing_apps[1]: None}
+    # One batch call plus one single fallback for the entry it left out
+    assert len(fake_openrouter.requests) == 2
+
+    db_session.expire_all()
+    first, second = (db_session.get(models.JobApplication, app_id) for app_id in parsing_apps)
+    assert first.company == "Batched"
+    assert second.company == "TechCorp"
+    assert second.status == models.ApplicationStatus.no_response
+
+
+def test_batch_handler_reports_per_app_failures(db_session, fake_openrouter, parsing_apps, monkeypatch):
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    fake_openrouter.responder = lambda payload: (500, {"error": "down"})
+
+    errors = _run(applications.process_applications_batch, [(app_id, False, False) for app_id in parsing_apps])
+
+    assert set(errors) == set(parsing_apps)
+    assert all(isinstance(error, ValueError) for error in errors.values())
+    db_session.expire_all()
+    # Not the final attempt, so the applications stay in parsing for the retry
+    assert db_session.get(models.JobApplication, parsing_apps[0]).status == models.ApplicationStatus.parsing
+
+
+def test_no_session_is_held_during_llm_calls(db_session, fake_openrouter, parsing_apps, monkeypatch):
+    open_sessions = []
+
+    class TrackedSession(SyncSessionAdapter):
+        def __init__(self, session):
+            super().__init__(session)
+            open_sessions.append(self)
+
+        async def close(self):
+            open_sessions.remove(self)
+            await super().close()
+
+    monkeypatch.setattr(applications, "AsyncSessionLocal", lambda: TrackedSession(db_session))
+    respond = _batch_responder([dict(DEFAULT_JOB, index=0, company="Batched")])
+    sessions_at_request = []
+
+    def responder(payload):
+        sessions_at_request.append(len(open_sessions))
+        return respond(payload)
+
+    fake_openrouter.responder = responder
+
+    errors = _run(applications.process_applications_batch, [(app_id, False, False) for app_id in parsing_apps])
+
+    assert errors == {parsing_apps[0]: None, parsing_apps[1]: None}
+    # The batch call and the single fallback both ran with every session closed
+    assert sessions_at_request == [0, 0]
+    assert open_sessions == []
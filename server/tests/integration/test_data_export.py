@@ -0,0 +1,74 @@
+import gzip
+import json
+
+from core.config import settings
+from database import models
+from services.data_export import iter_export
+
+
+def _add_apps(db_session, profile, resume, count, prefix="Comp"):
+    for i in range(count):
+        db_session.add(models.JobApplication(
+            profile_id=profile.id,
+            resume_id=resume.id,
+            resume_version=resume.version,
+            url=f"https://example.com/{prefix}/{i}",
+            company=f"{prefix} {i}",
+            position="Dev",
+            seniority=models.Seniority.senior,
+            raw_data="x" * 1000,
+        ))
+    db_session.commit()
+
+
+def test_json_export_roundtrips_through_import(client, db_session, test_profile, test_resume, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    _add_apps(db_session, test_profile, test_resume, 5)
+
+    response = client.get("/applications/export/json")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == "attachment; filename=vacancies.json"
+
+    data = response.json()
+    assert len(data) == 5
+    assert data[0]["seniority"] == "Seniority.senior"
+    assert "raw_data" not in data[0]
+
+    db_session.query(models.JobApplication).delete()
+    db_session.commit()
+    files = {"file": ("vacancies.json", response.content, "application/json")}
+    assert client.post("/applications/import/json", files=files).json()["count"] == 5
+
+
+def test_ndjson_gzip_and_profile_filter(client, db_session, test_profile, test_resume):
+    _add_apps(db_session, test_profile, test_resume, 3)
+    other = models.Profile(name="Other")
+    db_session.add(other)
+    db_session.commit()
+    _add_apps(db_session, other, test_resume, 2, prefix="Other")
+
+    response = client.get(f"/applications/export/json?format=ndjson&gzip=true&profile_id={other.id}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith("vacancies.ndjson.gz")
+
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert sorted(json.loads(line)["company"] for line in lines) == ["Other 0", "Other 1"]
+
+
+def test_export_is_not_capped_and_streams_in_batches(db_session, test_profile, test_resume):
+    _add_apps(db_session, test_profile, test_resume, 25)
+
+    chunks = list(iter_export(db_session, fmt="ndjson", batch_size=10))
+    assert [chunk.count("\n") for chunk in chunks] == [10, 10, 5]
+
+    chunks = iter_export(db_session, fmt="json", batch_size=10)
+    # The opening bracket goes out before any row is fetched
+    assert next(chunks) == "["
+    assert len(json.loads("[" + "".join(chunks))) == 25
+
+
+def test_empty_export_is_valid_json(client):
+    response = client.get("/applications/export/json")
+    assert response.json() == []
+    assert client.get("/applications/export/json?format=xml").status_code == 422
@@ -0,0 +1,191 @@
+import asyncio
+import json
+
+import pytest
+from starlette.datastructures import UploadFile
+from core.config import settings
+from core.database import SyncSessionAdapter, get_async_db
+from database import models
+from main import app
+from services.data_import import import_applications, iter_json_array
+
+
+def _items(n, prefix="https://example.com/job"):
+    return [
+        {"url": f"{prefix}/{i}", "company": f"Comp {i}", "position": "Dev", "seniority": "Seniority.senior", "tech_stack": ["Python"]}
+        for i in range(n)
+    ]
+
+
+def test_import_inserts_in_chunks(db_session, test_profile, test_resume):
+    result = import_applications(db_session, _items(7), profile_name=test_profile.name, chunk_size=3)
+
+    assert result["success_count"] == 7
+    assert result["errors"] == []
+    assert result["profile_used"] == test_profile.name
+    assert result["total_items"] == 7
+
+    apps = db_session.query(models.JobApplication).all()
+    assert len(apps) == 7
+    assert all(app.id and app.applied_at for app in apps)
+    assert apps[0].seniority == models.Seniority.senior
+    assert apps[0].status == models.ApplicationStatus.no_response
+    assert apps[0].resume_id == test_resume.id
+
+
+def test_import_skips_existing_and_in_file_duplicates(db_session, test_profile, test_resume):
+    import_applications(db_session, _items(2), profile_name=test_profile.name)
+
+    items = _items(4) + [{"url": "https://example.com/job/3", "company": "Again"}]
+    result = import_applications(db_session, items, profile_name=test_profile.name, chunk_size=2)
+
+    assert result["success_count"] == 2
+    assert result["errors"] == [
+        "Skipped duplicate (Index 0): Comp 0 - https://example.com/job/0",
+        "Skipped duplicate (Index 1): Comp 1 - https://example.com/job/1",
+        "Skipped duplicate (Index 4): Again - https://example.com/job/3",
+    ]
+    assert db_session.query(models.JobApplication).count() == 4
+
+
+def test_invalid_rows_are_reported_without_failing_the_chunk(db_session, test_profile, test_resume):
+    items = _items(3)
+    items[1]["salary"] = {"min": "lots"}
+
+    result = import_applications(db_session, items, profile_name=test_profile.name)
+
+    assert result["success_count"] == 2
+    assert len(result["errors"]) == 1
+    assert result["errors"][0].startswith("Failed item 1:")
+
+
+def test_import_endpoint(client, test_profile, test_resume):
+    files = {"file": ("apps.json", b'[{"url": "https://example.com/a", "company": "A"}]', "application/json")}
+    response = client.post("/applications/import/json", files=files)
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+
+
+class _Upload:
+    """Minimal async file: serves `data` in whatever sizes the reader asks for."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+        self.reads = 0
+
+    async def read(self, size=-1):
+        self.reads += 1
+        chunk = self.data[self.offset:] if size < 0 else self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+def _collect(data: bytes, read_size=7):
+    async def run():
+        return [item async for item in iter_json_array(_Upload(data), read_size=read_size)]
+    return asyncio.run(run())
+
+
+def test_iter_json_array_matches_json_loads():
+    doc = [
+        {"company": "Zażółć [gęślą], {jaźń}", "salary": "10 000-12 000 PLN", "n": 12345678901234},
+        {"escaped": "quote \" and \\\\ backslash", "nested": {"a": [1, 2, [3]]}},
+        1234567,
+        None,
+    ]
+    data = ("﻿ \n" + json.dumps(doc, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+    for read_size in (1, 3, 7, 64, 1 << 16):
+        assert _collect(data, read_size) == doc
+    assert _collect(b" [ ] ") == []
+
+
+@pytest.mark.parametrize("data", [b"", b"[{\"a\": 1},", b"[{\"a\": 1} {\"b\": 2}]", b"[1, 2] trailing", b"[1,]"])
+def test_iter_json_array_rejects_malformed(data):
+    with pytest.raises(json.JSONDecodeError):
+        _collect(data)
+
+
+def test_iter_json_array_rejects_non_list():
+    with pytest.raises(ValueError, match="must be a list"):
+        _collect(b'{"url": "x"}')
+
+
+def test_stream_import_reports_progress_per_chunk(client, db_session, test_profile, test_resume, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "IMPORT_READ_SIZE", 16)
+    items = _items(5)
+    items[3]["salary"] = {"min": "lots"}
+
+    files = {"file": ("apps.json", json.dumps(items).encode(), "application/json")}
+    response = client.post("/applications/import/json?stream=true", files=files)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["processed"] for line in lines[:-1]] == [2, 4]
+    assert lines[1]["error_count"] == 1
+    assert lines[-1]["status"] == "imported"
+    assert lines[-1]["count"] == 4
+    assert lines[-1]["details"]["total_items"] == 5
+    assert db_session.query(models.JobApplication).count() == 4
+
+
+def test_import_endpoint_rejects_bad_json(client, test_profile):
+    files = {"file": ("apps.json", b'[{"url": ', "application/json")}
+    response = client.post("/applications/import/json", files=files)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON file"
+
+    files = {"file": ("apps.json", b'{"url": "x"}', "application/json")}
+    response = client.post("/applications/import/json", files=files)
+    assert response.status_code == 400
+    assert "must be a list" in response.json()["detail"]
+
+
+def test_bad_json_reports_the_chunks_already_imported(client, db_session, test_profile, test_resume, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    body = json.dumps(_items(5)).encode()
+    # Cut inside the fifth item: two chunks of two are already committed
+    files = {"file": ("apps.json", body[:body.rindex(b"{") + 5], "application/json")}
+
+    response = client.post("/applications/import/json", files=files)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON file"
+    assert response.json()["count"] == 4
+    assert response.json()["details"]["total_items"] == 4
+    assert db_session.query(models.JobApplication).count() == 4
+
+    files = {"file": ("apps.json", body[:body.rindex(b"{") + 5], "application/json")}
+    response = client.post("/applications/import/json?stream=true", files=files)
+    last = json.loads(response.text.splitlines()[-1])
+    assert last["status"] == "error"
+    assert last["count"] == 0  # The same URLs again: skipped as duplicates
+    assert len(last["details"]["errors"]) == 4
+
+
+def test_stream_import_outlives_the_request_scope(client, db_session, test_profile, test_resume, monkeypatch):
+    """The streamed import opens its own session and keeps the upload after the request's is closed."""
+    closed_uploads = []
+    original_close = UploadFile.close
+
+    async def close(self):
+        closed_uploads.append(self)
+        await original_close(self)
+
+    class ClosedSession(SyncSessionAdapter):
+        async def run_sync(self, fn, *args, **kwargs):
+            raise AssertionError("request-scoped session used by the stream")
+
+    monkeypatch.setattr(UploadFile, "close", close)
+    app.dependency_overrides[get_async_db] = lambda: ClosedSession(db_session)
+
+    files = {"file": ("apps.json", json.dumps(_items(3)).encode(), "application/json")}
+    response = client.post("/applications/import/json?stream=true", files=files)
+
+    last = json.loads(response.text.splitlines()[-1])
+    assert last["status"] == "imported", last
+    assert last["count"] == 3
+    # The request's upload and the stream's own are both closed
+    assert len(closed_uploads) >= 2
+    assert all(upload.file.closed for upload in closed_uploads)
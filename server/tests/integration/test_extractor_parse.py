@@ -0,0 +1,87 @@
+import asyncio
+import json
+from pathlib import Path
+
+from services.job_parser.ai.client import close_client
+from services.job_parser.ai.parser import parse_batch_with_ai_async, parse_with_ai, parse_with_ai_async
+from tests.fake_openrouter import DEFAULT_JOB, completion
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "postings"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _run(coro_fn, *args, **kwargs):
+    async def run():
+        try:
+            return await coro_fn(*args, **kwargs)
+        finally:
+            await close_client()
+    return asyncio.run(run())
+
+
+def test_complete_json_ld_skips_the_llm(fake_openrouter):
+    job = _run(parse_with_ai_async, _fixture("justjoin_complete.html"), source_url="https://justjoin.it/offers/1")
+
+    assert fake_openrouter.requests == []
+    assert job.job_title == "Senior Python Developer"
+    assert job.company == "Acme Software"
+    assert job.work_mode.value == "remote"
+    assert job.salary.min == 22000 and job.salary.currency.value == "PLN"
+    assert job.stack == ["Python", "Django", "PostgreSQL", "Kubernetes"]
+    assert job.source == "justjoin"
+
+    assert parse_with_ai(_fixture("justjoin_complete.html")).company == "Acme Software"
+    assert fake_openrouter.requests == []
+
+
+def test_partial_json_ld_asks_only_for_missing_fields(fake_openrouter):
+    job = _run(parse_with_ai_async, _fixture("nofluffjobs_graph.html"))
+
+    prompt = fake_openrouter.requests[0]["messages"][0]["content"]
+    assert "Return ONLY a JSON object with these remaining fields: work_mode, seniority, salary, stack" in prompt
+    assert '"company": "Dataworks"' in prompt
+    # Extracted values win over what the LLM returns for the same field
+    assert job.company == "Dataworks"
+    assert job.job_title == "Data Engineer"
+    assert job.employment_type.value == "full-time"
+    assert job.stack == ["Python", "FastAPI", "PostgreSQL"]
+
+
+def test_plain_text_gets_the_full_prompt(fake_openrouter):
+    job = parse_with_ai(_fixture("plain_text.txt"))
+
+    prompt = fake_openrouter.requests[0]["messages"][0]["content"]
+    assert "ALREADY EXTRACTED" not in prompt
+    assert job.company == DEFAULT_JOB["company"]
+
+
+def test_batch_sends_only_postings_the_extractors_could_not_cover(fake_openrouter):
+    fake_openrouter.responder = lambda payload: (200, completion(json.dumps([DEFAULT_JOB, DEFAULT_JOB])))
+    texts = [_fixture("plain_text.txt"), _fixture("justjoin_complete.html"), _fixture("nofluffjobs_graph.html")]
+
+    jobs = _run(parse_batch_with_ai_async, texts)
+
+    assert len(fake_openrouter.requests) == 1
+    prompt = fake_openrouter.requests[0]["messages"][0]["content"]
+    assert "### JOB 1" in prompt and "### JOB 2" not in prompt
+    assert [job.company for job in jobs] == ["TechCorp", "Acme Software", "Dataworks"]
+
+
+def test_batch_of_complete_postings_makes_no_request(fake_openrouter):
+    jobs = _run(parse_batch_with_ai_async, [_fixture("justjoin_complete.html")] * 2)
+    assert fake_openrouter.requests == []
+    assert [job.job_title for job in jobs] == ["Senior Python Developer"] * 2
+
+
+def test_prompt_carries_the_compacted_posting(fake_openrouter):
+    page = _fixture("linkedin_page.html")
+    parse_with_ai(page, source_url="https://www.linkedin.com/jobs/view/1")
+
+    prompt = fake_openrouter.requests[0]["messages"][0]["content"]
+    posting = prompt.split("Job text:\n", 1)[1]
+    assert posting.startswith("Platform Engineer\n")
+    assert "<" not in posting and "cookies" not in posting and "People also viewed" not in posting
+    assert len(posting) < len(page) / 3
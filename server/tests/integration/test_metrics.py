@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+from core.config import settings
+from database import models
+from routers import applications
+from services import metrics
+from services.job_parser.ai.client import close_client
+from services.parse_queue import enqueue_parse
+from tests.fake_openrouter import DEFAULT_JOB, completion
+from tests.conftest import async_sessions
+
+USAGE = {"prompt_tokens": 1200, "completion_tokens": 180, "total_tokens": 1380}
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def parsing_app(db_session, test_profile, test_resume):
+    app = models.JobApplication(
+        profile_id=test_profile.id,
+        resume_id=test_resume.id,
+        resume_version=test_resume.version,
+        company="Parsing...",
+        position="Parsing...",
+        raw_data="Senior Python Developer at TechCorp",
+        status=models.ApplicationStatus.parsing,
+    )
+    db_session.add(app)
+    db_session.commit()
+    return app.id
+
+
+def _sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _process(app_id, **kwargs):
+    async def run():
+        try:
+            await applications.process_application_background(app_id, **kwargs)
+        finally:
+            await close_client()
+    asyncio.run(run())
+
+
+def test_parse_records_stages_tokens_and_outcome(db_session, fake_openrouter, parsing_app, monkeypatch):
+    monkeypatch.setattr(settings, "OPENROUTER_STREAMING", False)
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    fake_openrouter.responder = lambda payload: (200, completion(json.dumps(DEFAULT_JOB), usage=USAGE))
+
+    _process(parsing_app)
+
+    model = fake_openrouter.requests[0]["model"]
+    assert _sample("vacancio_llm_tokens_total", model=model, kind="prompt") == 1200
+    assert _sample("vacancio_llm_tokens_total", model=model, kind="completion") == 180
+    assert _sample("vacancio_llm_requests_total", model=model, outcome="ok") == 1
+    for stage in ("extract", "compact", "llm_request", "validate", "auto_fix", "cache_lookup", "db_update"):
+        assert _sample("vacancio_parse_stage_seconds_count", stage=stage) >= 1, stage
+    assert _sample("vacancio_parse_seconds_count", outcome="parsed") == 1
+
+
+def test_failed_parse_is_counted_by_reason(db_session, fake_openrouter, parsing_app, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_MODELS", ["only/model"])
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    fake_openrouter.responder = lambda payload: (502, {"error": {"message": "upstream down"}})
+
+    with pytest.raises(ValueError):
+        _process(parsing_app, final_attempt=False)
+
+    assert _sample("vacancio_parse_failures_total", reason="api_error") == 1
+    assert _sample("vacancio_llm_requests_total", model="only/model", outcome="error") == 1
+    assert _sample("vacancio_parse_seconds_count", outcome="error") == 1
+
+
+def test_metrics_endpoint_renders_prometheus_text(client, db_session, parsing_app):
+    enqueue_parse(db_session, parsing_app)
+    client.get("/applications/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    body = response.text
+    assert "# TYPE vacancio_parse_stage_seconds histogram" in body
+    assert 'vacancio_parse_queue_depth{status="queued"} 1.0' in body
+    assert 'vacancio_parse_queue_depth{status="failed"} 0.0' in body
+    assert "vacancio_parses_in_flight 0.0" in body
+    assert 'vacancio_http_request_seconds_count{handler="read_applications",method="GET",status="200"} 1.0' in body
+
+
+def test_in_flight_is_released_when_the_block_raises():
+    with pytest.raises(RuntimeError):
+        with metrics.in_flight(3):
+            assert _sample("vacancio_parses_in_flight") == 3
+            raise RuntimeError("boom")
+
+    assert _sample("vacancio_parses_in_flight") == 0
+
+
+def test_timing_header_is_opt_in(client, monkeypatch):
+    assert "server-timing" not in client.get("/").headers
+
+    monkeypatch.setattr(settings, "METRICS_TIMING_HEADERS", True)
+    assert client.get("/").headers["server-timing"].startswith("app;dur=")
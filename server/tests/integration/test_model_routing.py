@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+
+import pytest
+from core.config import settings
+from services.job_parser.ai import routing
+from services.job_parser.ai.client import close_client
+from services.job_parser.ai.parser import parse_with_ai, parse_with_ai_async
+from tests.fake_openrouter import DEFAULT_JOB, completion
+
+PRIMARY = "primary/model"
+BACKUP = "backup/model"
+
+
+def _run(coro_fn, *args, **kwargs):
+    async def run():
+        try:
+            return await coro_fn(*args, **kwargs)
+        finally:
+            await close_client()
+    return asyncio.run(run())
+
+
+def _per_model(delays=None, failing=()):
+    """Answer as the requested model would: after its delay, or with a 502."""
+    def respond(payload):
+        model = payload["model"]
+        time.sleep((delays or {}).get(model, 0))
+        if model in failing:
+            return 502, {"error": {"message": "upstream down"}}
+        return 200, completion(json.dumps({**DEFAULT_JOB, "company": model}))
+    return respond
+
+
+@pytest.fixture(autouse=True)
+def two_models(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_MODELS", [PRIMARY, BACKUP])
+    monkeypatch.setattr(settings, "PARSE_HEDGE_SECONDS", 0.3)
+    monkeypatch.setattr(settings, "PARSE_HEDGE_MIN_SECONDS", 0.1)
+    monkeypatch.setattr(settings, "PARSE_ROUTER_MIN_SAMPLES", 3)
+    routing.reset_stats()
+    yield
+    routing.reset_stats()
+
+
+def _stats(model):
+    return next(entry for entry in routing.model_stats() if entry["model"] == model)
+
+
+def test_fast_primary_is_not_hedged(fake_openrouter):
+    fake_openrouter.responder = _per_model()
+
+    job = _run(parse_with_ai_async, "Job text")
+
+    assert job.company == PRIMARY
+    assert [request["model"] for request in fake_openrouter.requests] == [PRIMARY]
+    assert _stats(PRIMARY)["requests"] == 1 and _stats(BACKUP)["requests"] == 0
+
+
+def test_slow_primary_is_hedged_and_backup_wins(fake_openrouter):
+    fake_openrouter.responder = _per_model(delays={PRIMARY: 2.0})
+
+    started = time.perf_counter()
+    job = _run(parse_with_ai_async, "Job text")
+
+    assert job.company == BACKUP
+    assert time.perf_counter() - started < 1.5
+    assert [request["model"] for request in fake_openrouter.requests] == [PRIMARY, BACKUP]
+    assert _stats(PRIMARY)["cancelled"] == 1
+    assert _stats(BACKUP)["errors"] == 0 and _stats(BACKUP)["p50_seconds"] is not None
+
+
+def test_failing_primary_falls_back_without_waiting(fake_openrouter):
+    fake_openrouter.responder = _per_model(failing={PRIMARY})
+
+    started = time.perf_counter()
+    job = _run(parse_with_ai_async, "Job text")
+
+    assert job.company == BACKUP
+    assert time.perf_counter() - started < settings.PARSE_HEDGE_SECONDS
+    assert _stats(PRIMARY)["errors"] == 1 and _stats(PRIMARY)["error_rate"] == 1.0
+
+
+def test_all_models_failing_raises_the_last_error(fake_openrouter):
+    fake_openrouter.responder = _per_model(failing={PRIMARY, BACKUP})
+
+    with pytest.raises(ValueError, match="API request failed"):
+        _run(parse_with_ai_async, "Job text")
+    assert len(fake_openrouter.requests) == 2
+
+
+def test_explicit_model_is_not_routed(fake_openrouter):
+    fake_openrouter.responder = _per_model(failing={PRIMARY})
+
+    with pytest.raises(ValueError):
+        _run(parse_with_ai_async, "Job text", model=PRIMARY)
+    assert [request["model"] for request in fake_openrouter.requests] == [PRIMARY]
+
+
+def test_unhealthy_model_is_tried_last(fake_openrouter):
+    for _ in range(3):
+        routing.record(PRIMARY, 0.1, routing.ERROR)
+    fake_openrouter.responder = _per_model()
+
+    assert routing.model_order() == [BACKUP, PRIMARY]
+    assert _run(parse_with_ai_async, "Job text").company == BACKUP
+    assert not _stats(PRIMARY)["healthy"]
+
+
+def test_hedge_deadline_follows_p95(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_HEDGE_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "PARSE_HEDGE_MIN_SECONDS", 0.5)
+    assert routing.hedge_deadline(PRIMARY) == 10.0  # no samples yet
+
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        routing.record(PRIMARY, seconds, routing.OK)
+    routing.record(PRIMARY, 0.01, routing.ERROR)  # failures don't count towards latency
+    stats = _stats(PRIMARY)
+
+    assert stats["p50_seconds"] == 2.0 and stats["p95_seconds"] == 4.0
+    assert stats["error_rate"] == 0.2
+    assert routing.hedge_deadline(PRIMARY) == 4.0
+
+    monkeypatch.setattr(settings, "PARSE_HEDGE_SECONDS", 0)
+    assert routing.hedge_deadline(PRIMARY) is None
+
+
+def test_sync_parse_falls_back_in_order(fake_openrouter):
+    fake_openrouter.responder = _per_model(failing={PRIMARY})
+
+    job = parse_with_ai("Job text")
+
+    assert job.company == BACKUP
+    assert _stats(PRIMARY)["errors"] == 1 and _stats(BACKUP)["requests"] == 1
+
+
+def test_stats_endpoint(client, fake_openrouter):
+    routing.record(PRIMARY, 1.5, routing.OK)
+
+    response = client.get("/applications/parse/models")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [entry["model"] for entry in body] == [PRIMARY, BACKUP]
+    assert body[0]["requests"] == 1 and body[0]["p95_seconds"] == 1.5
+    assert body[1]["requests"] == 0 and body[1]["hedge_after_seconds"] == settings.PARSE_HEDGE_SECONDS
@@ -0,0 +1,134 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from core.config import settings
+from database import models
+from database.models import utcnow
+from routers import applications
+from services import parse_cache
+from services.job_parser.ai.client import close_client
+from services.job_parser.models import JobPosting
+from tests.conftest import async_sessions
+
+MODEL = "openai/gpt-4o-mini"
+
+
+def _job(title="Dev"):
+    return JobPosting(job_title=title, company="Comp", stack=["Python"])
+
+
+def test_key_ignores_whitespace_but_not_model_or_prompt():
+    key = parse_cache.cache_key("Senior  Dev\n\nat  Comp ", MODEL)
+    assert key == parse_cache.cache_key("Senior Dev at Comp", MODEL)
+    assert key != parse_cache.cache_key("Senior Dev at Comp", "anthropic/claude-3.5-sonnet")
+    assert key != parse_cache.cache_key("Senior Dev at Comp", MODEL, prompt_version="other")
+
+
+def test_store_and_get_roundtrip(db_session):
+    parse_cache.store(db_session, "Job text", MODEL, _job())
+
+    cached = parse_cache.get_cached(db_session, "  Job   text ", MODEL, source_url="https://nofluffjobs.com/pl/job/1")
+    assert cached.job_title == "Dev"
+    assert cached.stack == ["Python"]
+    assert cached.source == "nofluffjobs"
+
+    entry = db_session.query(models.ParseCacheEntry).one()
+    assert entry.hits == 1
+    assert parse_cache.get_cached(db_session, "Other text", MODEL) is None
+
+
+def test_expired_entries_are_ignored(db_session):
+    parse_cache.store(db_session, "Job text", MODEL, _job())
+    entry = db_session.query(models.ParseCacheEntry).one()
+    entry.created_at = utcnow() - timedelta(days=settings.PARSE_CACHE_TTL_DAYS + 1)
+    db_session.commit()
+
+    assert parse_cache.get_cached(db_session, "Job text", MODEL) is None
+    assert db_session.query(models.ParseCacheEntry).count() == 0
+
+
+def test_lru_eviction(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_CACHE_MAX_ENTRIES", 2)
+    parse_cache.store(db_session, "first", MODEL, _job("first"))
+    parse_cache.store(db_session, "second", MODEL, _job("second"))
+    # Touch "first" so "second" becomes the least recently used
+    assert parse_cache.get_cached(db_session, "first", MODEL)
+    parse_cache.store(db_session, "third", MODEL, _job("third"))
+
+    assert parse_cache.get_cached(db_session, "second", MODEL) is None
+    assert parse_cache.get_cached(db_session, "first", MODEL)
+    assert parse_cache.get_cached(db_session, "third", MODEL)
+
+
+@pytest.fixture
+def make_parsing_app(db_session, test_profile, test_resume):
+    def make(raw_data, url=None):
+        app = models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            url=url,
+            company="Parsing...",
+            position="Parsing...",
+            raw_data=raw_data,
+            status=models.ApplicationStatus.parsing,
+        )
+        db_session.add(app)
+        db_session.commit()
+        return app.id
+    return make
+
+
+def _process(app_id, bypass_cache=False):
+    async def run():
+        try:
+            await applications.process_application_background(app_id, bypass_cache=bypass_cache)
+        finally:
+            await close_client()
+    asyncio.run(run())
+
+
+def test_repeat_posting_skips_llm(db_session, fake_openrouter, make_parsing_app, monkeypatch):
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+
+    first = make_parsing_app("Same posting", url="https://justjoin.it/offers/1")
+    second = make_parsing_app("Same   posting", url="https://nofluffjobs.com/pl/job/1")
+    _process(first)
+    _process(second)
+
+    assert len(fake_openrouter.requests) == 1
+    db_session.expire_all()
+    app = db_session.get(models.JobApplication, second)
+    assert app.company == "TechCorp"
+    assert app.status == models.ApplicationStatus.no_response
+
+    _process(second, bypass_cache=True)
+    assert len(fake_openrouter.requests) == 2
+
+
+def test_changing_parse_models_misses_the_cache(db_session, fake_openrouter, make_parsing_app, monkeypatch):
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    first, second, third = (make_parsing_app("Same posting") for _ in range(3))
+
+    monkeypatch.setattr(settings, "PARSE_MODELS", ["openai/gpt-4o-mini"])
+    _process(first)
+    assert len(fake_openrouter.requests) == 1
+
+    # Results of a model that is no longer configured aren't served
+    monkeypatch.setattr(settings, "PARSE_MODELS", ["anthropic/claude-3.5-haiku"])
+    _process(second)
+    assert len(fake_openrouter.requests) == 2
+    assert fake_openrouter.requests[1]["model"] == "anthropic/claude-3.5-haiku"
+
+    _process(third)
+    assert len(fake_openrouter.requests) == 2
+
+
+def test_reparse_bypass_flag_reaches_queue(client, db_session, make_parsing_app):
+    app_id = make_parsing_app("Posting")
+    response = client.post(f"/applications/{app_id}/reparse?bypass_cache=true")
+    assert response.status_code == 200
+
+    job = db_session.query(models.ParseJob).filter_by(application_id=app_id).one()
+    assert job.bypass_cache is True
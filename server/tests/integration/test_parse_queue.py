@@ -0,0 +1,211 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from database import models
+from database.models import utcnow
+from services import parse_queue
+from services.parse_queue import ParseWorkerPool
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+
+@pytest.fixture
+def parsing_app(db_session, test_profile, test_resume):
+    app = models.JobApplication(
+        profile_id=test_profile.id,
+        resume_id=test_resume.id,
+        resume_version=test_resume.version,
+        company="Parsing...",
+        position="Parsing...",
+        raw_data="Some job text",
+        status=models.ApplicationStatus.parsing,
+    )
+    db_session.add(app)
+    db_session.commit()
+    db_session.refresh(app)
+    return app
+
+
+def test_enqueue_is_idempotent(db_session, parsing_app):
+    first = parse_queue.enqueue_parse(db_session, parsing_app.id)
+    second = parse_queue.enqueue_parse(db_session, parsing_app.id)
+    assert first.id == second.id
+    assert db_session.query(models.ParseJob).count() == 1
+
+
+def test_lease_claims_job_once(db_session, parsing_app):
+    parse_queue.enqueue_parse(db_session, parsing_app.id)
+
+    job = parse_queue.lease_job(db_session, "w1")
+    assert job.application_id == parsing_app.id
+    assert job.status == models.ParseJobStatus.leased
+    assert job.attempts == 1
+
+    assert parse_queue.lease_job(db_session, "w2") is None
+
+
+def test_expired_lease_is_reclaimed(db_session, parsing_app):
+    parse_queue.enqueue_parse(db_session, parsing_app.id)
+    job = parse_queue.lease_job(db_session, "w1")
+    job.leased_until = utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+    job = parse_queue.lease_job(db_session, "w2")
+    assert job.leased_by == "w2"
+    assert job.attempts == 2
+
+
+def test_fail_job_backs_off_then_gives_up(db_session, parsing_app):
+    parse_queue.enqueue_parse(db_session, parsing_app.id)
+    job = parse_queue.lease_job(db_session, "w1")
+
+    assert parse_queue.fail_job(db_session, job.id, "timeout", max_attempts=2) is True
+    db_session.refresh(job)
+    assert job.status == models.ParseJobStatus.queued
+    assert job.available_at.replace(tzinfo=None) > utcnow().replace(tzinfo=None)
+    assert parse_queue.lease_job(db_session, "w1") is None
+
+    job.available_at = utcnow()
+    db_session.commit()
+    job = parse_queue.lease_job(db_session, "w1")
+    assert parse_queue.fail_job(db_session, job.id, "timeout", max_attempts=2) is False
+    db_session.refresh(job)
+    assert job.status == models.ParseJobStatus.failed
+    assert job.last_error == "timeout"
+
+
+def test_recover_orphans_enqueues_parsing_rows(db_session, parsing_app):
+    assert parse_queue.recover_orphans(db_session) == 1
+    assert parse_queue.recover_orphans(db_session) == 0
+
+
+def test_worker_pool_drains_queue(db_session, parsing_app):
+    parse_queue.enqueue_parse(db_session, parsing_app.id)
+    handled = []
+
+    def handler(app_id, final_attempt, bypass_cache=False):
+        handled.append((app_id, final_attempt))
+
+    async def run():
+        pool = ParseWorkerPool(handler, workers=2, session_factory=TestingAsyncSessionLocal, poll_interval=0.01)
+        await pool.start()
+        # The job is deleted after the handler returns; stopping on `handled` alone races that
+        for _ in range(100):
+            if handled and not await asyncio.to_thread(remaining):
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+    def remaining():
+        with TestingSessionLocal() as db:
+            return db.query(models.ParseJob).count()
+
+    asyncio.run(run())
+
+    assert handled == [(parsing_app.id, False)]
+    db_session.expire_all()
+    assert db_session.query(models.ParseJob).count() == 0
+
+
+def test_worker_pool_retries_failed_handler(db_session, parsing_app):
+    parse_queue.enqueue_parse(db_session, parsing_app.id)
+
+    async def handler(app_id, final_attempt, bypass_cache=False):
+        raise RuntimeError("provider down")
+
+    async def run():
+        pool = ParseWorkerPool(handler, workers=1, session_factory=TestingAsyncSessionLocal, poll_interval=0.01)
+        await pool.start()
+        await asyncio.sleep(0.1)
+        await pool.stop()
+
+    asyncio.run(run())
+
+    db_session.expire_all()
+    job = db_session.query(models.ParseJob).one()
+    assert job.status == models.ParseJobStatus.queued
+    assert job.attempts == 1
+    assert job.last_error == "provider down"
+
+
+def test_lease_jobs_claims_a_batch(db_session, test_profile, test_resume):
+    app_ids = []
+    for i in range(3):
+        app = models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            company="Parsing...",
+            position="Parsing...",
+            raw_data=f"Posting {i}",
+            status=models.ApplicationStatus.parsing,
+        )
+        db_session.add(app)
+        db_session.flush()
+        app_ids.append(app.id)
+    db_session.commit()
+    parse_queue.enqueue_many(db_session, app_ids)
+
+    jobs = parse_queue.lease_jobs(db_session, "w1", limit=2)
+    assert len(jobs) == 2
+    assert all(job.leased_by == "w1" for job in jobs)
+    assert len(parse_queue.lease_jobs(db_session, "w2", limit=2)) == 1
+    assert parse_queue.lease_jobs(db_session, "w3", limit=2) == []
+
+
+def test_leases_are_renewed_while_a_batch_runs(db_session, test_profile, test_resume):
+    app_ids = []
+    for i in range(2):
+        app = models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            company="Parsing...",
+            position="Parsing...",
+            raw_data=f"Posting {i}",
+            status=models.ApplicationStatus.parsing,
+        )
+        db_session.add(app)
+        db_session.flush()
+        app_ids.append(app.id)
+    db_session.commit()
+    parse_queue.enqueue_many(db_session, app_ids)
+    stolen = []
+
+    def remaining():
+        with TestingSessionLocal() as db:
+            return db.query(models.ParseJob).count()
+
+    def lease_elsewhere():
+        with TestingSessionLocal() as db:
+            return [job.application_id for job in parse_queue.lease_jobs(db, "other", limit=2)]
+
+    async def batch_handler(batch):
+        # Outlives the 0.3s lease several times over, like single-parse fallbacks would
+        for _ in range(4):
+            await asyncio.sleep(0.25)
+            stolen.extend(await asyncio.to_thread(lease_elsewhere))
+        return {app_id: None for app_id, _, _ in batch}
+
+    async def run():
+        pool = ParseWorkerPool(
+            None,
+            workers=1,
+            session_factory=TestingAsyncSessionLocal,
+            poll_interval=0.01,
+            batch_handler=batch_handler,
+            batch_size=2,
+            lease_seconds=0.3,
+        )
+        await pool.start()
+        for _ in range(300):
+            if not await asyncio.to_thread(remaining):
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+    asyncio.run(run())
+
+    assert stolen == []
+    db_session.expire_all()
+    assert db_session.query(models.ParseJob).count() == 0
@@ -0,0 +1,123 @@
+import json
+import os
+import time
+
+import pytest
+from core.config import settings
+from database import models
+from routers import applications as applications_router
+from services import profiling
+from tests.conftest import engine
+
+
+@pytest.fixture(autouse=True)
+def profiles_dir(tmp_path, monkeypatch):
+    profiling.instrument_engine(engine)
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    return tmp_path / "profiles"
+
+
+@pytest.fixture
+def applications(db_session, test_profile, test_resume):
+    for i in range(3):
+        db_session.add(models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            company=f"Company {i}",
+            position="Backend Developer",
+            raw_data=f"Posting {i}",
+        ))
+    db_session.commit()
+
+
+def _summaries(directory):
+    if not directory.exists():
+        return []
+    return [json.loads((directory / name).read_text()) for name in sorted(os.listdir(directory)) if name.endswith(".json")]
+
+
+def test_requests_are_not_profiled_by_default(client, applications, profiles_dir):
+    response = client.get("/applications/", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert _summaries(profiles_dir) == []
+
+
+def test_profile_header_reports_sql_handler_and_serialization(client, applications, profiles_dir, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ALLOW_HEADER", True)
+
+    response = client.get("/applications/", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "sql;dur=" in timing and "handler;dur=" in timing and "serialize;dur=" in timing
+
+    [summary] = _summaries(profiles_dir)
+    assert summary["handler"] == "read_applications"
+    assert summary["status"] == 200
+    assert summary["sql_count"] >= 2
+    assert summary["serialize_ms"] is not None
+    stems = {name.rsplit(".", 1)[0] for name in os.listdir(profiles_dir)}
+    assert len(stems) == 1
+    assert len(os.listdir(profiles_dir)) == 2  # summary + profiler output
+
+
+def test_serialization_inside_the_endpoint_is_reported(client, applications, profiles_dir, monkeypatch):
+    """The list endpoint returns a prebuilt Response; its serialization happens before the handler returns."""
+    monkeypatch.setattr(settings, "PROFILING_ALLOW_HEADER", True)
+
+    class SlowAdapter:
+        def validate_python(self, items, from_attributes):
+            return items
+
+        def dump_json(self, items):
+            time.sleep(0.05)
+            return b"[]"
+
+    monkeypatch.setattr(applications_router, "_list_adapter", lambda model: SlowAdapter())
+
+    client.get("/applications/", headers={"X-Profile": "1"})
+
+    [summary] = _summaries(profiles_dir)
+    assert 50 <= summary["serialize_ms"] <= summary["handler_ms"]
+
+
+def test_prebuilt_response_without_measurement_has_no_serialize_entry():
+    profile = profiling.RequestProfile("GET", "/applications/")
+    profile.handler_seconds = 0.01
+    profile.handler_finished = 1.0
+    profile.response_started = 1.5
+    profile.prebuilt_response = True
+
+    assert profile.serialize_seconds is None
+    assert "serialize" not in profile.server_timing()
+
+    profile.prebuilt_response = False
+    assert profile.serialize_seconds == 0.5
+
+
+def test_repeated_statements_are_listed():
+    profile = profiling.RequestProfile("GET", "/applications/")
+    for _ in range(3):
+        profile.record_sql("SELECT raw_texts.data\nFROM raw_texts WHERE raw_texts.hash = ?", 0.001)
+    profile.record_sql("SELECT count(*) FROM job_applications", 0.001)
+
+    summary = profile.summary(0.01)
+
+    assert summary["sql_count"] == 4
+    assert summary["repeated_statements"] == [
+        {"statement": "SELECT raw_texts.data FROM raw_texts WHERE raw_texts.hash = ?", "count": 3}
+    ]
+
+
+def test_sample_rate_profiles_without_header(client, profiles_dir, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_MAX_REPORTS", 2)
+
+    for _ in range(4):
+        assert "sql;dur=" in client.get("/profiles/").headers["server-timing"]
+
+    assert len(_summaries(profiles_dir)) == 2
+    assert len(os.listdir(profiles_dir)) == 4
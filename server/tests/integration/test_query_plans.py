@@ -0,0 +1,176 @@
+"""
+Query-plan regression tests: the queries crud/data_import actually issue must
+be served by the composite indexes declared on the models.
+Postgres runs only when TEST_POSTGRES_URL points at a scratch database.
+"""
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from alembic import command
+from alembic.config import Config
+from core.migration import ALEMBIC_INI, run_schema_migrations
+from database import crud, models, schemas
+from services import parse_queue, skills
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@contextmanager
+def captured_statements(session):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _sqlite_plan(session, statement, parameters) -> str:
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def _postgres_plan(session, statement, parameters) -> str:
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+
+QUERY_SHAPES = {
+    "list_by_profile": (
+        lambda db, ids: crud.get_applications_page(db, schemas.ApplicationFilters(profile_id=ids["profile"]), limit=20),
+        "ix_applications_profile_applied",
+    ),
+    "list_by_profile_next_page": (
+        lambda db, ids: crud.get_applications_page(
+            db, schemas.ApplicationFilters(profile_id=ids["profile"]), limit=1,
+            cursor=crud.get_applications_page(db, schemas.ApplicationFilters(profile_id=ids["profile"]), limit=1)[1],
+        ),
+        "ix_applications_profile_applied",
+    ),
+    "list_all_profiles": (
+        lambda db, ids: crud.get_applications_page(db, limit=20),
+        "ix_applications_applied",
+    ),
+    "import_url_dedup": (
+        lambda db, ids: crud.get_application_urls(db, ids["profile"]),
+        "ix_applications_profile_url",
+    ),
+    "latest_resume_version": (
+        lambda db, ids: crud.get_latest_resume_version(db, ids["profile"]),
+        "ix_resumes_profile_version",
+    ),
+    "skill_filter": (
+        lambda db, ids: crud.get_applications(db, schemas.ApplicationFilters(skills=["Python", "Go"], skills_match="all")),
+        "ix_application_skills_skill",
+    ),
+    "top_skills_by_profile": (
+        lambda db, ids: skills.top_skills(db, profile_id=ids["profile"]),
+        "ix_applications_profile_applied",
+    ),
+    "lease_parse_jobs": (
+        lambda db, ids: parse_queue.lease_jobs(db, "plan-test", limit=5),
+        "ix_parse_jobs_status_available",
+    ),
+}
+
+
+@pytest.fixture
+def seeded(db_session, test_profile, test_resume):
+    for i in range(20):
+        db_session.add(models.JobApplication(
+            profile_id=test_profile.id,
+            resume_id=test_resume.id,
+            resume_version=test_resume.version,
+            url=f"https://example.com/{i}",
+            company=f"Comp {i}",
+            position="Pos",
+            tech_stack=["Python", "Go"] if i % 2 else ["Java"],
+        ))
+    db_session.commit()
+    return {"profile": test_profile.id}
+
+
+def _assert_uses_index(session, shape, ids, plan_fn):
+    query_fn, index_name = QUERY_SHAPES[shape]
+    with captured_statements(session) as statements:
+        query_fn(session, ids)
+    assert statements, f"{shape} issued no SELECT"
+
+    # The last SELECT of the shape is the one being checked (earlier ones may be helpers)
+    statement, parameters = statements[-1]
+    plan = plan_fn(session, statement, parameters)
+    assert index_name in plan, f"{shape} does not use {index_name}:\n{plan}"
+    return plan
+
+
+@pytest.mark.parametrize("shape", sorted(QUERY_SHAPES))
+def test_sqlite_query_plans_use_indexes(db_session, seeded, shape):
+    plan = _assert_uses_index(db_session, shape, seeded, _sqlite_plan)
+    if shape.startswith("list"):
+        # Ordering comes straight from the index, no sort step
+        assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+@pytest.mark.parametrize("shape", sorted(QUERY_SHAPES))
+def test_postgres_query_plans_use_indexes(shape):
+    engine = create_engine(POSTGRES_URL)
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        profile = models.Profile(name="Plan User")
+        session.add(profile)
+        session.flush()
+        session.add(models.Resume(profile_id=profile.id, name="cv", version=1, file_path="cv.pdf"))
+        session.commit()
+        _assert_uses_index(session, shape, {"profile": profile.id}, _postgres_plan)
+    finally:
+        session.close()
+        models.Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def test_migration_adds_indexes_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    # Simulate a database created before the indexes were declared
+    with engine.begin() as conn:
+        for name in ("ix_applications_profile_applied", "ix_applications_profile_url", "ix_parse_jobs_status_available"):
+            conn.execute(text(f"DROP INDEX {name}"))
+
+    run_schema_migrations(engine)
+    run_schema_migrations(engine)  # idempotent
+
+    names = {index["name"] for index in inspect(engine).get_indexes("applications")}
+    assert {"ix_applications_profile_applied", "ix_applications_applied", "ix_applications_profile_url"} <= names
+    names = {index["name"] for index in inspect(engine).get_indexes("parse_jobs")}
+    assert "ix_parse_jobs_status_available" in names
+    engine.dispose()
+
+
+def test_migration_downgrade_restores_the_status_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "base")
+
+    names = {index["name"] for index in inspect(engine).get_indexes("parse_jobs")}
+    assert "ix_parse_jobs_status" in names
+    assert "ix_parse_jobs_status_available" not in names
+    engine.dispose()
@@ -0,0 +1,146 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from alembic import command
+from alembic.config import Config
+from core.migration import ALEMBIC_INI, run_schema_migrations
+from database import blob_store, crud, models
+
+POSTING = "Senior Python Developer at TechCorp. " * 200
+
+
+def _app(profile, resume, **fields):
+    return models.JobApplication(
+        profile_id=profile.id,
+        resume_id=resume.id,
+        resume_version=resume.version,
+        **{"company": "Comp", "position": "Dev", **fields},
+    )
+
+
+def test_raw_data_is_compressed_and_deduplicated(db_session, test_profile, test_resume):
+    db_session.add_all([_app(test_profile, test_resume, raw_data=POSTING) for _ in range(3)])
+    db_session.commit()
+
+    blob = db_session.query(models.RawText).one()
+    assert blob.hash == blob_store.text_hash(POSTING)
+    assert blob.size == len(POSTING)
+    assert len(blob.data) < len(POSTING) / 10
+
+    db_session.expunge_all()
+    app = db_session.query(models.JobApplication).first()
+    assert "raw_data" not in app.__dict__
+    assert app.raw_data == POSTING
+
+
+def test_raw_data_can_be_replaced_and_cleared(db_session, test_profile, test_resume):
+    app = _app(test_profile, test_resume, raw_data="first")
+    db_session.add(app)
+    db_session.commit()
+
+    app.raw_data = "second"
+    db_session.commit()
+    db_session.expire_all()
+    assert app.raw_data == "second"
+    # The replaced text isn't referenced any more
+    assert [blob.hash for blob in db_session.query(models.RawText)] == [blob_store.text_hash("second")]
+
+    app.raw_data = None
+    db_session.commit()
+    assert app.raw_data is None
+    assert db_session.query(models.RawText).count() == 0
+
+
+def test_replaced_raw_data_keeps_blobs_still_shared(db_session, test_profile, test_resume):
+    shared, other = _app(test_profile, test_resume, raw_data=POSTING), _app(test_profile, test_resume, raw_data=POSTING)
+    db_session.add_all([shared, other])
+    db_session.commit()
+    db_session.expire_all()
+
+    other.raw_data = "Edited posting"
+    db_session.commit()
+    assert db_session.query(models.RawText).count() == 2
+
+    shared.raw_data = "Edited posting"
+    db_session.commit()
+    assert [blob.hash for blob in db_session.query(models.RawText)] == [blob_store.text_hash("Edited posting")]
+
+
+def test_deleting_a_profile_prunes_its_blobs(client, db_session, test_profile, test_resume):
+    db_session.add(_app(test_profile, test_resume, raw_data=POSTING))
+    db_session.commit()
+
+    assert client.delete(f"/profiles/{test_profile.id}").status_code == 200
+    assert db_session.query(models.RawText).count() == 0
+
+
+def test_prune_catches_up_after_bulk_deletes(db_session, test_profile, test_resume):
+    db_session.add(_app(test_profile, test_resume, raw_data=POSTING))
+    db_session.commit()
+    db_session.query(models.JobApplication).delete()
+    db_session.commit()
+
+    assert crud.prune_raw_texts(db_session) == 1
+
+
+def test_deleting_the_last_reference_prunes_the_blob(client, db_session, test_profile, test_resume):
+    first, second = _app(test_profile, test_resume, raw_data=POSTING), _app(test_profile, test_resume, raw_data=POSTING)
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    client.delete(f"/applications/{first.id}")
+    assert db_session.query(models.RawText).count() == 1
+    client.delete(f"/applications/{second.id}")
+    assert db_session.query(models.RawText).count() == 0
+
+
+def test_api_and_import_roundtrip_raw_data(client, db_session, test_profile, test_resume):
+    response = client.post("/applications/", json={
+        "profile_id": test_profile.id,
+        "resume_id": test_resume.id,
+        "resume_version": test_resume.version,
+        "raw_data": POSTING,
+    })
+    assert response.json()["raw_data"] == POSTING
+    assert client.get("/applications/").json()[0]["raw_data"] == POSTING
+    assert client.get("/applications/?fields=raw_data").json()[0]["raw_data"] == POSTING
+
+    files = {"file": ("apps.json", b'[{"url": "https://example.com/a", "company": "A"}]', "application/json")}
+    client.post("/applications/import/json", files=files)
+    imported = db_session.query(models.JobApplication).filter_by(company="A").one()
+    assert '"company": "A"' in imported.raw_data
+    assert db_session.query(models.RawText).count() == 2
+
+
+def test_migration_moves_inline_raw_data(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+    # Back to the pre-0002 layout: raw_data inline, no raw_texts
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0001")
+    assert "raw_texts" not in inspect(engine).get_table_names()
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO profiles (id, name) VALUES ('p', 'P')"))
+        conn.execute(text("INSERT INTO resumes (id, profile_id, name, version, file_path) VALUES ('r', 'p', 'cv', 1, 'cv.pdf')"))
+        for i, raw in enumerate([POSTING, POSTING, "other", None]):
+            conn.execute(
+                text("INSERT INTO applications (id, profile_id, resume_id, resume_version, company, position, raw_data, status, "
+                     "is_favorite, is_archived, tech_stack, nice_to_have_stack, responsibilities, requirements) "
+                     "VALUES (:id, 'p', 'r', 1, 'C', 'P', :raw, 'no_response', 0, 0, '[]', '[]', '[]', '[]')"),
+                {"id": f"a{i}", "raw": raw},
+            )
+
+    run_schema_migrations(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("applications")}
+    assert "raw_data" not in columns and "raw_data_hash" in columns
+    db = sessionmaker(bind=engine)()
+    assert db.query(models.RawText).count() == 2
+    assert [db.get(models.JobApplication, f"a{i}").raw_data for i in range(4)] == [POSTING, POSTING, "other", None]
+    db.close()
+    engine.dispose()
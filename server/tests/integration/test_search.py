@@ -0,0 +1,122 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from alembic import command
+from alembic.config import Config
+from core.migration import ALEMBIC_INI, run_schema_migrations
+from database import models
+from services import search
+
+
+def _add(db_session, profile, resume, **fields):
+    app = models.JobApplication(
+        profile_id=profile.id,
+        resume_id=resume.id,
+        resume_version=resume.version,
+        **{"company": "Comp", "position": "Dev", **fields},
+    )
+    db_session.add(app)
+    db_session.commit()
+    return app
+
+
+def _search(client, q, **params):
+    response = client.get("/applications/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_search_ranks_title_matches_first(client, db_session, test_profile, test_resume):
+    in_description = _add(db_session, test_profile, test_resume, position="Backend Developer",
+                          description="Some services are written in Kotlin.")
+    in_position = _add(db_session, test_profile, test_resume, position="Kotlin Developer", location="Kraków",
+                       tech_stack=["Kotlin", "Spring"])
+    _add(db_session, test_profile, test_resume, position="Go Developer", tech_stack=["Go"])
+
+    results = _search(client, "kotlin")
+    assert [r["application"]["id"] for r in results] == [in_position.id, in_description.id]
+    assert results[0]["rank"] > results[1]["rank"]
+    assert "description" not in results[0]["application"]
+    assert "<mark>Kotlin</mark>" in results[1]["snippet"]
+
+    # Every word must match; prefixes and missing diacritics are fine
+    assert [r["application"]["id"] for r in _search(client, "kotl krakow")] == [in_position.id]
+    assert _search(client, "kotlin warsaw") == []
+
+
+def test_search_covers_json_list_columns(client, db_session, test_profile, test_resume):
+    app = _add(db_session, test_profile, test_resume, requirements=["Experience with Kubernetes"],
+               responsibilities=["Own the billing pipeline"])
+    assert [r["application"]["id"] for r in _search(client, "kubernetes")] == [app.id]
+    assert [r["application"]["id"] for r in _search(client, "billing")] == [app.id]
+
+
+def test_index_follows_updates_and_deletes(client, db_session, test_profile, test_resume):
+    app = _add(db_session, test_profile, test_resume, position="Rust Engineer")
+    assert len(_search(client, "rust")) == 1
+
+    client.put(f"/applications/{app.id}", json={"position": "Elixir Engineer"})
+    assert _search(client, "rust") == []
+    assert len(_search(client, "elixir")) == 1
+
+    client.delete(f"/applications/{app.id}")
+    assert _search(client, "elixir") == []
+    assert db_session.execute(text("SELECT count(*) FROM applications_fts")).scalar() == 0
+
+
+def test_imported_applications_are_searchable(client, test_profile):
+    files = {"file": ("apps.json", b'[{"url": "https://example.com/a", "company": "Zalando", "position": "Scala Dev"}]',
+                      "application/json")}
+    client.post("/applications/import/json", files=files)
+    assert [r["application"]["company"] for r in _search(client, "scala")] == ["Zalando"]
+
+
+def test_search_filters_by_profile(client, db_session, test_profile, test_resume):
+    other = models.Profile(name="Other")
+    db_session.add(other)
+    db_session.commit()
+    mine = _add(db_session, test_profile, test_resume, position="Haskell Developer")
+    _add(db_session, other, test_resume, position="Haskell Developer")
+
+    assert len(_search(client, "haskell")) == 2
+    results = _search(client, "haskell", profile_id=test_profile.id)
+    assert [r["application"]["id"] for r in results] == [mine.id]
+
+
+def test_snippets_are_escaped(db_session, test_profile, test_resume):
+    _add(db_session, test_profile, test_resume, description="<script>alert(1)</script> Clojure shop")
+    [result] = search.search_applications(db_session, "clojure")
+    assert "<script>" not in result["snippet"]
+    assert "&lt;script&gt;" in result["snippet"]
+    assert "<mark>Clojure</mark>" in result["snippet"]
+
+
+def test_query_without_words_returns_nothing(client, db_session, test_profile, test_resume):
+    _add(db_session, test_profile, test_resume)
+    assert _search(client, '"*-()') == []
+    assert client.get("/applications/search").status_code == 422
+
+
+def test_migration_builds_and_fills_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0002")
+        conn.execute(text("INSERT INTO profiles (id, name) VALUES ('p', 'P')"))
+        conn.execute(text("INSERT INTO resumes (id, profile_id, name, version, file_path) VALUES ('r', 'p', 'cv', 1, 'cv.pdf')"))
+        conn.execute(text(
+            "INSERT INTO applications (id, profile_id, resume_id, resume_version, company, position, status, "
+            "is_favorite, is_archived, tech_stack, nice_to_have_stack, responsibilities, requirements) "
+            "VALUES ('a', 'p', 'r', 1, 'C', 'Erlang Developer', 'no_response', 0, 0, '[]', '[]', '[]', '[]')"
+        ))
+
+    run_schema_migrations(engine)
+
+    db = sessionmaker(bind=engine)()
+    assert [r["application"].id for r in search.search_applications(db, "erlang")] == ["a"]
+    db.close()
+    engine.dispose()
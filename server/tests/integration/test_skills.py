@@ -0,0 +1,159 @@
+from sqlalchemy import create_engine, delete, text
+from sqlalchemy.orm import sessionmaker
+
+from alembic import command
+from alembic.config import Config
+from core.migration import ALEMBIC_INI, run_schema_migrations
+from database import crud, models, schemas
+from services import skills
+
+
+def _add(db_session, profile, resume, **fields):
+    app = models.JobApplication(
+        profile_id=profile.id,
+        resume_id=resume.id,
+        resume_version=resume.version,
+        **{"company": "Comp", "position": "Dev", **fields},
+    )
+    db_session.add(app)
+    db_session.commit()
+    return app
+
+
+def _skills(db_session, app_id):
+    rows = db_session.query(models.ApplicationSkill).filter_by(application_id=app_id)
+    return sorted((row.kind, row.skill) for row in rows)
+
+
+def test_skills_are_normalized_on_create(db_session, test_profile, test_resume):
+    app = _add(db_session, test_profile, test_resume,
+               tech_stack=["python", " Python ", "terraform", "x"], nice_to_have_stack=["kubernetes"])
+    assert _skills(db_session, app.id) == [
+        ("nice_to_have", "Kubernetes"), ("required", "Python"), ("required", "Terraform"),
+    ]
+
+
+def test_skills_follow_updates_and_deletes(client, db_session, test_profile, test_resume):
+    app = _add(db_session, test_profile, test_resume, tech_stack=["Go"])
+
+    client.put(f"/applications/{app.id}", json={"status": "interview"})
+    assert _skills(db_session, app.id) == [("required", "Go")]
+
+    # The parse worker stores results through the same update
+    crud.update_application(db_session, app.id, schemas.JobApplicationUpdate(tech_stack=["Rust", "AWS"]))
+    assert _skills(db_session, app.id) == [("required", "AWS"), ("required", "Rust")]
+
+    client.delete(f"/applications/{app.id}")
+    assert db_session.query(models.ApplicationSkill).count() == 0
+
+
+def test_deleting_a_profile_drops_its_skills(db_session, test_profile, test_resume):
+    _add(db_session, test_profile, test_resume, tech_stack=["Go"])
+    crud.delete_profile(db_session, test_profile.id)
+    assert db_session.query(models.ApplicationSkill).count() == 0
+
+
+def test_imported_applications_get_skills(client, db_session):
+    files = {"file": ("apps.json", b'[{"url": "https://example.com/a", "tech_stack": ["docker", "Go"]}]',
+                      "application/json")}
+    client.post("/applications/import/json", files=files)
+    app = db_session.query(models.JobApplication).one()
+    assert _skills(db_session, app.id) == [("required", "Docker"), ("required", "Go")]
+
+
+def test_filter_by_any_or_all_skills(client, db_session, test_profile, test_resume):
+    both = _add(db_session, test_profile, test_resume, tech_stack=["Terraform", "AWS"])
+    terraform = _add(db_session, test_profile, test_resume, tech_stack=["Terraform"])
+    _add(db_session, test_profile, test_resume, tech_stack=["Java"], nice_to_have_stack=["Terraform"])
+
+    def ids(**params):
+        return {app["id"] for app in client.get("/applications/", params=params).json()}
+
+    assert ids(skills=["terraform"]) == {both.id, terraform.id}
+    assert ids(skills=["Terraform", "aws"], skills_match="all") == {both.id}
+    assert ids(skills=["Terraform", "AWS"], skills_match="any") == {both.id, terraform.id}
+    assert client.get("/applications/", params={"skills": ["Terraform"]}).headers["X-Total-Count"] == "2"
+
+
+def test_top_skills_per_profile(client, db_session, test_profile, test_resume):
+    other = models.Profile(name="Other")
+    db_session.add(other)
+    db_session.commit()
+    _add(db_session, test_profile, test_resume, tech_stack=["Python", "Go"], nice_to_have_stack=["Rust"])
+    _add(db_session, test_profile, test_resume, tech_stack=["python"])
+    _add(db_session, other, test_resume, tech_stack=["Go", "Java"])
+
+    assert client.get("/applications/skills", params={"profile_id": test_profile.id}).json() == [
+        {"name": "Python", "count": 2}, {"name": "Go", "count": 1},
+    ]
+    assert client.get("/applications/skills", params={"limit": 1}).json() == [{"name": "Go", "count": 2}]
+    assert client.get("/applications/skills", params={"kind": "nice_to_have"}).json() == [{"name": "Rust", "count": 1}]
+
+
+def test_backfill_rebuilds_the_table(db_session, test_profile, test_resume):
+    app = _add(db_session, test_profile, test_resume, tech_stack=["Python"], nice_to_have_stack=["Go"])
+    db_session.execute(delete(models.ApplicationSkill))
+    db_session.add(models.ApplicationSkill(application_id="gone", kind="required", skill="Stale"))
+    db_session.commit()
+
+    assert skills.backfill(db_session.connection(), batch_size=1) == 1
+    db_session.commit()
+    assert db_session.query(models.ApplicationSkill).count() == 2
+    assert _skills(db_session, app.id) == [("nice_to_have", "Go"), ("required", "Python")]
+
+
+def test_migration_backfills_existing_applications(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0003")
+        conn.execute(text("INSERT INTO profiles (id, name) VALUES ('p', 'P')"))
+        conn.execute(text("INSERT INTO resumes (id, profile_id, name, version, file_path) VALUES ('r', 'p', 'cv', 1, 'cv.pdf')"))
+        conn.execute(text(
+            "INSERT INTO applications (id, profile_id, resume_id, resume_version, company, position, status, "
+            "is_favorite, is_archived, tech_stack, nice_to_have_stack, responsibilities, requirements) "
+            "VALUES ('a', 'p', 'r', 1, 'C', 'P', 'no_response', 0, 0, '[\"golang\", \"Go\"]', '[]', '[]', '[]')"
+        ))
+
+    run_schema_migrations(engine)
+
+    db = sessionmaker(bind=engine)()
+    assert _skills(db, "a") == [("required", "Go")]
+    db.close()
+    engine.dispose()
+
+
+def test_renormalize_downgrade_restores_previous_rules(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    run_schema_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO profiles (id, name) VALUES ('p', 'P')"))
+        conn.execute(text("INSERT INTO resumes (id, profile_id, name, version, file_path) VALUES ('r', 'p', 'cv', 1, 'cv.pdf')"))
+        conn.execute(text(
+            "INSERT INTO applications (id, profile_id, resume_id, resume_version, company, position, status, "
+            "is_favorite, is_archived, tech_stack, nice_to_have_stack, responsibilities, requirements) "
+            "VALUES ('a', 'p', 'r', 1, 'C', 'P', 'no_response', 0, 0, '[\"golang\", \"kafka\"]', '[]', '[]', '[]')"
+        ))
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    db = sessionmaker(bind=engine)()
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0004")
+    # Revision 0004 had no synonyms and spelled Kafka in capitals
+    assert _skills(db, "a") == [("required", "KAFKA"), ("required", "golang")]
+    db.close()
+
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+    db = sessionmaker(bind=engine)()
+    assert _skills(db, "a") == [("required", "Go"), ("required", "Kafka")]
+    db.close()
+    engine.dispose()
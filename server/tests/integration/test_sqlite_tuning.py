@@ -0,0 +1,148 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select, text
+
+from core.config import settings
+from core.database import RoutingSession, create_engines, create_session_factory, is_sqlite_file
+from database import crud, models, schemas
+from services import parse_queue
+
+
+@pytest.fixture
+def managed(tmp_path):
+    engine, read_engine = create_engines(f"sqlite:///{tmp_path / 'stress.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    yield engine, read_engine, create_session_factory(engine, read_engine)
+    engine.dispose()
+    read_engine.dispose()
+
+
+@pytest.fixture
+def resume(managed):
+    _, _, factory = managed
+    with factory() as db:
+        profile = models.Profile(name="Stress")
+        db.add(profile)
+        db.flush()
+        resume = models.Resume(profile_id=profile.id, name="cv.pdf", version=1, file_path="cv.pdf")
+        db.add(resume)
+        db.commit()
+        return {"profile_id": profile.id, "resume_id": resume.id, "resume_version": resume.version}
+
+
+def test_only_file_databases_are_managed():
+    assert is_sqlite_file("sqlite:///data/vacancio.db")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert not is_sqlite_file("sqlite://")
+    assert not is_sqlite_file("postgresql://user@localhost/vacancio")
+
+    engine, read_engine = create_engines("sqlite:///:memory:")
+    assert engine is read_engine
+    assert create_session_factory(engine, read_engine).class_ is not RoutingSession
+
+
+def test_pragmas_are_set_on_every_connection(managed):
+    engine, read_engine, _ = managed
+    for bind in (engine, read_engine):
+        with bind.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KB
+
+
+def test_session_moves_to_writer_on_first_write(managed, resume):
+    engine, read_engine, factory = managed
+    with factory() as db:
+        assert db.get_bind(models.JobApplication) is read_engine
+
+        db.add(models.JobApplication(profile_id=resume["profile_id"], resume_id=resume["resume_id"], resume_version=1, company="A", position="B"))
+        db.flush()
+        assert db.get_bind(models.JobApplication) is engine
+        # Reads in the same transaction see the pending row
+        assert db.query(models.JobApplication).count() == 1
+
+        db.commit()
+        assert db.get_bind(models.JobApplication) is read_engine
+        assert db.query(models.JobApplication).count() == 1
+
+
+def test_parallel_parses_and_ui_traffic_do_not_lock(managed, resume):
+    """Parse workers and UI requests hammering one file database from threads."""
+    _, _, factory = managed
+    jobs = 120
+    with factory() as db:
+        apps = [
+            models.JobApplication(**resume, company="Parsing...", position="Parsing...", raw_data=f"Job {i}")
+            for i in range(jobs)
+        ]
+        db.add_all(apps)
+        db.commit()
+        app_ids = [app.id for app in apps]
+        parse_queue.enqueue_many(db, app_ids)
+
+    errors = []
+    parsed = []
+    done = threading.Event()
+
+    def parse_worker(worker_id):
+        with factory() as db:
+            while True:
+                leased = parse_queue.lease_jobs(db, worker_id, limit=2)
+                if not leased:
+                    return
+                for job in leased:
+                    crud.update_application(db, job.application_id, schemas.JobApplicationUpdate(
+                        company="TechCorp",
+                        position="Python Developer",
+                        tech_stack=["Python", "FastAPI"],
+                        status=models.ApplicationStatus.no_response,
+                    ))
+                    parse_queue.complete_job(db, job.id)
+                    parsed.append(job.application_id)
+
+    def ui_client(n):
+        with factory() as db:
+            i = 0
+            while not done.is_set():
+                i += 1
+                listed = crud.get_applications(db, schemas.ApplicationFilters(profile_id=resume["profile_id"]), limit=50)
+                if listed:
+                    crud.update_application(db, listed[i % len(listed)].id, schemas.JobApplicationUpdate(is_favorite=i % 2 == 0))
+                if i % 5 == 0:
+                    crud.create_application(db, schemas.JobApplicationCreate(**resume, url=f"https://example.com/{n}/{i}", status=models.ApplicationStatus.no_response))
+                db.rollback()
+
+    def exporter():
+        # A streaming export keeps its read open for seconds; without WAL it blocks every commit
+        with factory() as db:
+            while not done.is_set():
+                for _ in db.execute(select(models.JobApplication.id).execution_options(yield_per=10)):
+                    if done.is_set():
+                        break
+                    time.sleep(0.05)
+                db.rollback()
+
+    def run(fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            errors.append(e)
+
+    with ThreadPoolExecutor(max_workers=13) as pool:
+        ui = [pool.submit(run, ui_client, n) for n in range(4)] + [pool.submit(run, exporter)]
+        workers = [pool.submit(run, parse_worker, f"w{n}") for n in range(8)]
+        for future in workers:
+            future.result()
+        done.set()
+        for future in ui:
+            future.result()
+
+    assert errors == []
+    assert sorted(parsed) == sorted(app_ids)
+    with factory() as db:
+        assert db.query(models.ParseJob).count() == 0
+        assert db.query(models.JobApplication).filter(models.JobApplication.status == models.ApplicationStatus.parsing).count() == 0
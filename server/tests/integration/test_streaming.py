@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from core.config import settings
+from core.database import SyncSessionAdapter
+from database import crud, models, schemas
+from routers import applications
+from services import application_events
+from services.job_parser.ai.client import close_client
+from services.job_parser.ai.parser import parse_with_ai_async
+from tests.conftest import TestingSessionLocal, async_sessions
+
+
+@pytest.fixture
+def parsing_app(db_session, test_profile, test_resume):
+    app = models.JobApplication(
+        profile_id=test_profile.id,
+        resume_id=test_resume.id,
+        resume_version=test_resume.version,
+        company="Parsing...",
+        position="Parsing...",
+        raw_data="Senior Python Developer at TechCorp",
+        status=models.ApplicationStatus.parsing,
+    )
+    db_session.add(app)
+    db_session.commit()
+    return app.id
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _update_later(app_id, delay=0.3, **fields):
+    def update():
+        db = TestingSessionLocal()
+        try:
+            crud.update_application(db, app_id, schemas.JobApplicationUpdate(**fields))
+        finally:
+            db.close()
+    timer = threading.Timer(delay, update)
+    timer.start()
+    return timer
+
+
+def test_streamed_fields_arrive_before_the_completion_ends(fake_openrouter):
+    fake_openrouter.chunk_size = 8
+    fake_openrouter.chunk_delay = 0.01
+    batches = []
+
+    async def on_fields(fields):
+        batches.append(fields)
+
+    async def run():
+        try:
+            return await parse_with_ai_async("Job text", on_fields=on_fields)
+        finally:
+            await close_client()
+
+    job = asyncio.run(run())
+
+    assert fake_openrouter.requests[0]["stream"] is True
+    assert batches[0] == {"job_title": "Senior Python Developer"}
+    assert len(batches) > 5
+    # Raw fields are only enum-normalized; the returned posting is fully validated
+    streamed = {key: value for batch in batches for key, value in batch.items()}
+    assert streamed["work_mode"] == "remote"
+    assert job.stack == ["Python", "FastAPI", "PostgreSQL"]
+
+
+def test_streaming_can_be_disabled(fake_openrouter, monkeypatch):
+    monkeypatch.setattr(settings, "OPENROUTER_STREAMING", False)
+    batches = []
+
+    async def run():
+        try:
+            return await parse_with_ai_async("Job text", on_fields=lambda fields: batches.append(fields))
+        finally:
+            await close_client()
+
+    assert asyncio.run(run()).company == "TechCorp"
+    assert "stream" not in fake_openrouter.requests[0]
+    assert batches == []
+
+
+def test_worker_stores_fields_while_parsing(db_session, fake_openrouter, parsing_app, monkeypatch):
+    monkeypatch.setattr(applications, "AsyncSessionLocal", async_sessions(lambda: db_session))
+    fake_openrouter.chunk_size = 8
+
+    async def run():
+        queue = application_events.subscribe(parsing_app)
+        try:
+            await applications.process_application_background(parsing_app)
+        finally:
+            application_events.unsubscribe(parsing_app, queue)
+            await close_client()
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    updates = asyncio.run(run())
+
+    assert updates[:3] == [{"position": "Senior Python Developer"}, {"company": "TechCorp"}, {"location": "Warszawa"}]
+    assert all("status" not in update for update in updates[:-1])
+    assert updates[-1]["status"] == models.ApplicationStatus.no_response
+    db_session.expire_all()
+    app = db_session.get(models.JobApplication, parsing_app)
+    assert (app.company, app.location, app.tech_stack) == ("TechCorp", "Warszawa", ["Python", "FastAPI", "PostgreSQL"])
+
+
+def test_event_stream_pushes_updates_until_parsed(client, parsing_app, monkeypatch):
+    monkeypatch.setattr(settings, "APPLICATION_EVENTS_HEARTBEAT_SECONDS", 5.0)
+    _update_later(parsing_app, company="TechCorp")
+    _update_later(parsing_app, delay=0.6, status=models.ApplicationStatus.no_response)
+
+    response = client.get(f"/applications/{parsing_app}/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert events[0][0] == "snapshot"
+    assert events[0][1]["company"] == "Parsing..." and events[0][1]["status"] == "parsing"
+    assert events[1:] == [
+        ("update", {"company": "TechCorp"}),
+        ("update", {"status": "no_response"}),
+        ("done", {"status": "no_response"}),
+    ]
+
+
+def test_event_stream_rereads_the_row_on_heartbeat(client, parsing_app, monkeypatch):
+    # As if the parse ran in another process: nothing is published here
+    monkeypatch.setattr(application_events, "publish", lambda app_id, changes: None)
+    monkeypatch.setattr(settings, "APPLICATION_EVENTS_HEARTBEAT_SECONDS", 0.1)
+    _update_later(parsing_app, status=models.ApplicationStatus.failed)
+
+    stream_sessions = []
+
+    def stream_session():
+        stream_sessions.append(SyncSessionAdapter(TestingSessionLocal()))
+        return stream_sessions[-1]
+
+    # Re-reads must not depend on the request-scoped session outliving the handler
+    monkeypatch.setattr(applications, "AsyncSessionLocal", stream_session)
+    events = _events(client.get(f"/applications/{parsing_app}/events").text)
+
+    assert [name for name, _ in events] == ["snapshot", "update", "done"]
+    assert events[1][1]["status"] == "failed"
+    assert events[2][1] == {"status": "failed"}
+    assert len(stream_sessions) == 1
+
+
+def test_event_stream_for_finished_or_missing_applications(client, db_session, parsing_app):
+    crud.update_application(db_session, parsing_app, schemas.JobApplicationUpdate(status=models.ApplicationStatus.interview))
+
+    events = _events(client.get(f"/applications/{parsing_app}/events").text)
+    assert [name for name, _ in events] == ["snapshot", "done"]
+    assert client.get("/applications/missing/events").status_code == 404
+    assert not application_events.has_subscribers()
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+from core.config import settings
+from services.job_parser.ai.client import close_client
+from services.job_parser.ai.parser import parse_with_ai, parse_with_ai_async
+from tests.fake_openrouter import DEFAULT_JOB, completion
+
+BROKEN_JOB = {
+    **DEFAULT_JOB,
+    "seniority": "guru",
+    "salary": {"min": 30000, "max": 20000, "currency": "PLN", "unit": "month", "gross_net": "net"},
+}
+
+
+def _run(coro_fn, *args, **kwargs):
+    async def run():
+        try:
+            return await coro_fn(*args, **kwargs)
+        finally:
+            await close_client()
+    return asyncio.run(run())
+
+
+def _responses(*contents):
+    """Answer the n-th request with the n-th content (the last one repeats)."""
+    def respond(payload):
+        index = min(respond.calls, len(contents) - 1)
+        respond.calls += 1
+        return 200, completion(contents[index])
+    respond.calls = 0
+    return respond
+
+
+def test_request_carries_the_job_posting_schema(fake_openrouter):
+    parse_with_ai("Job text")
+
+    response_format = fake_openrouter.requests[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    schema = response_format["json_schema"]["schema"]
+    assert "job_title" in schema["required"] and "source" not in schema["properties"]
+
+
+def test_schema_conformant_response(fake_openrouter):
+    exact = {**DEFAULT_JOB, "work_mode": "remote", "employment_type": "b2b",
+             "salary": {"min": 20000, "max": 28000, "currency": "PLN", "unit": "month", "gross_net": "net"}}
+    fake_openrouter.responder = _responses(json.dumps(exact))
+
+    job = _run(parse_with_ai_async, "Job text", source_url="https://justjoin.it/offers/1")
+
+    assert len(fake_openrouter.requests) == 1
+    assert job.salary.unit.value == "month"
+    assert job.source == "justjoin"
+    assert job.stack == ["Python", "FastAPI", "PostgreSQL"]
+
+
+def test_invalid_fields_are_repaired_with_a_targeted_request(fake_openrouter):
+    repair = {"seniority": "senior", "salary": {**BROKEN_JOB["salary"], "min": 20000, "max": 30000}}
+    fake_openrouter.responder = _responses(json.dumps(BROKEN_JOB), json.dumps(repair))
+
+    job = _run(parse_with_ai_async, "Job text")
+
+    assert len(fake_openrouter.requests) == 2
+    prompt = fake_openrouter.requests[1]["messages"][0]["content"]
+    assert "corrected values for these fields: seniority, salary" in prompt
+    assert '"guru"' in prompt
+    assert set(fake_openrouter.requests[1]["response_format"]["json_schema"]["schema"]["properties"]) == {
+        "seniority", "salary",
+    }
+    assert job.seniority.value == "senior"
+    assert (job.salary.min, job.salary.max) == (20000, 30000)
+    assert job.company == "TechCorp"
+
+
+def test_fields_that_stay_invalid_are_dropped(fake_openrouter):
+    fake_openrouter.responder = _responses(json.dumps(BROKEN_JOB), "I cannot help with that")
+
+    job = parse_with_ai("Job text")
+
+    assert len(fake_openrouter.requests) == 2
+    assert job.seniority is None and job.salary is None
+    assert job.job_title == "Senior Python Developer"
+
+
+def test_repair_can_be_disabled(fake_openrouter, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_REPAIR_ENABLED", False)
+    monkeypatch.setattr(settings, "OPENROUTER_STRUCTURED_OUTPUT", False)
+    fake_openrouter.responder = _responses(json.dumps(BROKEN_JOB))
+
+    job = _run(parse_with_ai_async, "Job text")
+
+    assert len(fake_openrouter.requests) == 1
+    assert "response_format" not in fake_openrouter.requests[0]
+    assert job.seniority is None and job.company == "TechCorp"
+
+
+def test_response_without_json_still_fails(fake_openrouter):
+    fake_openrouter.responder = _responses("Sorry, no job here")
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        _run(parse_with_ai_async, "Job text")
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from services.job_parser.compaction import compact_text, estimate_tokens
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "postings"
+
+
+def test_html_page_is_reduced_to_the_posting():
+    page = (FIXTURES / "linkedin_page.html").read_text(encoding="utf-8")
+    assert compact_text(page, source="linkedin") == "\n".join([
+        "Platform Engineer",
+        "Cloudline Sp. z o.o. · Wrocław (Hybrid)",
+        "About the role",
+        "You will run our Kubernetes clusters on AWS & GCP.",
+        "3+ years with Terraform",
+        "Go or Python",
+        # Only adjacent repeats are dropped
+        "Platform Engineer",
+        "Salary: 20 000 - 26 000 PLN",
+    ])
+
+
+def test_source_rules_only_apply_to_their_source():
+    page = (FIXTURES / "linkedin_page.html").read_text(encoding="utf-8")
+    compacted = compact_text(page)
+    assert "Promoted" in compacted
+    assert "People also viewed" in compacted
+
+
+def test_plain_text_whitespace_and_boilerplate():
+    text = "Backend   Developer\n\n\n\tRemote\nZaloguj się\nAkceptuję wszystkie ciasteczka\nRemote\n"
+    assert compact_text(text) == "Backend Developer\nRemote"
+
+
+def test_token_budget_cuts_at_a_line_break():
+    text = "\n".join(f"Requirement number {i}" for i in range(100))
+    compacted = compact_text(text, max_tokens=50)
+    assert estimate_tokens(compacted) <= 50
+    assert compacted.splitlines()[-1].startswith("Requirement number")
+    assert compact_text(text, max_tokens=0) == text
+
+
+def test_disabled_or_empty_input_is_returned_unchanged(monkeypatch):
+    from core.config import settings
+
+    assert compact_text("Cookie settings") == "Cookie settings"
+    monkeypatch.setattr(settings, "PARSE_COMPACTION_ENABLED", False)
+    assert compact_text("<p>Job</p>") == "<p>Job</p>"
+
+
+def test_posting_header_is_kept_and_site_header_dropped():
+    page = """
+    <header class="site"><a href="/">JobBoard</a> <span>For employers</span></header>
+    <main>
+      <article>
+        <header><h1>Senior Backend Engineer</h1><p>Acme Analytics · Warsaw</p></header>
+        <section><h2>Requirements</h2><ul><li>Python</li><li>Kafka</li></ul></section>
+      </article>
+    </main>
+    """
+    assert compact_text(page) == "Senior Backend Engineer\nAcme Analytics · Warsaw\nRequirements\nPython\nKafka"
+
+
+def test_pages_without_main_keep_their_headers():
+    page = "<header><h1>Data Engineer</h1></header><div>Spark, Airflow</div>"
+    assert compact_text(page) == "Data Engineer\nSpark, Airflow"
+
+
+def test_boilerplate_only_matches_whole_short_lines():
+    text = "\n".join([
+        "Backend Developer",
+        "Experience with cookie-based session handling",
+        "Copyright © material review for our legal team",
+        "We use cookies to improve your experience. Accept all",
+        "© 2026 JobBoard Ltd. All rights reserved.",
+        "Cookie settings",
+        "Privacy policy",
+    ])
+    assert compact_text(text) == "\n".join([
+        "Backend Developer",
+        "Experience with cookie-based session handling",
+        "Copyright © material review for our legal team",
+    ])
+
+
+def test_repeated_requirements_in_different_sections_are_kept():
+    text = "Must have\nPython\nSQL\nNice to have\nPython\nPython\nDocker"
+    assert compact_text(text) == "Must have\nPython\nSQL\nNice to have\nPython\nDocker"
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pytest
+
+from services.job_parser import extractors
+from services.job_parser.extractors import extract_fields, is_sufficient, jsonld, missing_fields
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "postings"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_complete_job_posting():
+    fields = jsonld.extract(_fixture("justjoin_complete.html"))
+    assert fields == {
+        "job_title": "Senior Python Developer",
+        "company": "Acme Software",
+        "location": "Krakow",
+        "work_mode": "remote",
+        "employment_type": "contract",
+        "salary": {"min": 22000, "max": 28000, "currency": "PLN", "unit": "month"},
+        "stack": ["python", "Django", "postgres", "k8s"],
+        "requirements": ["5+ years of Python", "Experience with PostgreSQL"],
+        "responsibilities": ["Design REST APIs", "Review code"],
+        "project_description": "We build a logistics platform.\nSmall, senior team.",
+    }
+    assert is_sufficient(extract_fields(_fixture("justjoin_complete.html")))
+
+
+def test_graph_with_escaped_html_and_partial_data():
+    fields = extract_fields(_fixture("nofluffjobs_graph.html"))
+    assert fields == {
+        "job_title": "Data Engineer",
+        "company": "Dataworks",
+        "location": "Warsaw",
+        "employment_type": "full-time",
+        "project_description": "Build & run pipelines.\nSpark\nAirflow",
+    }
+    assert not is_sufficient(fields)
+    assert missing_fields(fields) == [
+        "work_mode", "seniority", "salary", "stack", "nice_to_have_stack", "requirements", "responsibilities",
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    _fixture("plain_text.txt"),
+    '<script type="application/ld+json">{not json</script>',
+    '<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script>',
+])
+def test_no_job_posting(text):
+    assert extract_fields(text) == {}
+
+
+def test_long_description_is_truncated():
+    text = '<script type="application/ld+json">{"@type": "JobPosting", "description": "%s"}</script>' % ("word " * 1000)
+    description = jsonld.extract(text)["project_description"]
+    assert len(description) <= jsonld.DESCRIPTION_LIMIT + 1
+    assert description.endswith("…")
+
+
+def test_source_specific_extractors_and_failures(monkeypatch):
+    def board(text):
+        return {"seniority": "senior", "job_title": "Ignored", "unknown": "x"}
+
+    def broken(text):
+        raise RuntimeError("bad markup")
+
+    monkeypatch.setattr(extractors, "_extractors", list(extractors._extractors))
+    extractors.register(board, sources=["nofluffjobs"])
+    extractors.register(broken)
+
+    text = _fixture("nofluffjobs_graph.html")
+    assert "seniority" not in extract_fields(text, source="justjoin")
+    fields = extract_fields(text, source="nofluffjobs")
+    # Earlier extractors win; fields outside the prompt are dropped
+    assert fields["seniority"] == "senior"
+    assert fields["job_title"] == "Data Engineer"
+    assert "unknown" not in fields
+
+
+def test_extractors_can_be_disabled(monkeypatch):
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "PARSE_EXTRACTORS_ENABLED", False)
+    assert extract_fields(_fixture("justjoin_complete.html")) == {}
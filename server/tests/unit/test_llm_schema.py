@@ -0,0 +1,32 @@
+from services.job_parser.ai.schema import EXCLUDED_FIELDS, job_posting_schema, response_format
+from services.job_parser.models import JobPosting
+
+
+def _objects(node):
+    if isinstance(node, dict):
+        if node.get("type") == "object":
+            yield node
+        for value in node.values():
+            yield from _objects(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _objects(item)
+
+
+def test_schema_is_strict_and_self_contained():
+    schema = job_posting_schema()
+    assert set(schema["properties"]) == set(JobPosting.model_fields) - EXCLUDED_FIELDS
+    for obj in _objects(schema):
+        assert obj["additionalProperties"] is False
+        assert obj["required"] == list(obj["properties"])
+    assert "$ref" not in str(schema) and "default" not in str(schema)
+
+    salary = schema["properties"]["salary"]["anyOf"]
+    assert {"type": "null"} in salary
+    assert salary[0]["properties"]["currency"]["anyOf"][0]["enum"] == ["PLN", "USD", "EUR"]
+
+
+def test_schema_for_a_subset_of_fields():
+    schema = job_posting_schema(["seniority", "stack"])
+    assert schema["required"] == ["seniority", "stack"]
+    assert response_format(["stack"])["json_schema"]["strict"] is True
@@ -0,0 +1,33 @@
+import json
+
+from services.job_parser.ai.partial_json import completed_fields
+
+DOCUMENT = json.dumps({
+    "job_title": 'Dev, "Senior" {remote}',
+    "company": "Comp",
+    "salary": {"min": 2000, "max": None},
+    "stack": ["Go", "Rust"],
+    "remote": True,
+}, indent=2)
+
+
+def test_only_finished_values_are_reported():
+    expected = json.loads(DOCUMENT)
+    keys = list(expected)
+    for end in range(len(DOCUMENT) + 1):
+        fields = completed_fields(DOCUMENT[:end])
+        # Every prefix yields complete values, in document order
+        assert list(fields) == keys[:len(fields)]
+        assert all(value == expected[key] for key, value in fields.items())
+    assert completed_fields(DOCUMENT) == expected
+
+
+def test_numbers_wait_for_their_delimiter():
+    assert completed_fields('{"min": 200') == {}
+    assert completed_fields('{"min": 2000,') == {"min": 2000}
+
+
+def test_code_fence_and_garbage():
+    assert completed_fields('```json\n{"company": "Comp", "x') == {"company": "Comp"}
+    assert completed_fields("no json here") == {}
+    assert completed_fields('{"company" "Comp",') == {}
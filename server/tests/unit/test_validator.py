@@ -1,5 +1,8 @@
+import json
 import pytest
-from services.job_parser.validator import normalize_technology, normalize_location, auto_fix_job_posting
+from services.job_parser.validator import (
+    SYNONYMS_FILE, auto_fix_job_posting, build_alias_index, load_synonyms, normalize_location, normalize_technology,
+)
 from services.job_parser.models import JobPosting
 from decimal import Decimal
 
@@ -58,3 +61,36 @@ def test_auto_fix_job_posting():
     
     assert len(fixed_job.responsibilities) == 1
     assert fixed_job.responsibilities[0] == "Code"
+
+def test_normalize_technology_synonyms():
+    assert normalize_technology("k8s") == "Kubernetes"
+    assert normalize_technology("postgres") == "PostgreSQL"
+    assert normalize_technology("Golang") == "Go"
+    assert normalize_technology("KAFKA") == "Kafka"
+    assert normalize_technology("spring   boot") == "Spring Boot"
+
+def test_synonyms_only_merge_spellings_of_one_technology():
+    # Related but distinct technologies keep their own names
+    assert normalize_technology("PySpark") == "PySpark"
+    assert normalize_technology("Torch") == "Torch"
+    assert normalize_technology("Terraform Cloud") == "Terraform Cloud"
+    assert normalize_technology("ASP.NET Core") == "ASP.NET Core"
+    assert normalize_technology("dotnet") == ".NET"
+    assert normalize_technology(".NET") == ".NET"
+    assert normalize_technology("dotnet core") == ".NET Core"
+    assert normalize_technology("Apache Spark") == "Spark"
+
+def test_custom_synonyms_file(tmp_path):
+    path = tmp_path / "synonyms.json"
+    path.write_text(json.dumps({"Kubernetes": ["kubes"], "Terraform": ["tf"]}))
+    index = build_alias_index(["Kubernetes", "Docker"], load_synonyms(SYNONYMS_FILE, str(path)))
+    assert index["kubes"] == "Kubernetes"
+    assert index["tf"] == "Terraform"
+    assert index["docker"] == "Docker"
+    # Replacing a canonical entry replaces its bundled aliases
+    assert "k8s" not in index
+
+def test_normalize_location_without_diacritics():
+    assert normalize_location("krakow, Poland") == "Krakow"
+    assert normalize_location("Lodz") == "Lodz"
+    assert normalize_location("Łódź 90-001") == "Lodz"